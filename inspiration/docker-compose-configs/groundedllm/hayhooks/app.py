@@ -1,7 +1,7 @@
 import os
 import time
 import uuid
-from typing import Generator, List, Union
+from typing import Generator, List, Optional, Union
 
 import uvicorn
 from fastapi import HTTPException, Request
@@ -23,9 +23,12 @@ from haystack.lazy_imports import LazyImport
 from haystack.tracing.logging_tracer import LoggingTracer
 from letta_client import Letta
 from loguru import logger as log
+from pydantic import BaseModel
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
-from components.google.google_oauth import GoogleOAuth
+from components.bulk_extract import to_ndjson, to_sse
+from components.container import container
+from components.shared_state import SHARED_STATE_URL_ENV, shared_state_url
 
 with LazyImport("Run 'pip install \"mcp\"' to install MCP.") as mcp_import:
     from mcp.server import Server
@@ -261,8 +264,8 @@ hayhooks.mount("/messages", mcp_sse.handle_post_message)
 # --- End MCP Server Integration ---
 
 # --- Google OAuth2 Integration ---
-# Initialize the Google OAuth handler
-google_oauth = GoogleOAuth()
+# Use the Google OAuth handler shared with the pipelines
+google_oauth = container.google_oauth()
 
 hayhooks.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -359,6 +362,46 @@ async def check_google_auth(user_id: str):
 
 # --- End Google OAuth2 Integration ---
 
+# --- Bulk Extract ---
+
+
+class BulkExtractRequest(BaseModel):
+    urls: List[str]
+
+
+@hayhooks.post("/extract/bulk")
+async def extract_bulk(bulk_req: BulkExtractRequest, request: Request, format: Optional[str] = None):
+    """
+    Extracts many URLs concurrently through the extract pipeline and streams each result as it completes.
+
+    Results are newline-delimited JSON, or server-sent events if `format=sse` or the client accepts
+    `text/event-stream`.  Each result has the URL, its index in the request and either its contents
+    or problem details.
+    """
+    pipeline_wrapper = registry.get("extract")
+    bulk_extractor = getattr(pipeline_wrapper, "bulk_extractor", None)
+    if bulk_extractor is None:
+        raise HTTPException(status_code=404, detail="Pipeline 'extract' is not deployed.")
+    if len(bulk_req.urls) > bulk_extractor.max_urls:
+        raise HTTPException(status_code=400, detail=f"At most {bulk_extractor.max_urls} URLs can be extracted at once, got {len(bulk_req.urls)}")
+
+    results = bulk_extractor.iter_results(bulk_req.urls)
+    if format == "sse" or (format is None and "text/event-stream" in request.headers.get("accept", "")):
+        return StreamingResponse(to_sse(results), media_type="text/event-stream")
+    return StreamingResponse(to_ndjson(results), media_type="application/x-ndjson")
+
+
+# --- End Bulk Extract ---
+
 if __name__ == "__main__":
+    # Each worker is a separate process with its own caches, so more than one worker should be paired
+    # with shared state (Redis or SQLite) for rate limits, cached results and OAuth tokens.
+    workers = int(os.getenv("HAYHOOKS_WORKERS", "1"))
+    if workers > 1:
+        if not shared_state_url():
+            log.warning(f"Running {workers} workers without {SHARED_STATE_URL_ENV}, each worker keeps its own caches and rate limits")
+        # The MCP SSE transport keeps its sessions in the worker that opened them.
+        log.warning(f"Running {workers} workers, MCP clients using /sse need sticky sessions to reach the same worker for /messages")
+
     # Run the combined Hayhooks + MCP server
-    uvicorn.run("app:hayhooks", host=settings.host, port=settings.port)
+    uvicorn.run("app:hayhooks", host=settings.host, port=settings.port, workers=workers)
@@ -0,0 +1 @@
+# This file marks the 'hayhooks/benchmarks' directory as a Python package.
@@ -0,0 +1,423 @@
+"""Load and latency benchmarks for the hayhooks pipelines, run against local stub services.
+
+Examples:
+
+    python -m benchmarks.run --scenario extract --requests 100 --concurrency 8
+    python -m benchmarks.run --scenario search --scenario excerpt --latency pages=200 --jitter pages=100 --fail-rate pages=0.05
+    python -m benchmarks.run --scenario http:extract --scenario mcp:search --output results.json
+
+`search`, `excerpt` and `extract` drive the pipeline wrappers in this process and report a
+per-component breakdown. `http:<pipeline>` and `mcp:<pipeline>` start `app.py` in a subprocess
+and go through the REST and MCP endpoints. `openai` calls `/v1/chat/completions`, which is backed
+by Letta and is not stubbed, so it needs LETTA_BASE_URL pointing at a running Letta.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from haystack import tracing
+from haystack.tracing import Span, Tracer
+
+from benchmarks.stubs import SERVICES, StubBehavior, StubCluster
+
+HAYHOOKS_DIR = Path(__file__).resolve().parent.parent
+PIPELINES_DIR = HAYHOOKS_DIR / "pipelines"
+PIPELINE_SCENARIOS = ["search", "excerpt", "extract"]
+
+# Real services that would otherwise be called if their keys happen to be set in the environment.
+DISABLED_SERVICE_ENV = [
+    "LINKUP_API_KEY",
+    "EXA_API_KEY",
+    "BRAVE_API_KEY",
+    "JINA_API_KEY",
+    "ZOTERO_LIBRARY_ID",
+    "ZOTERO_API_KEY",
+    "NOTION_API_KEY",
+    "GITHUB_API_KEY",
+    "STACKOVERFLOW_API_KEY",
+    "HAYHOOKS_SHARED_STATE_URL",
+]
+
+
+def percentile(values: List[float], p: float) -> float:
+    """The p-th percentile of `values`, interpolating between the closest ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(latencies_ms),
+        "mean": sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0,
+        "p50": percentile(latencies_ms, 50),
+        "p95": percentile(latencies_ms, 95),
+        "p99": percentile(latencies_ms, 99),
+        "max": max(latencies_ms, default=0.0),
+    }
+
+
+class _TimingSpan(Span):
+    def set_tag(self, key: str, value: Any) -> None:
+        pass
+
+
+class ComponentTimingTracer(Tracer):
+    """A Haystack tracer that records how long every component run takes.
+
+    Components inside super components are recorded under their parent, e.g.
+    `content_extractor/url_router`.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.durations_ms: Dict[str, List[float]] = defaultdict(list)
+
+    @contextlib.contextmanager
+    def trace(self, operation_name: str, tags: Optional[Dict[str, Any]] = None, parent_span: Optional[Span] = None) -> Iterator[Span]:
+        name = (tags or {}).get("haystack.component.name")
+        if operation_name != "haystack.component.run" or name is None:
+            yield _TimingSpan()
+            return
+
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(name)
+        path = "/".join(stack)
+        start = time.perf_counter()
+        try:
+            yield _TimingSpan()
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stack.pop()
+            with self._lock:
+                self.durations_ms[path].append(elapsed_ms)
+
+    def current_span(self) -> Optional[Span]:
+        return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.durations_ms.clear()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {path: {**summarize(values), "total": sum(values)} for path, values in sorted(self.durations_ms.items())}
+
+
+def scenario_inputs(scenario: str, index: int, stubs: StubCluster, github_ratio: float) -> Dict[str, Any]:
+    """The run_api arguments for request `index` of a scenario."""
+    pages = stubs.url("pages")
+    if scenario == "search":
+        return {"question": f"benchmark question {index}", "max_results": 5}
+    if scenario == "excerpt":
+        return {"urls": [f"{pages}/page/{index * 2}.html", f"{pages}/page/{index * 2 + 1}.txt"], "question": f"What is page {index} about?"}
+    if scenario == "extract":
+        # Every 1/github_ratio-th request goes through the GitHub pull request resolver.
+        if github_ratio > 0 and index % max(1, round(1 / github_ratio)) == 0:
+            return {"url": f"https://github.com/stub/repo/pull/{index}"}
+        return {"url": f"{pages}/page/{index}.html"}
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+def is_problem(result: Any) -> bool:
+    """Whether a run_api result is a problem details JSON rather than an answer."""
+    if not isinstance(result, str) or not result.startswith("{"):
+        return False
+    try:
+        return str(json.loads(result).get("type", "")).startswith("urn:hayhooks:")
+    except (ValueError, AttributeError):
+        return False
+
+
+def run_load(call: Callable[[int], Any], requests: int, concurrency: int, distinct_inputs: int) -> Dict[str, Any]:
+    """Call `call` `requests` times from `concurrency` threads and time each call."""
+    latencies_ms: List[float] = []
+    errors: Dict[str, int] = defaultdict(int)
+    problems = 0
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        nonlocal problems
+        start = time.perf_counter()
+        try:
+            result = call(i % distinct_inputs)
+            failed = is_problem(result)
+        except Exception as e:
+            result, failed = None, True
+            with lock:
+                errors[type(e).__name__] += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies_ms.append(elapsed_ms)
+            if failed and result is not None:
+                problems += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests)))
+    duration = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "throughput_rps": requests / duration if duration else 0.0,
+        "errors": dict(errors),
+        "problems": problems,
+        "latency_ms": summarize(latencies_ms),
+    }
+
+
+def load_pipeline_wrapper(name: str):
+    """Import and set up a pipeline wrapper the way hayhooks does, without the server."""
+    path = PIPELINES_DIR / name / "pipeline_wrapper.py"
+    spec = importlib.util.spec_from_file_location(f"benchmark_pipelines.{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    wrapper = module.PipelineWrapper()
+    wrapper.setup()
+    return wrapper
+
+
+def run_pipeline_scenario(scenario: str, args, stubs: StubCluster, tracer: ComponentTimingTracer) -> Dict[str, Any]:
+    wrapper = load_pipeline_wrapper(scenario)
+
+    def call(i: int):
+        return wrapper.run_api(**scenario_inputs(scenario, i, stubs, args.github_ratio))
+
+    # Warm-up requests build the lazy resolvers and open connections, and are not measured.
+    for i in range(args.warmup):
+        with contextlib.suppress(Exception):
+            call(args.requests + i)
+
+    tracer.reset()
+    result = run_load(call, args.requests, args.concurrency, args.distinct_inputs or args.requests)
+    result["components_ms"] = tracer.report()
+    return result
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def hayhooks_server(pipelines: List[str], env: Dict[str, str], workers: int) -> Iterator[str]:
+    """Run app.py in a subprocess with only `pipelines` deployed, and yield its base URL."""
+    import httpx
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as pipelines_dir:
+        for name in pipelines:
+            os.symlink(PIPELINES_DIR / name, Path(pipelines_dir) / name)
+        server_env = {**os.environ, **env, "HAYHOOKS_PIPELINES_DIR": pipelines_dir, "HAYHOOKS_HOST": "127.0.0.1", "HAYHOOKS_PORT": str(port), "HAYHOOKS_WORKERS": str(workers), "LOG": "WARNING"}
+        process = subprocess.Popen([sys.executable, "app.py"], cwd=HAYHOOKS_DIR, env=server_env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.monotonic() + 60
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"hayhooks exited with {process.returncode}: {process.stderr.read().decode(errors='replace')[-2000:]}")
+                with contextlib.suppress(httpx.HTTPError):
+                    if httpx.get(f"{base_url}/status", timeout=1).status_code == 200:
+                        break
+                if time.monotonic() > deadline:
+                    raise RuntimeError("hayhooks did not become ready within 60s")
+                time.sleep(0.25)
+            yield base_url
+        finally:
+            process.terminate()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                process.wait(timeout=10)
+            if process.poll() is None:
+                process.kill()
+
+
+def run_http_scenario(pipeline: str, args, stubs: StubCluster, base_url: str) -> Dict[str, Any]:
+    import httpx
+
+    client = httpx.Client(base_url=base_url, timeout=args.timeout, limits=httpx.Limits(max_connections=args.concurrency))
+
+    def call(i: int):
+        response = client.post(f"/{pipeline}/run", json=scenario_inputs(pipeline, i, stubs, args.github_ratio))
+        response.raise_for_status()
+        return response.json().get("result")
+
+    try:
+        for i in range(args.warmup):
+            with contextlib.suppress(Exception):
+                call(args.requests + i)
+        return run_load(call, args.requests, args.concurrency, args.distinct_inputs or args.requests)
+    finally:
+        client.close()
+
+
+def run_mcp_scenario(pipeline: str, args, stubs: StubCluster, base_url: str) -> Dict[str, Any]:
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    async def main() -> Dict[str, Any]:
+        latencies_ms: List[float] = []
+        errors: Dict[str, int] = defaultdict(int)
+        problems = 0
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(i % (args.distinct_inputs or args.requests))
+
+        async def worker():
+            nonlocal problems
+            # One MCP session per concurrent client, like separate agents would have.
+            async with sse_client(f"{base_url}/sse", timeout=args.timeout, sse_read_timeout=args.timeout) as streams:
+                async with ClientSession(*streams) as session:
+                    await session.initialize()
+                    while not queue.empty():
+                        i = queue.get_nowait()
+                        start = time.perf_counter()
+                        try:
+                            result = await session.call_tool(pipeline, scenario_inputs(pipeline, i, stubs, args.github_ratio))
+                            text = "".join(getattr(c, "text", "") for c in result.content)
+                            if result.isError or is_problem(text):
+                                problems += 1
+                        except Exception as e:
+                            errors[type(e).__name__] += 1
+                        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        duration = time.perf_counter() - start
+        return {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "duration_s": duration,
+            "throughput_rps": args.requests / duration if duration else 0.0,
+            "errors": dict(errors),
+            "problems": problems,
+            "latency_ms": summarize(latencies_ms),
+        }
+
+    return asyncio.run(main())
+
+
+def run_openai_scenario(args, base_url: str) -> Dict[str, Any]:
+    import httpx
+
+    client = httpx.Client(base_url=base_url, timeout=args.timeout)
+
+    def call(i: int):
+        body = {"model": args.openai_model, "messages": [{"role": "user", "content": f"benchmark message {i}"}], "stream": False}
+        response = client.post("/v1/chat/completions", json=body)
+        response.raise_for_status()
+        return response.json()
+
+    try:
+        return run_load(call, args.requests, args.concurrency, args.distinct_inputs or args.requests)
+    finally:
+        client.close()
+
+
+def _parse_service_values(values: List[str], option: str) -> Dict[str, float]:
+    parsed = {}
+    for value in values:
+        service, _, number = value.partition("=")
+        if service not in SERVICES or not number:
+            raise SystemExit(f"{option} expects SERVICE=VALUE with SERVICE one of {SERVICES}, got {value!r}")
+        parsed[service] = float(number)
+    return parsed
+
+
+def build_behaviors(args) -> Dict[str, StubBehavior]:
+    latency = _parse_service_values(args.latency, "--latency")
+    jitter = _parse_service_values(args.jitter, "--jitter")
+    failure_rate = _parse_service_values(args.fail_rate, "--fail-rate")
+    return {service: StubBehavior(latency_ms=latency.get(service, 0.0), jitter_ms=jitter.get(service, 0.0), failure_rate=failure_rate.get(service, 0.0)) for service in SERVICES}
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark hayhooks pipelines against local stub services.")
+    parser.add_argument("--scenario", action="append", help="search, excerpt, extract, http:<pipeline>, mcp:<pipeline> or openai. Repeat for several. Defaults to the three pipelines.")
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients.")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests before each scenario.")
+    parser.add_argument("--distinct-inputs", type=int, default=0, help="Cycle through this many distinct inputs, to measure coalescing. 0 makes every request distinct.")
+    parser.add_argument("--latency", action="append", default=[], metavar="SERVICE=MS", help=f"Added latency per stub service ({', '.join(SERVICES)}).")
+    parser.add_argument("--jitter", action="append", default=[], metavar="SERVICE=MS", help="Random extra latency per stub service.")
+    parser.add_argument("--fail-rate", action="append", default=[], metavar="SERVICE=RATE", help="Fraction of requests a stub service fails with a 503.")
+    parser.add_argument("--page-size-kb", type=int, default=20, help="Size of the stub web pages.")
+    parser.add_argument("--github-ratio", type=float, default=0.2, help="Fraction of extract requests that are GitHub pull request URLs.")
+    parser.add_argument("--workers", type=int, default=1, help="HAYHOOKS_WORKERS for the http, mcp and openai scenarios.")
+    parser.add_argument("--openai-model", default="letta-agent", help="Model (Letta agent) for the openai scenario.")
+    parser.add_argument("--timeout", type=float, default=120, help="Client timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and failure injection.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    scenarios = args.scenario or PIPELINE_SCENARIOS
+
+    stubs = StubCluster(build_behaviors(args), page_size_kb=args.page_size_kb, seed=args.seed)
+    state_dir = tempfile.TemporaryDirectory(prefix="hayhooks-benchmark-")
+    env = {**stubs.env(), "ZOTERO_DB_FILE": str(Path(state_dir.name) / "zotero.db")}
+    for name in DISABLED_SERVICE_ENV:
+        os.environ.pop(name, None)
+    os.environ.update(env)
+
+    tracer = ComponentTimingTracer()
+    tracing.enable_tracing(tracer)
+
+    report: Dict[str, Any] = {"config": {k: v for k, v in vars(args).items() if k != "output"}, "scenarios": {}}
+    try:
+        for scenario in scenarios:
+            before = stubs.stats()
+            kind, _, pipeline = scenario.partition(":")
+            if scenario in PIPELINE_SCENARIOS:
+                result = run_pipeline_scenario(scenario, args, stubs, tracer)
+            elif kind in ("http", "mcp") and pipeline in PIPELINE_SCENARIOS:
+                with hayhooks_server([pipeline], env, args.workers) as base_url:
+                    runner = run_http_scenario if kind == "http" else run_mcp_scenario
+                    result = runner(pipeline, args, stubs, base_url)
+            elif scenario == "openai":
+                with hayhooks_server(["letta_proxy"], env, args.workers) as base_url:
+                    result = run_openai_scenario(args, base_url)
+            else:
+                raise SystemExit(f"Unknown scenario {scenario!r}")
+
+            after = stubs.stats()
+            result["stubs"] = {name: {k: after[name][k] - before[name][k] for k in after[name]} for name in after}
+            report["scenarios"][scenario] = result
+    finally:
+        tracing.disable_tracing()
+        stubs.stop()
+        state_dir.cleanup()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+# A stub handler gets (method, path, query, body) and returns (status, content type, body).
+StubHandler = Callable[[str, str, Dict[str, str], bytes], Tuple[int, str, bytes]]
+
+SERVICES = ["pages", "searxng", "tavily", "jina", "github", "llm"]
+
+
+@dataclass
+class StubBehavior:
+    """How a stub server misbehaves.
+
+    Attributes:
+        latency_ms (float): Delay added to every response.
+        jitter_ms (float): Up to this much extra random delay.
+        failure_rate (float): Fraction of requests answered with `failure_status` instead.
+        failure_status (int): The status code of injected failures.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    failure_status: int = 503
+
+
+class StubServer:
+    """A local HTTP server standing in for an external service, on an ephemeral port."""
+
+    def __init__(self, name: str, handler: StubHandler, behavior: Optional[StubBehavior] = None, seed: int = 0):
+        """Initialize the stub server.
+
+        Args:
+            name (str): The service name, used in reports.
+            handler (StubHandler): Produces the responses.
+            behavior (Optional[StubBehavior]): Latency and failure injection.
+            seed (int): Seed for the jitter and failure injection.
+        """
+        self.name = name
+        self.handler = handler
+        self.behavior = behavior or StubBehavior()
+        self.requests = 0
+        self.injected_failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_request_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"stub-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requests": self.requests, "injected_failures": self.injected_failures}
+
+    def _plan_response(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            delay = self.behavior.latency_ms + self._random.uniform(0, self.behavior.jitter_ms)
+            fail = self._random.random() < self.behavior.failure_rate
+            if fail:
+                self.injected_failures += 1
+        return delay / 1000, fail
+
+    def _make_request_handler(self):
+        stub = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, method: str):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                delay, fail = stub._plan_response()
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    status, content_type, data = stub.behavior.failure_status, "application/json", b'{"error": "injected failure"}'
+                else:
+                    status, content_type, data = stub.handler(method, parsed.path, query, body)
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return RequestHandler
+
+
+def _json(status: int, payload) -> Tuple[int, str, bytes]:
+    return status, "application/json", json.dumps(payload).encode("utf-8")
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def page_text(page_id: int, size_kb: int) -> str:
+    """Deterministic filler text for a page of roughly `size_kb` kilobytes."""
+    paragraph = f"Page {page_id} discusses topic {page_id % 17} in some detail. " * 8
+    return "\n\n".join([paragraph] * max(1, (size_kb * 1024) // len(paragraph)))
+
+
+def pages_handler(size_kb: int = 20) -> StubHandler:
+    """Web pages at /page/<id>.html and /page/<id>.txt."""
+
+    def handle(method, path, query, body):
+        name = path.rsplit("/", 1)[-1]
+        stem, _, extension = name.partition(".")
+        if not path.startswith("/page/") or not stem.isdigit():
+            return 404, "text/plain", b"not found"
+        page_id = int(stem)
+        text = page_text(page_id, size_kb)
+        if extension == "txt":
+            return 200, "text/plain; charset=utf-8", text.encode("utf-8")
+        paragraphs = "".join(f"<p>{p}</p>" for p in text.split("\n\n"))
+        html = f"<html><head><title>Stub page {page_id}</title></head><body><nav>Home | About</nav><article><h1>Stub page {page_id}</h1>{paragraphs}</article><footer>Footer</footer></body></html>"
+        return 200, "text/html; charset=utf-8", html.encode("utf-8")
+
+    return handle
+
+
+def searxng_handler(pages_url: str, results: int = 5) -> StubHandler:
+    """The SearXNG JSON search API, with results pointing at the pages stub."""
+
+    def handle(method, path, query, body):
+        q = query.get("q", "")
+        start = _digest(q) % 10_000
+        count = int(query.get("num_results", results))
+        items = [{"title": f"Result {i} for {q}", "url": f"{pages_url}/page/{start + i}.html", "content": f"Snippet {i} about {q}", "engine": "stub", "score": 1.0 / (i + 1)} for i in range(count)]
+        return _json(200, {"query": q, "results": items})
+
+    return handle
+
+
+def tavily_handler(pages_url: str) -> StubHandler:
+    """The Tavily search API."""
+
+    def handle(method, path, query, body):
+        request = json.loads(body or b"{}")
+        q = request.get("query", "")
+        start = _digest(q) % 10_000 + 50_000
+        count = int(request.get("max_results", 5))
+        items = [{"title": f"Tavily result {i} for {q}", "url": f"{pages_url}/page/{start + i}.html", "content": f"Tavily snippet {i} about {q}", "score": 1.0 / (i + 1)} for i in range(count)]
+        return _json(200, {"query": q, "results": items, "response_time": 0.01})
+
+    return handle
+
+
+def jina_handler(size_kb: int = 20) -> StubHandler:
+    """The Jina reader, which returns the page behind /<url> as JSON."""
+
+    def handle(method, path, query, body):
+        target = unquote(path.lstrip("/"))
+        return _json(200, {"content": page_text(_digest(target) % 10_000, size_kb), "content_type": "text/plain", "url": target})
+
+    return handle
+
+
+def github_handler() -> StubHandler:
+    """The GitHub REST API endpoints used by the pull request resolver."""
+
+    def handle(method, path, query, body):
+        parts = path.strip("/").split("/")
+        if len(parts) == 5 and parts[0] == "repos" and parts[3] == "pulls":
+            owner, repo, number = parts[1], parts[2], parts[4]
+            return _json(
+                200,
+                {
+                    "number": int(number) if number.isdigit() else number,
+                    "title": f"Stub pull request {number} in {owner}/{repo}",
+                    "state": "open",
+                    "user": {"login": "stub"},
+                    "body": page_text(_digest(path) % 1000, 2),
+                    "created_at": "2025-01-01T00:00:00Z",
+                    "updated_at": "2025-01-02T00:00:00Z",
+                    "head": {"ref": "feature", "sha": "0" * 40},
+                    "base": {"ref": "main"},
+                    "commits": 1,
+                    "additions": 10,
+                    "deletions": 2,
+                    "changed_files": 1,
+                },
+            )
+        return _json(404, {"message": "Not Found"})
+
+    return handle
+
+
+def llm_handler(reply_words: int = 100) -> StubHandler:
+    """An OpenAI-compatible chat completions API that answers with filler text."""
+
+    def handle(method, path, query, body):
+        if not path.endswith("/chat/completions"):
+            return _json(404, {"error": {"message": "not found"}})
+        request = json.loads(body or b"{}")
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+        reply = " ".join(["answer"] * reply_words)
+        return _json(
+            200,
+            {
+                "id": f"chatcmpl-stub-{_digest(str(prompt_chars))}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub-model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": reply_words, "total_tokens": prompt_chars // 4 + reply_words},
+            },
+        )
+
+    return handle
+
+
+class StubCluster:
+    """All the stub services a benchmark run needs, started together."""
+
+    def __init__(self, behaviors: Optional[Dict[str, StubBehavior]] = None, page_size_kb: int = 20, seed: int = 0):
+        """Start the stub servers.
+
+        Args:
+            behaviors (Optional[Dict[str, StubBehavior]]): Latency and failure injection by service name.
+            page_size_kb (int): The size of the generated pages.
+            seed (int): Seed for the jitter and failure injection.
+        """
+        behaviors = behaviors or {}
+        unknown = set(behaviors) - set(SERVICES)
+        if unknown:
+            raise ValueError(f"Unknown stub services {sorted(unknown)}, expected some of {SERVICES}")
+
+        def server(name: str, handler: StubHandler) -> StubServer:
+            return StubServer(name, handler, behaviors.get(name), seed=seed + SERVICES.index(name)).start()
+
+        pages = server("pages", pages_handler(page_size_kb))
+        self.servers: Dict[str, StubServer] = {
+            "pages": pages,
+            "searxng": server("searxng", searxng_handler(pages.url)),
+            "tavily": server("tavily", tavily_handler(pages.url)),
+            "jina": server("jina", jina_handler(page_size_kb)),
+            "github": server("github", github_handler()),
+            "llm": server("llm", llm_handler()),
+        }
+
+    def url(self, name: str) -> str:
+        return self.servers[name].url
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables pointing hayhooks at the stubs instead of the real services."""
+        return {
+            "SEARXNG_BASE_URL": self.url("searxng"),
+            "HAYHOOKS_SEARCH_SEARXNG_ENABLED": "true",
+            "TAVILY_API_KEY": "stub",
+            "TAVILY_API_BASE_URL": self.url("tavily"),
+            "JINA_READER_URL": self.url("jina"),
+            "GITHUB_API_BASE_URL": self.url("github"),
+            "OPENAI_API_BASE": f"{self.url('llm')}/v1",
+            "OPENAI_API_KEY": "stub",
+            "HAYHOOKS_SEARCH_MODEL": "stub-model",
+            "HAYHOOKS_EXCERPT_MODEL": "stub-model",
+            "HAYSTACK_TELEMETRY_ENABLED": "False",
+        }
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: server.stats() for name, server in self.servers.items()}
+
+    def stop(self) -> None:
+        for server in self.servers.values():
+            server.stop()
@@ -0,0 +1,128 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List
+
+from hayhooks import log as logger
+from haystack import Pipeline
+
+# How many URLs of one bulk request are extracted at the same time.
+DEFAULT_MAX_WORKERS = int(os.getenv("HAYHOOKS_BULK_EXTRACT_MAX_WORKERS", "8"))
+
+# The most URLs a single bulk request may ask for.
+DEFAULT_MAX_URLS = int(os.getenv("HAYHOOKS_BULK_EXTRACT_MAX_URLS", "50"))
+
+PROBLEM_TYPE = "urn:hayhooks:extract:error"
+
+
+class BulkExtractor:
+    """Runs the extract pipeline for many URLs concurrently and yields results as they complete.
+
+    Every URL gets its own pipeline run, so one slow or failing page never holds up the others, and
+    each result carries its own status: the extracted contents, or a problem details object in the
+    same shape the `extract` pipeline returns.
+    """
+
+    def __init__(self, pipeline: Pipeline, component_name: str = "content_extractor", max_workers: int = DEFAULT_MAX_WORKERS, max_urls: int = DEFAULT_MAX_URLS):
+        """Initialize the bulk extractor.
+
+        Args:
+            pipeline (Pipeline): A pipeline containing the content extraction component.
+            component_name (str): The name of the content extraction component in the pipeline.
+            max_workers (int): The number of URLs extracted at the same time.
+            max_urls (int): The most URLs accepted in one call.
+        """
+        self.pipeline = pipeline
+        self.component_name = component_name
+        self.max_workers = max_workers
+        self.max_urls = max_urls
+
+    def extract(self, url: str) -> Dict[str, Any]:
+        """Extract a single URL.
+
+        Args:
+            url (str): The URL to extract.
+
+        Returns:
+            Dict[str, Any]: `{"url", "status": "200", "contents"}` on success, or problem details with the URL.
+        """
+        try:
+            result = self.pipeline.run({self.component_name: {"urls": [url]}})
+            documents = result.get(self.component_name, {}).get("documents") or []
+            contents = [doc.content for doc in documents if doc.content]
+            if not contents:
+                return self._problem(url, "404", "No content extracted", f"There is no good way to extract the contents of url {url}, i.e. it may be a video that has no available transcript.")
+            return {"url": url, "status": "200", "contents": contents}
+        except Exception as e:
+            logger.exception(f"Error extracting content from {url}")
+            return self._problem(url, "500", "Exception", f"Error extracting content from {url}: {str(e)}")
+
+    def iter_results(self, urls: List[str]) -> Iterator[Dict[str, Any]]:
+        """Extract URLs concurrently, yielding each result as soon as it is ready.
+
+        Duplicate URLs are extracted once. Each result has the URL's position in `urls` as `index`
+        and the time its extraction took as `elapsed_ms`. If the caller stops iterating (for example
+        because the client disconnected), extractions that have not started yet are cancelled.
+
+        Args:
+            urls (List[str]): The URLs to extract.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Results in completion order.
+
+        Raises:
+            ValueError: If there are more URLs than `max_urls`.
+        """
+        if len(urls) > self.max_urls:
+            raise ValueError(f"At most {self.max_urls} URLs can be extracted at once, got {len(urls)}")
+
+        indexes: Dict[str, int] = {}
+        for index, url in enumerate(urls):
+            indexes.setdefault(url, index)
+        if not indexes:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(indexes)), thread_name_prefix="bulk-extract")
+        try:
+            pending = {executor.submit(self._timed_extract, url): url for url in indexes}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    yield {"index": indexes[url], **self._result(future, url)}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed_extract(self, url: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = self.extract(url)
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    def _result(self, future: Future, url: str) -> Dict[str, Any]:
+        try:
+            return future.result()
+        except Exception as e:
+            return self._problem(url, "500", "Exception", f"Error extracting content from {url}: {str(e)}")
+
+    @staticmethod
+    def _problem(url: str, status: str, title: str, detail: str) -> Dict[str, Any]:
+        return {"url": url, "type": PROBLEM_TYPE, "title": title, "status": status, "detail": detail}
+
+
+def to_ndjson(results: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Encode results as newline-delimited JSON."""
+    for result in results:
+        yield json.dumps(result) + "\n"
+
+
+def to_sse(results: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Encode results as server-sent events, ending with a `done` event that has the counts."""
+    total = failed = 0
+    for result in results:
+        total += 1
+        if result.get("status") != "200":
+            failed += 1
+        yield f"event: result\ndata: {json.dumps(result)}\n\n"
+    yield f"event: done\ndata: {json.dumps({'total': total, 'failed': failed})}\n\n"
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from hayhooks import log as logger
+from haystack import component
+from haystack.lazy_imports import LazyImport
+
+from components.shared_state import SharedStore
+
+with LazyImport("Run 'pip install \"sentence-transformers\"' to use semantic LLM response caching.") as sentence_transformers_import:
+    from sentence_transformers import SentenceTransformer
+
+# How long an LLM reply is reused for an identical prompt, in seconds. 0 disables the cache.
+DEFAULT_TTL = float(os.getenv("HAYHOOKS_LLM_CACHE_TTL", "0"))
+
+# "exact" only reuses replies to byte-identical prompts, "semantic" also reuses replies to similar prompts.
+DEFAULT_MODE = os.getenv("HAYHOOKS_LLM_CACHE_MODE", "exact")
+
+# Cosine similarity a prompt needs with a cached prompt for its reply to be reused in semantic mode.
+DEFAULT_SIMILARITY_THRESHOLD = float(os.getenv("HAYHOOKS_LLM_CACHE_SIMILARITY", "0.95"))
+
+DEFAULT_EMBEDDING_MODEL = os.getenv("HAYHOOKS_LLM_CACHE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+MODES = ("exact", "semantic")
+
+
+class SemanticIndex:
+    """Prompt embeddings of cached replies, for finding a cached prompt similar to a new one.
+
+    The index lives in process memory and only points at cache keys; the replies themselves are in
+    the store, so an entry whose reply has expired is simply a miss.
+    """
+
+    def __init__(self, embed: Callable[[str], List[float]], threshold: float = DEFAULT_SIMILARITY_THRESHOLD, max_entries: int = 1000):
+        """Initialize the index.
+
+        Args:
+            embed (Callable[[str], List[float]]): Embeds a prompt.
+            threshold (float): The minimum cosine similarity for a match.
+            max_entries (int): Upper bound on the number of prompts kept, oldest are evicted first.
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, np.ndarray]]" = OrderedDict()
+
+    def vector(self, prompt: str) -> np.ndarray:
+        vector = np.asarray(self.embed(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def add(self, key: str, scope: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = (scope, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def nearest(self, scope: str, vector: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Return the key and similarity of the most similar prompt in `scope` above the threshold."""
+        with self._lock:
+            candidates = [(key, v) for key, (entry_scope, v) in self._entries.items() if entry_scope == scope]
+        if not candidates:
+            return None
+        similarities = np.stack([v for _, v in candidates]) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return candidates[best][0], float(similarities[best])
+
+
+def sentence_transformer_embedder(model: str = DEFAULT_EMBEDDING_MODEL) -> Callable[[str], List[float]]:
+    """Build an embedding function from a local sentence-transformers model."""
+    sentence_transformers_import.check()
+    encoder = SentenceTransformer(model)
+    return lambda text: encoder.encode(text, normalize_embeddings=True)
+
+
+@component
+class CachedGenerator:
+    """Wraps an OpenAIGenerator and reuses its replies for prompts it has already answered.
+
+    Replies are keyed by the model, a hash of the rendered prompt and system prompt, and the
+    generation parameters, and kept in a store (SQLite or Redis, see `SharedStore`) for `ttl`
+    seconds. In semantic mode a prompt that misses the exact key is embedded with a local model and
+    the reply of the most similar cached prompt is used if it is similar enough.
+
+    The component has the same inputs and outputs as OpenAIGenerator plus `bypass_cache`, so it
+    can replace one in a pipeline without changing the connections. Cached replies have
+    `"cached": True` in their meta.
+    """
+
+    def __init__(
+        self,
+        generator: Any,
+        store: Optional[SharedStore],
+        ttl: float = DEFAULT_TTL,
+        mode: str = DEFAULT_MODE,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        embed: Optional[Callable[[str], List[float]]] = None,
+    ):
+        """Initialize the cached generator.
+
+        Args:
+            generator (Any): The generator to call on a cache miss, usually an OpenAIGenerator.
+            store (Optional[SharedStore]): Where replies are kept. None disables the cache.
+            ttl (float): Seconds to keep a reply, 0 disables the cache.
+            mode (str): "exact" or "semantic".
+            similarity_threshold (float): The minimum cosine similarity for a semantic match.
+            embed (Optional[Callable[[str], List[float]]]): Embeds prompts in semantic mode. Defaults to a local sentence-transformers model.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}, expected one of {MODES}")
+        self.generator = generator
+        self.store = store
+        self.ttl = ttl
+        self.mode = mode
+        self.semantic_index: Optional[SemanticIndex] = None
+        if self.enabled and mode == "semantic":
+            self.semantic_index = SemanticIndex(embed or sentence_transformer_embedder(), threshold=similarity_threshold)
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None and self.ttl > 0
+
+    def scope(self, system_prompt: Optional[str], generation_kwargs: Optional[Dict[str, Any]]) -> str:
+        """A hash of everything besides the prompt that changes the reply."""
+        params = {**(getattr(self.generator, "generation_kwargs", None) or {}), **(generation_kwargs or {})}
+        payload = json.dumps({"model": getattr(self.generator, "model", None), "system_prompt": system_prompt, "params": params}, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def cache_key(self, prompt: str, scope: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"llm_cache:{scope[:32]}:{prompt_hash}"
+
+    @component.output_types(replies=List[str], meta=List[Dict[str, Any]])
+    def run(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        streaming_callback: Optional[Callable] = None,
+        generation_kwargs: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+    ):
+        """Return the cached reply for the prompt, or generate and cache one.
+
+        Args:
+            prompt (str): The rendered prompt.
+            system_prompt (Optional[str]): The system prompt.
+            streaming_callback (Optional[Callable]): Passed to the generator. Streamed calls are not cached.
+            generation_kwargs (Optional[Dict[str, Any]]): Generation parameters for this call.
+            bypass_cache (bool): Skip the cache lookup for this call. The fresh reply is still cached.
+
+        Returns:
+            Dict[str, Any]: `replies` and `meta`, as from OpenAIGenerator.
+        """
+        if not self.enabled or streaming_callback is not None:
+            return self._generate(prompt, system_prompt, streaming_callback, generation_kwargs)
+
+        scope = self.scope(system_prompt, generation_kwargs)
+        key = self.cache_key(prompt, scope)
+        vector = None
+        if not bypass_cache:
+            cached = self._lookup(key)
+            if cached is None and self.semantic_index is not None:
+                vector = self.semantic_index.vector(prompt)
+                match = self.semantic_index.nearest(scope, vector)
+                if match is not None:
+                    cached = self._lookup(match[0])
+                    if cached is not None:
+                        logger.debug(f"CachedGenerator: semantic hit with similarity {match[1]:.3f}")
+            if cached is not None:
+                return {"replies": cached["replies"], "meta": [{**m, "cached": True} for m in cached["meta"]]}
+
+        result = self._generate(prompt, system_prompt, streaming_callback, generation_kwargs)
+        if result.get("replies"):
+            self._save(key, result)
+            if self.semantic_index is not None:
+                self.semantic_index.add(key, scope, vector if vector is not None else self.semantic_index.vector(prompt))
+        return result
+
+    def _generate(self, prompt, system_prompt, streaming_callback, generation_kwargs) -> Dict[str, Any]:
+        return self.generator.run(prompt=prompt, system_prompt=system_prompt, streaming_callback=streaming_callback, generation_kwargs=generation_kwargs)
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.store.get(key)
+        except Exception as e:
+            logger.warning(f"CachedGenerator: cache lookup failed, calling the model: {e}")
+            return None
+
+    def _save(self, key: str, result: Dict[str, Any]) -> None:
+        # Usage details in the meta are not always plain JSON, so flatten anything that isn't.
+        entry = json.loads(json.dumps({"replies": result["replies"], "meta": result.get("meta", [])}, default=str))
+        try:
+            self.store.set(key, entry, ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"CachedGenerator: could not cache the reply: {e}")
+
+
+def with_response_cache(generator: Any) -> CachedGenerator:
+    """Wrap a generator in a CachedGenerator configured from the environment.
+
+    The store is `HAYHOOKS_LLM_CACHE_URL`, or the shared state store, or a local SQLite file, and
+    the semantic mode's embedding model is loaded once and shared between pipelines. With
+    `HAYHOOKS_LLM_CACHE_TTL` unset or 0 the wrapper just calls the generator.
+    """
+    from components.container import container
+
+    if DEFAULT_TTL <= 0:
+        return CachedGenerator(generator, store=None, ttl=0)
+    embed = None
+    if DEFAULT_MODE == "semantic":
+        embed = container.get(("llm_cache_embedder", DEFAULT_EMBEDDING_MODEL), lambda: sentence_transformer_embedder(DEFAULT_EMBEDDING_MODEL))
+    return CachedGenerator(generator, store=container.llm_cache_store(), embed=embed)
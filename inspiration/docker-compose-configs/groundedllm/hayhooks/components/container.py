@@ -0,0 +1,148 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from hayhooks import log as logger
+
+from components.resolver_registry import ResolverRegistry, resolver_registry
+from components.shared_state import MemoryStore, SharedStore, create_shared_store, shared_state_url
+
+T = TypeVar("T")
+
+DEFAULT_LLM_CACHE_URL = "sqlite:///llm_response_cache.db"
+
+
+class ComponentContainer:
+    """A process-wide container for the objects pipelines should share rather than build per pipeline.
+
+    Haystack components can only belong to one pipeline, so the container holds the things behind
+    them instead: OAuth handlers, content fetchers (and their HTTP connection pools), the Zotero
+    database and the URL resolver registry. Each object is built lazily, exactly once, and every
+    pipeline wrapper that asks for it gets the same instance.
+    """
+
+    def __init__(self, resolvers: Optional[ResolverRegistry] = None):
+        """Initialize the container.
+
+        Args:
+            resolvers (Optional[ResolverRegistry]): The resolver registry to share. Defaults to the process-wide registry.
+        """
+        self.resolvers = resolvers if resolvers is not None else resolver_registry
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._instances: Dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Return the shared instance for `key`, building it with `factory` on first use.
+
+        Only callers asking for the same key wait on each other, so a slow factory does not block
+        unrelated lookups.
+
+        Args:
+            key (Hashable): Identifies the instance, including any configuration that changes it.
+            factory (Callable[[], T]): Builds the instance.
+
+        Returns:
+            T: The shared instance.
+        """
+        if key in self._instances:
+            return self._instances[key]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key not in self._instances:
+                logger.debug(f"Building shared component {key}")
+                self._instances[key] = factory()
+            return self._instances[key]
+
+    def has(self, key: Hashable) -> bool:
+        return key in self._instances
+
+    def clear(self) -> None:
+        """Forget every shared instance, so the next lookup builds a new one."""
+        with self._lock:
+            self._instances.clear()
+            self._key_locks.clear()
+
+    def shared_store(self) -> Optional[SharedStore]:
+        """The store for state shared between worker processes, from `HAYHOOKS_SHARED_STATE_URL`.
+
+        Returns:
+            Optional[SharedStore]: The store, or None if no shared state is configured.
+        """
+        url = shared_state_url()
+        if url is None:
+            return None
+        return self.get(("shared_store", url), lambda: create_shared_store(url))
+
+    def cache_store(self) -> SharedStore:
+        """A store for cached results: the shared store if configured, otherwise one in process memory."""
+        store = self.shared_store()
+        if store is not None:
+            return store
+        return self.get("memory_store", MemoryStore)
+
+    def llm_cache_store(self) -> SharedStore:
+        """The store for cached LLM replies.
+
+        Uses `HAYHOOKS_LLM_CACHE_URL` if set, then `HAYHOOKS_SHARED_STATE_URL`, then a SQLite file
+        in the working directory, so cached replies survive restarts.
+        """
+        url = os.getenv("HAYHOOKS_LLM_CACHE_URL") or shared_state_url() or DEFAULT_LLM_CACHE_URL
+        return self.get(("shared_store", url), lambda: create_shared_store(url))
+
+    def page_cache(self):
+        """The cache of fetched and prefetched pages shared by the content extractors."""
+        from components.prefetch import PageCache
+
+        return self.get("page_cache", PageCache)
+
+    def outbound_scheduler(self):
+        """The scheduler every fetcher sends its requests through, so per-host limits hold across pipelines."""
+        from components.outbound import OutboundScheduler
+
+        return self.get("outbound_scheduler", OutboundScheduler)
+
+    def google_oauth(self):
+        """The shared GoogleOAuth handler, configured from the environment."""
+
+        def build():
+            from components.google.google_oauth import GoogleOAuth
+
+            return GoogleOAuth(token_store=self.shared_store())
+
+        return self.get("google_oauth", build)
+
+    def zotero_database(self, db_file: Optional[str] = None, raise_on_failure: bool = False):
+        """The shared Zotero SQLite cache for `db_file`.
+
+        Args:
+            db_file (Optional[str]): The database file. Defaults to `ZOTERO_DB_FILE` or the default file.
+            raise_on_failure (bool): Whether database errors should raise.
+        """
+        from components.zotero import ZoteroDatabase
+
+        db_file = db_file or os.getenv("ZOTERO_DB_FILE") or ZoteroDatabase.DEFAULT_DB_FILE
+        return self.get(
+            ("zotero_database", os.path.abspath(db_file), raise_on_failure),
+            lambda: ZoteroDatabase(db_file=db_file, raise_on_failure=raise_on_failure),
+        )
+
+    def content_fetchers(self) -> Dict[str, Any]:
+        """The shared content fetchers used by ContentFetcherResolver, keyed by fetcher name."""
+
+        def build():
+            from components.fetchers import HaystackLinkContentFetcher, JinaLinkContentFetcher, ScraplingLinkContentFetcher
+
+            return {
+                "scrapling": ScraplingLinkContentFetcher(),
+                "jina": JinaLinkContentFetcher(),
+                "default": HaystackLinkContentFetcher(),
+            }
+
+        return self.get("content_fetchers", build)
+
+
+container = ComponentContainer()
@@ -7,7 +7,6 @@ from haystack.components.converters import (
     CSVToDocument,
     HTMLToDocument,
     MarkdownToDocument,
-    PyPDFToDocument,
     TextFileToDocument,
 )
 from haystack.components.joiners import DocumentJoiner
@@ -16,28 +15,29 @@ from haystack.components.routers import FileTypeRouter
 from haystack.dataclasses import ByteStream
 from haystack.utils import Secret
 
-from components.fetchers import ContentFetcherResolver
-from components.github import GithubIssueContentResolver, GithubPRContentResolver, GithubRepoContentResolver
-from components.google.google_oauth import GoogleOAuth
-from components.notion import NotionContentResolver
-from components.stackoverflow import StackOverflowContentResolver
-from components.youtube_transcript import YouTubeTranscriptResolver
-from components.zotero import ZoteroContentResolver
+from components.container import container
+from components.main_content import MAIN_CONTENT_ENABLED, MainContentExtractor
+from components.near_duplicates import DEFAULT_MAX_DISTANCE, remove_near_duplicates
+from components.pdf import LazyPyPDFToDocument
+from components.prefetch import PageCache, current_prefetch_owner
+from components.resolver_registry import LazyResolver
 
 
 @component
 class URLContentRouter:
     """A component that routes URLs to the appropriate resolver."""
 
-    def __init__(self, resolvers: List[Any]):
+    def __init__(self, resolvers: List[Any], page_cache: Optional[PageCache] = None):
         """Initialize the URL router.
 
         Args:
             resolvers (List[Any]): A list of URL content resolvers.
+            page_cache (Optional[PageCache]): Pages that were prefetched, used instead of fetching them again.
         """
         self.resolvers = resolvers
         # The last resolver should be the generic one that can handle any URL
         self.generic_resolver = resolvers[-1]
+        self.page_cache = page_cache
 
     @component.output_types(streams=List[ByteStream])
     def run(self, urls: List[str]):
@@ -49,6 +49,22 @@ class URLContentRouter:
         Returns:
             Dict[str, List[ByteStream]]: A dictionary with a "streams" key containing a list of ByteStream objects.
         """
+        all_streams = []
+
+        if self.page_cache is not None:
+            # Stop prefetching results this run turned out not to need, and use the pages that were prefetched
+            owner = current_prefetch_owner()
+            if owner is not None:
+                self.page_cache.cancel(owner=owner, keep=urls)
+            remaining = []
+            for url in urls:
+                cached = self.page_cache.get(url)
+                if cached:
+                    all_streams.extend(cached)
+                else:
+                    remaining.append(url)
+            urls = remaining
+
         # Group URLs by resolver
         resolver_urls: Dict[Any, List[str]] = {}
 
@@ -59,8 +75,6 @@ class URLContentRouter:
             resolver_urls[resolver].append(url)
 
         # Fetch content using each resolver
-        all_streams = []
-
         for resolver, urls in resolver_urls.items():
             try:
                 result = resolver.run(urls)
@@ -74,6 +88,17 @@ class URLContentRouter:
 
         return {"streams": all_streams}
 
+    def fetch(self, url: str) -> List[ByteStream]:
+        """Fetch a single URL with its resolver, bypassing the page cache.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            List[ByteStream]: The streams for the URL.
+        """
+        return self._find_resolver(url).run([url]).get("streams", [])
+
     def _find_resolver(self, url: str) -> Any:
         """Find the appropriate resolver for the given URL.
 
@@ -107,6 +132,20 @@ class ExtractUrls:
 
 @component
 class JoinWithContent:
+    """Joins scored search results with the extracted contents of their pages.
+
+    Near-duplicate pages (the same article syndicated, mirrored or served as AMP) are collapsed into
+    the highest-scored one, with the other URLs in its `duplicate_urls` meta.
+    """
+
+    def __init__(self, near_duplicate_distance: Optional[int] = DEFAULT_MAX_DISTANCE):
+        """Initialize the joiner.
+
+        Args:
+            near_duplicate_distance (Optional[int]): The most SimHash bits near-duplicates may differ in, None keeps every document.
+        """
+        self.near_duplicate_distance = near_duplicate_distance
+
     @component.output_types(documents=list[Document])
     def run(self, scored_documents: list[Document], content_documents: list[Document]):
         joined_documents = []
@@ -161,6 +200,12 @@ class JoinWithContent:
                 }
             )
             joined_documents.append(doc)
+
+        if self.near_duplicate_distance is not None:
+            deduplicated = remove_near_duplicates(joined_documents, max_distance=self.near_duplicate_distance)
+            if len(deduplicated) < len(joined_documents):
+                logger.debug(f"run: removed {len(joined_documents) - len(deduplicated)} near-duplicate documents")
+            joined_documents = deduplicated
         return {"documents": joined_documents}
 
 
@@ -170,12 +215,13 @@ def build_search_extraction_component(
     retry_attempts: int = 2,
     timeout: int = 3,
     http2: bool = False,
+    page_cache: Optional[PageCache] = None,
 ) -> SuperComponent:
     """Fetches URLs from a list of documents and extract the contents of the pages"""
 
     pipe = Pipeline()
 
-    content_extraction_component = build_content_extraction_component(raise_on_failure=raise_on_failure, user_agents=user_agents, retry_attempts=retry_attempts, timeout=timeout, http2=http2)
+    content_extraction_component = build_content_extraction_component(raise_on_failure=raise_on_failure, user_agents=user_agents, retry_attempts=retry_attempts, timeout=timeout, http2=http2, page_cache=page_cache)
 
     extract_urls_adapter = ExtractUrls()
     content_joiner = JoinWithContent()
@@ -202,11 +248,14 @@ def build_content_extraction_component(
     retry_attempts: int = 2,
     timeout: int = 3,
     http2: bool = False,
+    page_cache: Optional[PageCache] = None,
 ) -> SuperComponent:
     """Builds a Haystack SuperComponent responsible for fetching content from URLs,
     determining file types, converting them to Documents, joining them,
     and cleaning them.
 
+    If a page cache is given, pages prefetched into it are used instead of being fetched again.
+
     Returns:
         A SuperComponent ready to be added to a pipeline.
         Input: urls (List[str])
@@ -215,63 +264,8 @@ def build_content_extraction_component(
     """
     preprocessing_pipeline = Pipeline()
 
-    # Create resolvers
-    stackoverflow_resolver = StackOverflowContentResolver(
-        raise_on_failure=raise_on_failure,
-        timeout=timeout,
-    )
-
-    zotero_resolver = ZoteroContentResolver(
-        raise_on_failure=raise_on_failure,
-        timeout=timeout,
-    )
-
-    user_id = os.environ.get("HAYHOOKS_USER_ID", "me")
-    google_oauth = GoogleOAuth()
-
-    # Create YouTube transcript resolver
-    youtube_resolver = YouTubeTranscriptResolver(
-        oauth_provider=google_oauth,
-        raise_on_failure=raise_on_failure,
-        user_id=user_id,
-    )
-
-    notion_resolver = NotionContentResolver(raise_on_failure=raise_on_failure)
-
-    github_token = None
-    if os.getenv("GITHUB_API_KEY"):
-        github_token = Secret.from_env_var("GITHUB_API_KEY")
-    github_issue_resolver = GithubIssueContentResolver(
-        github_token=github_token,  # use api key to get private content and avoid rate limits
-        raise_on_failure=raise_on_failure,
-    )
-
-    github_repo_resolver = GithubRepoContentResolver(
-        github_token=github_token,  # use api key to get private content and avoid rate limits
-        raise_on_failure=raise_on_failure,
-    )
-
-    github_pr_resolver = GithubPRContentResolver(
-        github_token=github_token,  # use api key to get private content and avoid rate limits
-        raise_on_failure=raise_on_failure,
-    )
-
-    # Content fetcher resolver as fallback, this just handles generic URLs
-    content_fetcher_resolver = ContentFetcherResolver(raise_on_failure=raise_on_failure)
-
-    # Create router with all resolvers (generic resolver must be last)
-    url_router = URLContentRouter(
-        resolvers=[
-            stackoverflow_resolver,
-            zotero_resolver,
-            youtube_resolver,
-            notion_resolver,
-            github_issue_resolver,
-            github_pr_resolver,
-            github_repo_resolver,
-            content_fetcher_resolver,  # Must be last
-        ]
-    )
+    # Resolvers are shared across pipelines and only built on first use, see build_url_resolvers
+    url_router = URLContentRouter(resolvers=build_url_resolvers(raise_on_failure=raise_on_failure, timeout=timeout), page_cache=page_cache)
 
     document_cleaner = DocumentCleaner()
 
@@ -294,7 +288,7 @@ def build_content_extraction_component(
     html_converter = HTMLToDocument()
     markdown_converter = MarkdownToDocument()
     mdx_converter = MarkdownToDocument()  # Treat mdx as markdown
-    pdf_converter = PyPDFToDocument()
+    pdf_converter = LazyPyPDFToDocument()
     csv_converter = CSVToDocument()
     # docx_converter = DOCXToDocument() # If needed later
     document_joiner = DocumentJoiner()
@@ -320,7 +314,14 @@ def build_content_extraction_component(
     preprocessing_pipeline.connect("url_router.streams", "file_type_router.sources")
 
     preprocessing_pipeline.connect("file_type_router.text/plain", "text_file_converter.sources")
-    preprocessing_pipeline.connect("file_type_router.text/html", "html_converter.sources")
+    if MAIN_CONTENT_ENABLED:
+        # Strip boilerplate and convert to Markdown first, only pages where that fails get the full HTML conversion
+        preprocessing_pipeline.add_component(instance=MainContentExtractor(), name="main_content_extractor")
+        preprocessing_pipeline.connect("file_type_router.text/html", "main_content_extractor.sources")
+        preprocessing_pipeline.connect("main_content_extractor.unextracted", "html_converter.sources")
+        preprocessing_pipeline.connect("main_content_extractor.documents", "document_joiner")
+    else:
+        preprocessing_pipeline.connect("file_type_router.text/html", "html_converter.sources")
     preprocessing_pipeline.connect("file_type_router.text/csv", "csv_converter.sources")
     preprocessing_pipeline.connect("file_type_router.application/pdf", "pypdf_converter.sources")
     preprocessing_pipeline.connect("file_type_router.text/markdown", "markdown_converter.sources")
@@ -345,3 +346,92 @@ def build_content_extraction_component(
         output_mapping={"document_cleaner.documents": "documents"},
     )
     return extraction_component
+
+
+def build_url_resolvers(raise_on_failure: bool = True, timeout: int = 3) -> List[LazyResolver]:
+    """Returns the URL content resolvers for a URLContentRouter, most specific first.
+
+    The resolvers come from the shared component container's resolver registry, so every pipeline
+    using the same settings shares one instance of each, and they in turn share the container's
+    fetchers, Zotero database and Google OAuth handler. Nothing is constructed (or imported) until a
+    resolver is first used, and the registry warms them up in a background thread so that slow work like the
+    initial Zotero sync does not block startup.
+
+    Returns:
+        A list of resolvers, with the generic content fetcher resolver last.
+    """
+    registry = container.resolvers
+    resolvers = [
+        registry.resolver("stackoverflow", _build_stackoverflow_resolver, raise_on_failure=raise_on_failure, timeout=timeout),
+        registry.resolver("zotero", _build_zotero_resolver, raise_on_failure=raise_on_failure, timeout=timeout),
+        registry.resolver("youtube", _build_youtube_resolver, raise_on_failure=raise_on_failure),
+        registry.resolver("notion", _build_notion_resolver, raise_on_failure=raise_on_failure),
+        registry.resolver("github_issue", _build_github_issue_resolver, raise_on_failure=raise_on_failure),
+        registry.resolver("github_pr", _build_github_pr_resolver, raise_on_failure=raise_on_failure),
+        registry.resolver("github_repo", _build_github_repo_resolver, raise_on_failure=raise_on_failure),
+        # Content fetcher resolver as fallback, this just handles generic URLs
+        registry.resolver("content_fetcher", _build_content_fetcher_resolver, raise_on_failure=raise_on_failure),  # Must be last
+    ]
+    registry.warm_up_in_background()
+    return resolvers
+
+
+# The factories below import their modules on first use, which keeps heavy dependencies like
+# scrapling, pyzotero and googleapiclient out of the startup path.
+
+
+def _build_stackoverflow_resolver(raise_on_failure: bool, timeout: int):
+    from components.stackoverflow import StackOverflowContentResolver
+
+    return StackOverflowContentResolver(raise_on_failure=raise_on_failure, timeout=timeout)
+
+
+def _build_zotero_resolver(raise_on_failure: bool, timeout: int):
+    from components.zotero import ZoteroContentResolver
+
+    db = container.zotero_database(raise_on_failure=raise_on_failure)
+    return ZoteroContentResolver(raise_on_failure=raise_on_failure, timeout=timeout, db=db)
+
+
+def _build_youtube_resolver(raise_on_failure: bool):
+    from components.youtube_transcript import YouTubeTranscriptResolver
+
+    user_id = os.environ.get("HAYHOOKS_USER_ID", "me")
+    return YouTubeTranscriptResolver(oauth_provider=container.google_oauth(), raise_on_failure=raise_on_failure, user_id=user_id)
+
+
+def _build_notion_resolver(raise_on_failure: bool):
+    from components.notion import NotionContentResolver
+
+    return NotionContentResolver(raise_on_failure=raise_on_failure)
+
+
+def _github_token() -> Optional[Secret]:
+    # use api key to get private content and avoid rate limits
+    if os.getenv("GITHUB_API_KEY"):
+        return Secret.from_env_var("GITHUB_API_KEY")
+    return None
+
+
+def _build_github_issue_resolver(raise_on_failure: bool):
+    from components.github import GithubIssueContentResolver
+
+    return GithubIssueContentResolver(github_token=_github_token(), raise_on_failure=raise_on_failure)
+
+
+def _build_github_pr_resolver(raise_on_failure: bool):
+    from components.github import GithubPRContentResolver
+
+    return GithubPRContentResolver(github_token=_github_token(), raise_on_failure=raise_on_failure)
+
+
+def _build_github_repo_resolver(raise_on_failure: bool):
+    from components.github import GithubRepoContentResolver
+
+    return GithubRepoContentResolver(github_token=_github_token(), raise_on_failure=raise_on_failure)
+
+
+def _build_content_fetcher_resolver(raise_on_failure: bool):
+    from components.fetchers import ContentFetcherResolver
+
+    return ContentFetcherResolver(raise_on_failure=raise_on_failure, fetchers=container.content_fetchers())
@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
@@ -6,7 +8,9 @@ from haystack import component
 from haystack.components.fetchers import LinkContentFetcher
 from haystack.dataclasses import ByteStream
 from haystack.utils import Secret
-from scrapling.fetchers import Fetcher
+
+from components.container import container
+from components.outbound import OutboundScheduler
 
 
 @component
@@ -21,6 +25,7 @@ class ContentFetcherResolver:
         fetcher_configs: Optional[List[Dict[str, Any]]] = None,
         default_fetcher: str = "default",
         raise_on_failure: bool = False,
+        fetchers: Optional[Dict[str, Any]] = None,
     ):
         """Initialize the ContentFetcherRouter.
 
@@ -28,6 +33,7 @@ class ContentFetcherResolver:
             fetcher_configs (Optional[List[Dict[str, Any]]]): List of fetcher configurations with patterns and preferences
             default_fetcher (str): Default fetcher to use when no patterns match
             raise_on_failure (bool): Whether to raise exceptions on fetcher failures
+            fetchers (Optional[Dict[str, Any]]): Fetchers to use, keyed by name, e.g. ones shared with other resolvers. Built here if not given.
         """
         self.raise_on_failure = raise_on_failure
         self.default_fetcher = default_fetcher
@@ -44,7 +50,10 @@ class ContentFetcherResolver:
             ]
 
         self.fetcher_configs = fetcher_configs
-        self._initialize_fetchers()
+        if fetchers is not None:
+            self.fetchers = fetchers
+        else:
+            self._initialize_fetchers()
 
     def can_handle(self, url: str) -> bool:
         # This can handle any URL
@@ -189,6 +198,7 @@ class ScraplingLinkContentFetcher:
         timeout: int = 30,
         retry_attempts: int = 2,
         raise_on_failure: bool = False,
+        scheduler: Optional[OutboundScheduler] = None,
     ):
         """Initialize the ScraplingLinkContentFetcher.
 
@@ -196,10 +206,12 @@ class ScraplingLinkContentFetcher:
             timeout (int): The timeout for the HTTP request in seconds.
             retry_attempts (int): The number of retry attempts for failed requests.
             raise_on_failure (bool): Whether to raise an exception if fetching fails.
+            scheduler (Optional[OutboundScheduler]): Paces requests per host. Defaults to the container's scheduler.
         """
         self.timeout = timeout
         self.retry_attempts = retry_attempts
         self.raise_on_failure = raise_on_failure
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
         self._available: Optional[bool] = None  # Cache availability status
         self._failure_count = 0  # Track consecutive failures
 
@@ -284,20 +296,25 @@ class ScraplingLinkContentFetcher:
             Tuple[Dict[str, str], ByteStream]: A tuple containing metadata and ByteStream.
         """
 
+        # Scrapling pulls in browser engines on import, so only load it when it is actually used.
+        from scrapling.fetchers import Fetcher
+
         # response = StealthyFetcher.fetch(url, timeout=self.timeout, headless=True, block_images=True, disable_resources=True)
-        response = Fetcher.get(url, timeout=self.timeout)
+        with self.scheduler.slot(url):
+            response = Fetcher.get(url, timeout=self.timeout)
+        self.scheduler.report(url, response.status, response.headers)
 
         # Check for successful response
         if response.status != 200:
             logger.error(f"Scrapling failure for url {url} status_code={response.status}")
             raise RuntimeError(f"HTTP {response.status}: {response.reason}")
 
-        # Extract text content from the response
-        content = str(response.get_all_text())
-
         # Get content type from headers, default to text/html
         content_type = response.headers.get("content-type", "text/html")
 
+        # Keep HTML as HTML so main content extraction can tell the article from the navigation
+        content = str(response.html_content) if "text/html" in content_type else str(response.get_all_text())
+
         # Extract additional metadata if available
         title = ""
         try:
@@ -325,6 +342,29 @@ class ScraplingLinkContentFetcher:
         return metadata, stream
 
 
+class _Done:
+    """An awaitable that is already complete."""
+
+    def __await__(self):
+        return iter(())
+
+
+class ResponseReporter:
+    """An httpx response hook that tells the outbound scheduler how each host answered.
+
+    LinkContentFetcher builds its sync and async clients from the same `client_kwargs`, and an
+    AsyncClient awaits its hooks, so the hook reports right away and returns an awaitable that is
+    already done. That way it works on either client.
+    """
+
+    def __init__(self, scheduler: OutboundScheduler):
+        self.scheduler = scheduler
+
+    def __call__(self, response: httpx.Response) -> _Done:
+        self.scheduler.report(str(response.request.url), response.status_code, response.headers)
+        return _Done()
+
+
 @component
 class HaystackLinkContentFetcher:
     """
@@ -339,6 +379,7 @@ class HaystackLinkContentFetcher:
         timeout: int = 3,
         http2: bool = False,
         client_kwargs: Optional[Dict] = None,
+        scheduler: Optional[OutboundScheduler] = None,
     ):
         """Initialize the FallbackLinkContentFetcher.
 
@@ -349,7 +390,15 @@ class HaystackLinkContentFetcher:
             timeout (int): The timeout for the primary fetcher in seconds.
             http2 (bool): Whether to use HTTP/2 for the primary fetcher.
             client_kwargs (Optional[Dict]): Additional kwargs for the primary fetcher's HTTP client.
+            scheduler (Optional[OutboundScheduler]): Paces requests per host. Defaults to the container's scheduler.
         """
+        self.raise_on_failure = raise_on_failure
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
+        # LinkContentFetcher retries and swallows HTTP errors, so its responses are reported from a client hook.
+        client_kwargs = dict(client_kwargs or {})
+        event_hooks = dict(client_kwargs.get("event_hooks") or {})
+        event_hooks["response"] = [*event_hooks.get("response", []), ResponseReporter(self.scheduler)]
+        client_kwargs["event_hooks"] = event_hooks
         self.primary_fetcher = LinkContentFetcher(
             raise_on_failure=False,  # We handle failures ourselves
             user_agents=user_agents,
@@ -358,7 +407,14 @@ class HaystackLinkContentFetcher:
             http2=http2,
             client_kwargs=client_kwargs,
         )
-        self.raise_on_failure = raise_on_failure
+
+    def _fetch(self, url: str) -> List[ByteStream]:
+        try:
+            with self.scheduler.slot(url):
+                return self.primary_fetcher.run([url])["streams"]
+        except Exception as e:
+            logger.warning(f"Primary fetcher could not fetch {url}: {e}")
+            return []
 
     def is_available(self) -> bool:
         return True
@@ -373,8 +429,12 @@ class HaystackLinkContentFetcher:
         Returns:
             Dict[str, List[ByteStream]]: A dictionary with a "streams" key containing a list of ByteStream objects.
         """
-        primary_result = self.primary_fetcher.run(urls)
-        streams = primary_result["streams"]
+        # Each URL waits for its own host's slot, so a slow or throttled host does not hold up the others.
+        if len(urls) == 1:
+            streams = self._fetch(urls[0])
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(urls), 8)) as executor:
+                streams = [stream for result in executor.map(self._fetch, urls) for stream in result]
 
         # Check if any streams are empty (failed to fetch)
         failed_urls = []
@@ -400,22 +460,25 @@ class JinaLinkContentFetcher:
     This is used as a fallback when LinkContentFetcher fails.
     """
 
-    def __init__(self, timeout: int = 10, retry_attempts: int = 2, api_key: Secret = Secret.from_env_var("JINA_API_KEY")):
+    def __init__(self, timeout: int = 10, retry_attempts: int = 2, api_key: Secret = Secret.from_env_var("JINA_API_KEY"), scheduler: Optional[OutboundScheduler] = None):
         """Initialize the JinaLinkContentFetcher.
 
         Args:
             timeout (int): The timeout for the HTTP request in seconds.
             retry_attempts (int): The number of retry attempts for failed requests.
             api_key (Secret): Jina API key for authentication.
+            scheduler (Optional[OutboundScheduler]): Paces requests to jina.ai. Defaults to the container's scheduler.
         """
         self.timeout = timeout
         self.retry_attempts = retry_attempts
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
         try:
             self.api_key = api_key.resolve_value()
         except Exception:
             self.api_key = None
 
-        self.jina_url = "https://r.jina.ai"
+        self.jina_url = os.getenv("JINA_READER_URL", "https://r.jina.ai").rstrip("/")
+        self._client: Optional[httpx.Client] = None
         self._available: Optional[bool] = None  # Cache availability status
         self._failure_count = 0  # Track consecutive failures
 
@@ -486,6 +549,12 @@ class JinaLinkContentFetcher:
         # If we've exhausted all retries, return None
         return None, None
 
+    def _get_client(self) -> httpx.Client:
+        # One client per fetcher, so connections to jina.ai are pooled across requests.
+        if self._client is None:
+            self._client = httpx.Client(timeout=self.timeout)
+        return self._client
+
     def _fetch(self, url: str) -> Tuple[Dict[str, str], ByteStream]:
         """Fetch content from a URL using jina.ai service.
 
@@ -500,19 +569,22 @@ class JinaLinkContentFetcher:
             headers = {"Authorization": f"Bearer {self.api_key}", "Accept": "text/event-stream"}
         else:
             headers = {}
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.get(f"{self.jina_url}/{url}", headers=headers)
+        # Jina's rate limit is on requests to the reader, whatever site they are for.
+        reader_url = f"{self.jina_url}/{url}"
+        with self.scheduler.slot(reader_url):
+            response = self._get_client().get(reader_url, headers=headers)
+        self.scheduler.report(reader_url, response.status_code, response.headers)
 
-            if response.status_code != 200:
-                logger.error(f"Link failure for url {url} status_code={response.status_code} text={response.text}")
-                response.raise_for_status()
+        if response.status_code != 200:
+            logger.error(f"Link failure for url {url} status_code={response.status_code} text={response.text}")
+            response.raise_for_status()
 
-            # Extract content from response
-            content = response.json().get("content", "")
-            content_type = response.json().get("content_type", "text/html")
+        # Extract content from response
+        content = response.json().get("content", "")
+        content_type = response.json().get("content_type", "text/html")
 
-            # Create ByteStream and metadata
-            stream = ByteStream(data=content.encode("utf-8"))
-            metadata = {"content_type": content_type, "url": url}
+        # Create ByteStream and metadata
+        stream = ByteStream(data=content.encode("utf-8"))
+        metadata = {"content_type": content_type, "url": url}
 
-            return metadata, stream
+        return metadata, stream
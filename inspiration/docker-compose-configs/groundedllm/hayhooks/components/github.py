@@ -1,3 +1,4 @@
+import os
 import re
 from typing import Dict, List, Optional
 
@@ -9,8 +10,12 @@ from haystack.utils import Secret
 from haystack_integrations.components.connectors.github import GitHubIssueViewer, GitHubRepoViewer
 from loguru import logger
 
+from components.container import container
+from components.outbound import OutboundScheduler
 from resources.utils import read_resource_file
 
+GITHUB_API_BASE_URL = os.getenv("GITHUB_API_BASE_URL", "https://api.github.com").rstrip("/")
+
 raw_url1 = "https://raw.githubusercontent.com/wsargent/jmxmvc/refs/heads/master/README.md"
 raw_url2 = "http://raw.githubusercontent.com/octocat/Spoon-Knife/main/README.md"
 raw_url3 = "https://raw.githubusercontent.com/torvalds/linux/master/Documentation/admin-guide/devices.rst"
@@ -20,11 +25,12 @@ raw_url3 = "https://raw.githubusercontent.com/torvalds/linux/master/Documentatio
 class GithubIssueContentResolver:
     """This class looks for github issues and directs them to GitHubIssueViewer"""
 
-    def __init__(self, github_token: Optional[Secret] = None, raise_on_failure: bool = False):
+    def __init__(self, github_token: Optional[Secret] = None, raise_on_failure: bool = False, scheduler: Optional[OutboundScheduler] = None):
         issue_pattern = r"https?://(?:(?:www|m)\.)?github\.com/([^/]+)/([^/]+)/issues/(\d+)(?:[/?#].*)?$"
 
         self.github_token = github_token
         self.raise_on_failure = raise_on_failure
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
 
         # Compile it for better performance if using multiple times
         self.issue_regex = re.compile(issue_pattern)
@@ -59,7 +65,10 @@ class GithubIssueContentResolver:
             for url in urls:
                 # Head document is the issue
                 # Body documents are the comments
-                result = viewer.run(url)
+                # The viewer makes its own requests and hides their responses, so it can't report
+                # throttling to the scheduler; it still waits out blocks set by other GitHub requests.
+                with self.scheduler.slot(GITHUB_API_BASE_URL):
+                    result = viewer.run(url)
                 logger.debug(f"GitHubIssueViewer result: {result}")
                 if "documents" in result:
                     documents = result["documents"]
@@ -93,7 +102,7 @@ class GithubIssueContentResolver:
 class GithubRepoContentResolver:
     """This class looks for files and directories in a github repository and sends them to GitHubRepoViewer"""
 
-    def __init__(self, github_token: Optional[Secret] = None, raise_on_failure: bool = False):
+    def __init__(self, github_token: Optional[Secret] = None, raise_on_failure: bool = False, scheduler: Optional[OutboundScheduler] = None):
         # This matches every github repo file.
         repo_pattern = r"^(?:https?:\/\/)?github\.com\/([a-zA-Z0-9_-]+)\/([a-zA-Z0-9_-]+)(?:\/(?:blob|tree|raw|commit)\/([a-zA-Z0-9._-]+)\/(.*))?$"
         # This matches raw.githubusercontent.com URLs
@@ -103,6 +112,7 @@ class GithubRepoContentResolver:
 
         self.github_token = github_token
         self.raise_on_failure = raise_on_failure
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
         self.github_regex = re.compile(repo_pattern)
         self.raw_github_regex = re.compile(raw_pattern)
         self.pr_regex = re.compile(pr_pattern)
@@ -169,7 +179,9 @@ class GithubRepoContentResolver:
                 owner = github_dict["owner"]
                 path = github_dict["path"]
 
-                result = viewer.run(path=path or "", repo=f"{owner}/{repo}", branch=branch_or_commit)
+                # Like the issue viewer, this one can't report throttling, only wait out blocks.
+                with self.scheduler.slot(GITHUB_API_BASE_URL):
+                    result = viewer.run(path=path or "", repo=f"{owner}/{repo}", branch=branch_or_commit)
                 logger.debug(f"GithubRepoContentResolver result: {result}")
                 if "documents" in result:
                     documents = result["documents"]
@@ -270,15 +282,17 @@ class GitHubPRViewer:
     ```
     """
 
-    def __init__(self, github_token: Optional[Secret] = None, raise_on_failure: bool = False):
+    def __init__(self, github_token: Optional[Secret] = None, raise_on_failure: bool = False, scheduler: Optional[OutboundScheduler] = None):
         """Initialize GitHubPRViewer.
 
         Args:
             github_token (Optional[Secret]): GitHub token for API access
             raise_on_failure (bool): Whether to raise an exception on failure
+            scheduler (Optional[OutboundScheduler]): Paces requests to the GitHub API. Defaults to the container's scheduler.
         """
         self.github_token = github_token
         self.raise_on_failure = raise_on_failure
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
         self.pr_regex = re.compile(r"https?://(?:(?:www|m)\.)?github\.com/([^/]+)/([^/]+)/pull/(\d+)(?:[/?#].*)?$")
 
     def _parse_pr_url(self, url: str) -> Optional[Dict[str, str]]:
@@ -294,7 +308,7 @@ class GitHubPRViewer:
 
     def _fetch_pr_data(self, owner: str, repo: str, pr_number: str) -> Optional[Dict]:
         """Fetch pull request data from GitHub API."""
-        url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
+        url = f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/pulls/{pr_number}"
         headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
@@ -305,10 +319,12 @@ class GitHubPRViewer:
             headers["Authorization"] = f"Bearer {token}"
 
         try:
-            with httpx.Client() as client:
+            with self.scheduler.slot(url), httpx.Client() as client:
                 response = client.get(url, headers=headers)
-                response.raise_for_status()
-                return response.json()
+            # GitHub reports exhausted rate limits in headers, with 403 or 429
+            self.scheduler.report(url, response.status_code, response.headers)
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Failed to fetch PR data for {owner}/{repo}/pull/{pr_number}: {str(e)}")
             if self.raise_on_failure:
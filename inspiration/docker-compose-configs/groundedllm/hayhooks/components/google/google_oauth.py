@@ -9,6 +9,8 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from hayhooks import log as logger
 
+from components.shared_state import SharedStore
+
 DEFAULT_SCOPES = [
     # https://developers.google.com/workspace/calendar/api/auth
     "https://www.googleapis.com/auth/calendar.readonly",
@@ -31,6 +33,7 @@ class GoogleOAuth:
         base_callback_url: str = os.getenv("GOOGLE_AUTH_CALLBACK_URL", "http://localhost:1416"),
         token_storage_path: str = os.getenv("GOOGLE_TOKEN_STORAGE_PATH", "google_tokens"),
         scopes: Optional[List[str]] = None,
+        token_store: Optional[SharedStore] = None,
     ):
         """Initialize the Google OAuth component.
 
@@ -39,11 +42,13 @@ class GoogleOAuth:
             base_callback_url (str): Base callback URL of the Hayhooks server (must match the authorized redirect URI in Google Cloud Console)
             token_storage_path (str): Path to store the token files
             scopes (Optional[List[str]]): List of Google API scopes to request
+            token_store (Optional[SharedStore]): Shared state store to keep tokens in, so every hayhooks worker sees them. Token files are still written as a fallback.
         """
         self.client_secrets_file = client_secrets_file
         self.base_callback_url = base_callback_url
         self.token_storage_path = token_storage_path
         self.scopes = scopes or DEFAULT_SCOPES
+        self.token_store = token_store
 
         # Create token storage directory if it doesn't exist
         os.makedirs(self.token_storage_path, exist_ok=True)
@@ -157,8 +162,37 @@ class GoogleOAuth:
             "expiry": credentials.expiry.isoformat() if credentials.expiry else None,
         }
 
-        with open(token_path, "w") as token_file:
+        if self.token_store is not None:
+            try:
+                self.token_store.set(self._token_key(user_id), token_data)
+            except Exception as e:
+                logger.error(f"Error saving credentials for user {user_id} to shared state: {e}")
+
+        # Write to a temporary file and rename, so other workers never read a half-written token.
+        tmp_path = f"{token_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as token_file:
             json.dump(token_data, token_file)
+        os.replace(tmp_path, token_path)
+
+    @staticmethod
+    def _token_key(user_id: str) -> str:
+        return f"google_oauth:token:{user_id}"
+
+    def _load_token_data(self, user_id: str) -> Optional[Dict]:
+        if self.token_store is not None:
+            try:
+                token_data = self.token_store.get(self._token_key(user_id))
+                if token_data is not None:
+                    return token_data
+            except Exception as e:
+                logger.error(f"Error loading credentials for user {user_id} from shared state: {e}")
+
+        token_path = os.path.join(self.token_storage_path, f"{user_id}.json")
+        if not os.path.exists(token_path):
+            return None
+
+        with open(token_path, "r") as token_file:
+            return json.load(token_file)
 
     def load_credentials(self, user_id: str) -> Optional[Credentials]:
         """
@@ -172,14 +206,10 @@ class GoogleOAuth:
         """
         logger.debug(f"load_credentials: user_id: {user_id}")
 
-        token_path = os.path.join(self.token_storage_path, f"{user_id}.json")
-
-        if not os.path.exists(token_path):
-            return None
-
         try:
-            with open(token_path, "r") as token_file:
-                token_data = json.load(token_file)
+            token_data = self._load_token_data(user_id)
+            if token_data is None:
+                return None
 
             from datetime import datetime
 
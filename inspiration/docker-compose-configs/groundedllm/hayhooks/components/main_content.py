@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from hayhooks import log as logger
+from haystack import Document, component
+from haystack.components.converters.utils import get_bytestream_from_source
+from haystack.dataclasses import ByteStream
+from trafilatura import extract
+
+# Set to false to convert whole HTML pages, navigation and footers included.
+MAIN_CONTENT_ENABLED = os.getenv("HAYHOOKS_MAIN_CONTENT_EXTRACTION", "true").lower() == "true"
+
+# Extractions shorter than this are treated as failures and the page goes to the full HTML converter.
+DEFAULT_MIN_CONTENT_CHARS = 200
+
+
+@component
+class MainContentExtractor:
+    """Extracts the main content of HTML pages as Markdown, dropping navigation, footers, cookie banners and comments.
+
+    The page is parsed once and boilerplate is removed on that tree by trafilatura's fast path, which
+    skips the readability and justext fallbacks. Pages where this finds too little content are passed
+    through unchanged on `unextracted`, so they can still go to HTMLToDocument.
+
+    Each document gets `html_chars`, `content_chars` and `reduction` (the fraction of the page that
+    was dropped) in its meta.
+    """
+
+    def __init__(self, min_content_chars: int = DEFAULT_MIN_CONTENT_CHARS, include_links: bool = False, include_tables: bool = True):
+        """Initialize the extractor.
+
+        Args:
+            min_content_chars (int): The least content an extraction needs to be used.
+            include_links (bool): Keep link targets in the Markdown.
+            include_tables (bool): Keep tables.
+        """
+        self.min_content_chars = min_content_chars
+        self.include_links = include_links
+        self.include_tables = include_tables
+
+    @component.output_types(documents=List[Document], unextracted=List[Union[str, Path, ByteStream]])
+    def run(self, sources: List[Union[str, Path, ByteStream]]):
+        """Extract the main content of each HTML source.
+
+        Args:
+            sources (List[Union[str, Path, ByteStream]]): HTML pages, as file paths or ByteStreams.
+
+        Returns:
+            Dict[str, Any]: `documents` with the Markdown content, and `unextracted` with the sources that could not be extracted.
+        """
+        documents = []
+        unextracted = []
+        html_total = content_total = 0
+
+        for source in sources:
+            try:
+                bytestream = get_bytestream_from_source(source)
+            except Exception as e:
+                logger.warning(f"MainContentExtractor: could not read {source}: {e}")
+                unextracted.append(source)
+                continue
+            html = bytestream.data.decode(bytestream.meta.get("encoding") or "utf-8", errors="replace")
+            content = self._extract(html, bytestream.meta.get("url"))
+            if content is None:
+                unextracted.append(source)
+                continue
+
+            html_total += len(html)
+            content_total += len(content)
+            meta: Dict[str, Any] = {**bytestream.meta, "html_chars": len(html), "content_chars": len(content), "reduction": round(1 - len(content) / len(html), 3) if html else 0.0}
+            documents.append(Document(content=content, meta=meta))
+
+        if documents:
+            logger.debug(f"MainContentExtractor: {html_total} HTML chars reduced to {content_total} ({len(documents)} pages, {len(unextracted)} unextracted)")
+        return {"documents": documents, "unextracted": unextracted}
+
+    def _extract(self, html: str, url: Optional[str]) -> Optional[str]:
+        try:
+            content = extract(
+                html,
+                url=url,
+                fast=True,
+                output_format="markdown",
+                include_comments=False,
+                include_tables=self.include_tables,
+                include_links=self.include_links,
+                include_formatting=True,
+            )
+        except Exception as e:
+            logger.debug(f"MainContentExtractor: could not extract {url}: {e}")
+            return None
+        if content is None or len(content.strip()) < self.min_content_chars:
+            return None
+        return content
@@ -0,0 +1,96 @@
+import hashlib
+import re
+from typing import List, Optional
+
+import numpy as np
+from haystack import Document
+
+# Documents whose SimHashes differ in at most this many of their 64 bits are near-duplicates. Unrelated
+# texts differ in about 32 bits, and a copy with a different header and footer in about 5 to 10.
+DEFAULT_MAX_DISTANCE = 10
+
+# Shorter documents (search snippets, error pages) are too short for a meaningful fingerprint.
+DEFAULT_MIN_WORDS = 50
+
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """Compute the 64-bit SimHash of a text over its word shingles.
+
+    Texts that share most of their shingles get hashes that differ in only a few bits, no matter
+    where the differences are.
+
+    Args:
+        text (str): The text to hash.
+        shingle_size (int): The number of words per shingle.
+
+    Returns:
+        int: The 64-bit SimHash.
+    """
+    words = _WORD.findall(text.lower())
+    shingles = [" ".join(words[i : i + shingle_size]) for i in range(max(1, len(words) - shingle_size + 1))]
+    values = np.array([int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingles], dtype=np.uint64)
+    # A bit is set in the SimHash when it is set in more than half of the shingle hashes.
+    bit_counts = ((values[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)).sum(axis=0)
+    return sum(1 << bit for bit in range(64) if bit_counts[bit] * 2 > len(shingles))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _url(doc: Document) -> Optional[str]:
+    return doc.meta.get("url") or doc.meta.get("link")
+
+
+def remove_near_duplicates(documents: List[Document], max_distance: int = DEFAULT_MAX_DISTANCE, min_words: int = DEFAULT_MIN_WORDS) -> List[Document]:
+    """Drop documents whose content is nearly the same as a higher-scored document's.
+
+    Syndicated articles, mirrors and AMP pages have the same text at different URLs. Of each group
+    of near-duplicates only the highest-scored document is kept, in its original position, with the
+    URLs of the others added to its `duplicate_urls` meta. Every pair is compared, which is cheap
+    for the few dozen documents a search returns.
+
+    Args:
+        documents (List[Document]): The documents, possibly with scores.
+        max_distance (int): The most SimHash bits near-duplicates may differ in.
+        min_words (int): Documents with fewer words are always kept.
+
+    Returns:
+        List[Document]: The documents without near-duplicates.
+    """
+    hashes: List[Optional[int]] = []
+    for doc in documents:
+        content = doc.content or ""
+        hashes.append(simhash(content) if len(_WORD.findall(content)) >= min_words else None)
+
+    # Visit the best documents first so each group is represented by its highest-scored member.
+    order = sorted(range(len(documents)), key=lambda i: documents[i].score if documents[i].score is not None else float("-inf"), reverse=True)
+    representative_of: dict = {}
+    representatives: List[int] = []
+    for i in order:
+        if hashes[i] is not None:
+            for r in representatives:
+                if hashes[r] is not None and hamming_distance(hashes[i], hashes[r]) <= max_distance:
+                    representative_of[i] = r
+                    break
+        if i not in representative_of:
+            representatives.append(i)
+
+    duplicate_urls: dict = {}
+    for i, r in representative_of.items():
+        url = _url(documents[i])
+        if url and url != _url(documents[r]):
+            duplicate_urls.setdefault(r, []).append(url)
+
+    kept = []
+    for i, doc in enumerate(documents):
+        if i in representative_of:
+            continue
+        if i in duplicate_urls:
+            doc.meta["duplicate_urls"] = doc.meta.get("duplicate_urls", []) + duplicate_urls[i]
+        kept.append(doc)
+    return kept
@@ -1,23 +1,97 @@
+import os
 import re
-from typing import Dict, List
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 from hayhooks import log as logger
 from haystack import component
 from haystack.dataclasses.byte_stream import ByteStream
 from haystack.dataclasses.document import Document
 from haystack.utils.auth import Secret
+from notion_client import APIResponseError, AsyncClient
 from notion_haystack import NotionExporter
 
+from components.container import container
+from components.outbound import OutboundScheduler
+from components.shared_state import SharedStore
+
+NOTION_API = "https://api.notion.com"
+
+# How long exported pages are kept, in seconds. Every lookup still checks the page's last_edited_time,
+# so this only bounds how long unused pages take up space. 0 disables the cache. Pages are only cached
+# when a shared store is configured, since an in-process cache would grow with every exported page.
+DEFAULT_CACHE_TTL = float(os.getenv("HAYHOOKS_NOTION_CACHE_TTL", "86400"))
+
+# Notion reports last_edited_time to the minute, so an export is only known to include every edit
+# made at that time once the minute is over.
+EDIT_TIME_RESOLUTION = 60.0
+
+
+class ScheduledAsyncClient(AsyncClient):
+    """A Notion client whose requests go through the outbound scheduler.
+
+    NotionExporter fetches the children of every block concurrently, which on a large page quickly
+    runs into Notion's rate limit. With this client they are spread out to stay within it, and a
+    429 holds back the other requests for its Retry-After instead of each being retried.
+    """
+
+    def __init__(self, scheduler: OutboundScheduler, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.scheduler = scheduler
+
+    async def request(self, path: str, method: str, *args: Any, **kwargs: Any) -> Any:
+        async with self.scheduler.aslot(NOTION_API):
+            try:
+                return await super().request(path, method, *args, **kwargs)
+            except APIResponseError as e:
+                self.scheduler.report(NOTION_API, e.status, e.headers)
+                raise
+
+
+def _parse_time(value: str) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
 
 @component
 class NotionContentResolver:
-    def __init__(self, api_key: Secret = Secret.from_env_var("NOTION_API_KEY"), raise_on_failure: bool = False):
+    """Exports Notion pages as Markdown, reusing earlier exports of pages that have not changed.
+
+    With a shared store, one metadata request fetches a page's `last_edited_time` before it is
+    exported. If a cached export has the same time, it is served without downloading the page's
+    blocks again.
+    """
+
+    def __init__(
+        self,
+        api_key: Secret = Secret.from_env_var("NOTION_API_KEY"),
+        raise_on_failure: bool = False,
+        cache_store: Optional[SharedStore] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        scheduler: Optional[OutboundScheduler] = None,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            api_key (Secret): The Notion integration token.
+            raise_on_failure (bool): Whether to raise if Notion is not configured.
+            cache_store (Optional[SharedStore]): Store for exported pages. Defaults to the shared store, if one is configured.
+            cache_ttl (float): Seconds to keep exported pages, 0 disables the cache.
+            scheduler (Optional[OutboundScheduler]): Paces requests to the Notion API. Defaults to the container's scheduler.
+        """
         self.exporter = None
         self.raise_on_failure = raise_on_failure
+        self.cache_store = cache_store if cache_store is not None else container.shared_store()
+        self.cache_ttl = cache_ttl
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
         try:
             api_key_value = api_key.resolve_value()
             if api_key_value:
                 self.exporter = NotionExporter(api_token=api_key_value)
+                self.exporter.notion_exporter.notion = ScheduledAsyncClient(self.scheduler, auth=api_key_value)
         except Exception as e:
             logger.error(f"Error initializing NotionContentResolver: {e}")
 
@@ -85,13 +159,82 @@ class NotionContentResolver:
 
         page_ids = self._extract_page_ids(urls)
         # logger.debug(f"Extracted page IDs: {page_ids}")
-        documents = self.exporter.run(page_ids=page_ids)
+        documents = self._export_pages(page_ids)
         # logger.debug(f"Extracted documents: {documents}")
-        successful_streams = self._convert_to_streams(documents)
+        successful_streams = self._convert_to_streams({"documents": documents})
         # logger.debug(f"Extracted successful_streams: {successful_streams}")
 
         return {"streams": successful_streams}
 
+    def _last_edited_time(self, page_id: str) -> Optional[str]:
+        """Fetch when a page was last edited, or None if that is not available (e.g. the ID is a database)."""
+        try:
+            with self.scheduler.slot(NOTION_API):
+                page = self.exporter.notion_exporter.sync_notion.pages.retrieve(page_id)
+        except APIResponseError as e:
+            self.scheduler.report(NOTION_API, e.status, e.headers)
+            logger.debug(f"Could not fetch last_edited_time of {page_id}: {e}")
+            return None
+        except Exception as e:
+            logger.debug(f"Could not fetch last_edited_time of {page_id}: {e}")
+            return None
+        last_edited_time = page.get("last_edited_time") if isinstance(page, dict) else None
+        return last_edited_time if isinstance(last_edited_time, str) else None
+
+    def _export_pages(self, page_ids: List[str]) -> List[Document]:
+        """Export pages, serving the cached export of each page that has not been edited since.
+
+        The pages that do need exporting are exported together, so the exporter fetches them
+        concurrently. NotionExporter returns the documents of a batch without their page IDs (and
+        with any child pages), so an export is only cached when it was for a single page.
+        """
+        documents: List[Document] = []
+        misses: List[str] = []
+        edited_times: Dict[str, Optional[str]] = {}
+        for page_id in page_ids:
+            last_edited_time = self._last_edited_time(page_id) if self._caching() else None
+            edited_times[page_id] = last_edited_time
+            cached = self._cache_get(f"notion:page:{page_id}") if last_edited_time is not None else None
+            if cached is not None and cached["last_edited_time"] == last_edited_time:
+                logger.debug(f"Notion page {page_id} unchanged since {last_edited_time}, serving the cached export")
+                documents.extend(Document.from_dict(doc) for doc in cached["documents"])
+            else:
+                misses.append(page_id)
+
+        if not misses:
+            return documents
+
+        started = time.time()
+        exported = self.exporter.run(page_ids=misses).get("documents", [])
+        documents.extend(exported)
+        last_edited_time = edited_times[misses[0]] if len(misses) == 1 else None
+        if last_edited_time is not None and exported:
+            edited = _parse_time(last_edited_time)
+            # An export started within the minute of the last edit may have missed later edits in that minute, so it is not cached.
+            if edited is not None and started >= edited + EDIT_TIME_RESOLUTION:
+                self._cache_set(f"notion:page:{misses[0]}", {"last_edited_time": last_edited_time, "documents": [doc.to_dict() for doc in exported]})
+        return documents
+
+    def _caching(self) -> bool:
+        return self.cache_store is not None and self.cache_ttl > 0
+
+    def _cache_get(self, key: str) -> Any:
+        if not self._caching():
+            return None
+        try:
+            return self.cache_store.get(key)
+        except Exception as e:
+            logger.warning(f"Notion cache unavailable: {e}")
+            return None
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        if not self._caching():
+            return
+        try:
+            self.cache_store.set(key, value, ttl=self.cache_ttl)
+        except Exception as e:
+            logger.warning(f"Notion cache unavailable: {e}")
+
     def can_handle(self, url: str) -> bool:
         if self.exporter is None:
             return False
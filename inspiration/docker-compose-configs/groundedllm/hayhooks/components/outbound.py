@@ -0,0 +1,315 @@
+import asyncio
+import ipaddress
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from hayhooks import log as logger
+
+# Requests to one host that may be in flight at the same time.
+DEFAULT_HOST_CONCURRENCY = int(os.getenv("HAYHOOKS_OUTBOUND_HOST_CONCURRENCY", "4"))
+
+# Sustained requests per second to one host, 0 for no rate limit, and how many may be sent in a burst.
+DEFAULT_HOST_RATE = float(os.getenv("HAYHOOKS_OUTBOUND_HOST_RATE", "5"))
+DEFAULT_HOST_BURST = int(os.getenv("HAYHOOKS_OUTBOUND_HOST_BURST", "10"))
+
+# Requests to all hosts that may be in flight at the same time.
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("HAYHOOKS_OUTBOUND_MAX_CONNECTIONS", "32"))
+
+# How long a request waits for its turn before giving up, in seconds.
+DEFAULT_MAX_WAIT = float(os.getenv("HAYHOOKS_OUTBOUND_MAX_WAIT", "30"))
+
+# Per-host overrides as `host=concurrency:rate` pairs, e.g. `r.jina.ai=2:0.3,api.github.com=4:1`.
+HOST_LIMITS = os.getenv("HAYHOOKS_OUTBOUND_HOST_LIMITS", "")
+
+# Documented limits of APIs the fetchers use, as (concurrency, rate). Notion allows an average of three requests per second.
+KNOWN_HOST_LIMITS: Dict[str, Tuple[int, float]] = {"api.notion.com": (3, 3.0)}
+
+# Backoff after a 429 or 503 without Retry-After, doubled for each one in a row, in seconds.
+DEFAULT_BACKOFF = 5.0
+MAX_BACKOFF = 300.0
+
+# Idle hosts are forgotten once more than this many are tracked.
+MAX_TRACKED_HOSTS = 1024
+
+
+class HostThrottledError(RuntimeError):
+    """Raised when a request to a host cannot be sent within the allowed wait."""
+
+
+def host_key(url: str) -> str:
+    """The host a URL is scheduled under: its lower-cased host name without a leading `www.`."""
+    host = (urlparse(url).hostname or url).lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_local(host: str) -> bool:
+    """Whether a host is this machine, such as a local SearXNG, which needs no politeness."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, in seconds or as an HTTP date, into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_host_limits(spec: str) -> Dict[str, Tuple[int, float]]:
+    """Parse `host=concurrency:rate` pairs separated by commas."""
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        host, _, limit = item.partition("=")
+        concurrency, _, rate = limit.partition(":")
+        try:
+            limits[host_key(host.strip())] = (int(concurrency), float(rate) if rate else DEFAULT_HOST_RATE)
+        except ValueError:
+            logger.warning(f"Ignoring invalid outbound host limit {item!r}")
+    return limits
+
+
+class _Host:
+    def __init__(self, concurrency: int, rate: float, burst: int):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled = 0  # 429 and 503 responses in a row
+        self.in_flight = 0
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before it may be used. Called with the scheduler lock held."""
+        now = time.monotonic()
+        wait = max(0.0, self.blocked_until - now)
+        if self.rate <= 0:
+            return wait
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # Tokens may go negative: each waiting request reserves the next one that will be refilled.
+        self.tokens -= 1
+        if self.tokens < 0:
+            wait = max(wait, -self.tokens / self.rate)
+        return wait
+
+    def refund(self) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+
+class OutboundScheduler:
+    """Schedules outbound HTTP requests so that no single host is hammered.
+
+    Every request takes a slot for its host before it is sent. A host has a cap on concurrent
+    requests and a token bucket for its request rate, and all hosts share a global connection
+    budget. When a host answers 429 or 503, `report` blocks it for the Retry-After time (or an
+    exponential backoff), so the retries of every fetcher wait instead of being throttled again.
+    A request that would have to wait longer than `max_wait` raises HostThrottledError.
+
+    Limits apply within one worker process, like the fetchers' connection pools.
+    """
+
+    def __init__(
+        self,
+        host_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+        host_rate: float = DEFAULT_HOST_RATE,
+        host_burst: int = DEFAULT_HOST_BURST,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        host_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            host_concurrency (int): Requests to one host that may be in flight at the same time.
+            host_rate (float): Sustained requests per second to one host, 0 for no limit.
+            host_burst (int): Requests to one host that may be sent at once after an idle period.
+            max_connections (int): Requests to all hosts that may be in flight at the same time.
+            max_wait (float): Seconds a request waits for its slot before HostThrottledError.
+            host_limits (Optional[Dict[str, Tuple[int, float]]]): (concurrency, rate) overrides by host. Defaults to the known API limits and `HAYHOOKS_OUTBOUND_HOST_LIMITS`.
+        """
+        self.host_concurrency = host_concurrency
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.max_connections = max_connections
+        self.max_wait = max_wait
+        self.host_limits = host_limits if host_limits is not None else {**KNOWN_HOST_LIMITS, **parse_host_limits(HOST_LIMITS)}
+        self._connections = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _Host] = {}
+
+    def _host(self, key: str) -> _Host:
+        """The state of a host, created on first use. Called with the lock held."""
+        host = self._hosts.get(key)
+        if host is None:
+            if len(self._hosts) >= MAX_TRACKED_HOSTS:
+                self._forget_idle_hosts()
+            if key in self.host_limits:
+                concurrency, rate = self.host_limits[key]
+            elif is_local(key):
+                # Only the global budget applies to local services.
+                concurrency, rate = self.max_connections, 0.0
+            else:
+                concurrency, rate = self.host_concurrency, self.host_rate
+            host = self._hosts[key] = _Host(concurrency, rate, self.host_burst)
+        return host
+
+    def _checkout(self, key: str) -> _Host:
+        with self._lock:
+            host = self._host(key)
+            host.in_flight += 1
+            return host
+
+    def _checkin(self, host: _Host) -> None:
+        with self._lock:
+            host.in_flight -= 1
+
+    def _forget_idle_hosts(self) -> None:
+        now = time.monotonic()
+        for key, host in list(self._hosts.items()):
+            if host.in_flight == 0 and host.blocked_until <= now:
+                del self._hosts[key]
+
+    def acquire(self, url: str, max_wait: Optional[float] = None) -> _Host:
+        """Wait until a request to `url` may be sent and take its slot. Prefer `slot` or `aslot`."""
+        key = host_key(url)
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        host = self._checkout(key)
+
+        if not host.semaphore.acquire(timeout=max_wait):
+            self._checkin(host)
+            raise HostThrottledError(f"No free slot for {key} within {max_wait}s")
+
+        with self._lock:
+            wait = host.reserve()
+        if time.monotonic() + wait > deadline:
+            with self._lock:
+                host.refund()
+            host.semaphore.release()
+            self._checkin(host)
+            raise HostThrottledError(f"{key} is rate limited for another {wait:.1f}s")
+        if wait > 0:
+            time.sleep(wait)
+
+        # The global budget is taken last, so requests waiting on a busy host do not hold it.
+        if not self._connections.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            host.semaphore.release()
+            self._checkin(host)
+            raise HostThrottledError(f"No free outbound connection for {key} within {max_wait}s")
+        return host
+
+    def release(self, host: _Host) -> None:
+        self._connections.release()
+        host.semaphore.release()
+        self._checkin(host)
+
+    @contextmanager
+    def slot(self, url: str, max_wait: Optional[float] = None) -> Iterator[None]:
+        """Hold a slot for a request to `url` while the block runs.
+
+        Raises:
+            HostThrottledError: If the slot is not free within `max_wait` seconds.
+        """
+        host = self.acquire(url, max_wait)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    @asynccontextmanager
+    async def aslot(self, url: str, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        """Like `slot`, waiting in a worker thread so the event loop keeps running."""
+        acquisition = asyncio.ensure_future(asyncio.to_thread(self.acquire, url, max_wait))
+        try:
+            host = await asyncio.shield(acquisition)
+        except asyncio.CancelledError:
+            # The worker thread can't be interrupted and may still take the slot, so give it back when it does.
+            acquisition.add_done_callback(self._release_abandoned)
+            raise
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def _release_abandoned(self, acquisition: "asyncio.Future[_Host]") -> None:
+        if acquisition.cancelled() or acquisition.exception() is not None:
+            return
+        self.release(acquisition.result())
+
+    def report(self, url: str, status: int, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Tell the scheduler how a host answered, so it can back off when it is throttling us.
+
+        429 and 503 block the host for its Retry-After time, or for an exponential backoff if it
+        sent none. A Retry-After on other errors (GitHub sends one with 403) is honoured too. An
+        exhausted `X-RateLimit-Remaining` blocks the host until `X-RateLimit-Reset` whatever the
+        status, since GitHub sends it with the last successful call. Any other response ends the
+        backoff.
+
+        Args:
+            url (str): The URL that was requested.
+            status (int): The HTTP status code.
+            headers (Optional[Mapping[str, str]]): The response headers.
+        """
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        quota_reset = None
+        if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset"):
+            try:
+                quota_reset = float(headers["x-ratelimit-reset"]) - time.time()
+            except ValueError:
+                pass
+        if quota_reset is not None and quota_reset <= 0:
+            quota_reset = None
+
+        key = host_key(url)
+        with self._lock:
+            host = self._host(key)
+            if status in (429, 503):
+                host.throttled += 1
+                if retry_after is None:
+                    retry_after = DEFAULT_BACKOFF * 2 ** (host.throttled - 1)
+            elif status < 400:
+                host.throttled = 0
+                retry_after = None
+            if quota_reset is not None:
+                retry_after = max(retry_after or 0.0, quota_reset)
+            if retry_after is None:
+                host.throttled = 0
+                return
+            retry_after = min(retry_after, MAX_BACKOFF)
+            host.blocked_until = max(host.blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"{key} answered {status}, holding requests to it for {retry_after:.1f}s")
+
+    def backoff(self, url: str, seconds: float) -> None:
+        """Hold requests to the host of `url` for `seconds`, for APIs that ask for it in the response body."""
+        key = host_key(url)
+        with self._lock:
+            host = self._host(key)
+            host.blocked_until = max(host.blocked_until, time.monotonic() + min(seconds, MAX_BACKOFF))
+
+    def blocked_for(self, url: str) -> float:
+        """Seconds until requests to the host of `url` are no longer held back."""
+        with self._lock:
+            host = self._hosts.get(host_key(url))
+            return max(0.0, host.blocked_until - time.monotonic()) if host is not None else 0.0
@@ -0,0 +1,198 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from hayhooks import log as logger
+from haystack import Document, component
+from haystack.components.converters.utils import get_bytestream_from_source, normalize_metadata
+from haystack.dataclasses import ByteStream
+
+from components.container import container
+from components.shared_state import SharedStore
+
+# Conversion stops once this many characters have been extracted, 0 for no limit. At about four
+# characters per token the default is roughly 100k tokens, more than the models are given anyway.
+DEFAULT_MAX_CHARS = int(os.getenv("HAYHOOKS_PDF_MAX_CHARS", "400000"))
+
+# Conversion stops after this many pages, 0 for no limit.
+DEFAULT_MAX_PAGES = int(os.getenv("HAYHOOKS_PDF_MAX_PAGES", "0"))
+
+# How long the text of each converted page is kept, in seconds. 0 disables the page cache. Pages are
+# only cached when a shared store is configured, since an in-process cache would grow with every PDF.
+DEFAULT_PAGE_CACHE_TTL = float(os.getenv("HAYHOOKS_PDF_PAGE_CACHE_TTL", "3600"))
+
+
+@component
+class LazyPyPDFToDocument:
+    """A PyPDFToDocument that defers importing pypdf and converts PDFs a page at a time.
+
+    Most requests never touch a PDF, so there is no reason to pay for the import when the
+    pipelines are built at startup.
+
+    pypdf only parses a page when it is accessed, so pages are extracted in order and conversion
+    stops as soon as `max_pages` or `max_chars` is reached: a long paper or book costs no more than
+    its first pages. With a shared store, the text of each page is cached by the PDF's content hash,
+    so converting the same attachment again skips pypdf entirely. Each document gets `page_count`, `pages_converted`
+    and `truncated` in its meta.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        page_cache_store: Optional[SharedStore] = None,
+        page_cache_ttl: float = DEFAULT_PAGE_CACHE_TTL,
+        **converter_kwargs: Any,
+    ):
+        """Initialize the lazy converter.
+
+        Args:
+            max_chars (int): Stop once this many characters are extracted, 0 for no limit.
+            max_pages (int): Stop after this many pages, 0 for no limit.
+            page_cache_store (Optional[SharedStore]): Store for the text of converted pages. Defaults to the shared store, if one is configured.
+            page_cache_ttl (float): Seconds to keep page text, 0 disables the page cache.
+            **converter_kwargs: Keyword arguments passed through to PyPDFToDocument.
+        """
+        self.max_chars = max_chars
+        self.max_pages = max_pages
+        self.page_cache_store = page_cache_store if page_cache_store is not None else container.shared_store()
+        self.page_cache_ttl = page_cache_ttl
+        self.converter_kwargs = converter_kwargs
+        # Pages extracted with different settings have different text.
+        self._settings_key = hashlib.sha256(repr(sorted(converter_kwargs.items())).encode("utf-8")).hexdigest()[:8]
+        self._converter = None
+
+    def _get_converter(self):
+        if self._converter is None:
+            from haystack.components.converters import PyPDFToDocument
+
+            self._converter = PyPDFToDocument(**self.converter_kwargs)
+        return self._converter
+
+    def _cache_get(self, key: str) -> Any:
+        if self.page_cache_store is None or self.page_cache_ttl <= 0:
+            return None
+        try:
+            return self.page_cache_store.get(key)
+        except Exception as e:
+            logger.warning(f"PDF page cache unavailable: {e}")
+            return None
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        if self.page_cache_store is None or self.page_cache_ttl <= 0:
+            return
+        try:
+            self.page_cache_store.set(key, value, ttl=self.page_cache_ttl)
+        except Exception as e:
+            logger.warning(f"PDF page cache unavailable: {e}")
+
+    def _extract_page(self, page) -> str:
+        converter = self._get_converter()
+        return page.extract_text(
+            orientations=converter.plain_mode_orientations,
+            extraction_mode=converter.extraction_mode.value,
+            space_width=converter.plain_mode_space_width,
+            layout_mode_space_vertically=converter.layout_mode_space_vertically,
+            layout_mode_scale_weight=converter.layout_mode_scale_weight,
+            layout_mode_strip_rotated=converter.layout_mode_strip_rotated,
+            layout_mode_font_height_weight=converter.layout_mode_font_height_weight,
+        )
+
+    def _open(self, data: bytes) -> Tuple[str, int, Any]:
+        """Return the cache key prefix, the page count and a PdfReader, or None if the page count was cached."""
+        prefix = f"pdf:{hashlib.sha256(data).hexdigest()}:{self._settings_key}"
+        page_count = self._cache_get(f"{prefix}:pages")
+        if page_count is not None:
+            return prefix, page_count, None
+
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(data))
+        page_count = len(reader.pages)
+        self._cache_set(f"{prefix}:pages", page_count)
+        return prefix, page_count, reader
+
+    def _pages(self, data: bytes, prefix: str, page_count: int, reader: Any) -> Iterator[str]:
+        for index in range(page_count):
+            key = f"{prefix}:{index}"
+            text = self._cache_get(key)
+            if text is None:
+                if reader is None:
+                    from pypdf import PdfReader
+
+                    reader = PdfReader(io.BytesIO(data))
+                text = self._extract_page(reader.pages[index])
+                self._cache_set(key, text)
+            yield text
+
+    def iter_pages(self, data: bytes) -> Iterator[str]:
+        """Yield the text of each page of a PDF in order, parsing each page only when it is reached.
+
+        Args:
+            data (bytes): The PDF.
+
+        Returns:
+            Iterator[str]: The text of each page.
+        """
+        prefix, page_count, reader = self._open(data)
+        yield from self._pages(data, prefix, page_count, reader)
+
+    def _convert(self, data: bytes) -> Tuple[str, Dict[str, Any]]:
+        prefix, page_count, reader = self._open(data)
+        # Pages past the limit are never parsed, since the generator only extracts a page when it is reached.
+        limit = min(page_count, self.max_pages) if self.max_pages else page_count
+        texts: List[str] = []
+        chars = 0
+        truncated = limit < page_count
+        for text in self._pages(data, prefix, limit, reader):
+            if self.max_chars and chars + len(text) > self.max_chars:
+                if chars < self.max_chars:
+                    texts.append(text[: self.max_chars - chars])
+                truncated = True
+                break
+            texts.append(text)
+            # Pages are joined with a form feed, as PyPDFToDocument does.
+            chars += len(text) + 1
+        return "\f".join(texts), {"page_count": page_count, "pages_converted": len(texts), "truncated": truncated}
+
+    @component.output_types(documents=List[Document])
+    def run(self, sources: List[Union[str, Path, ByteStream]], meta: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None):
+        """Convert PDF sources to Documents.
+
+        Args:
+            sources (List[Union[str, Path, ByteStream]]): File paths or ByteStream objects of PDFs.
+            meta (Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]): Optional metadata to attach to the Documents.
+
+        Returns:
+            Dict[str, List[Document]]: A dictionary with a "documents" key.
+        """
+        if not sources:
+            return {"documents": []}
+
+        store_full_path = self._get_converter().store_full_path
+        documents = []
+        for source, metadata in zip(sources, normalize_metadata(meta, sources_count=len(sources))):
+            try:
+                bytestream = get_bytestream_from_source(source)
+            except Exception as e:
+                logger.warning(f"Could not read {source}, skipping it: {e}")
+                continue
+            try:
+                text, pages_meta = self._convert(bytestream.data)
+            except Exception as e:
+                logger.warning(f"Could not convert {source} to a Document, skipping it: {e}")
+                continue
+
+            if not text.strip():
+                logger.warning(f"Could not extract text from {source}, returning an empty document.")
+            if pages_meta["truncated"]:
+                logger.debug(f"Converted {pages_meta['pages_converted']} of {pages_meta['page_count']} pages of {source}")
+
+            merged_metadata = {**bytestream.meta, **metadata, **pages_meta}
+            if not store_full_path and (file_path := bytestream.meta.get("file_path")):
+                merged_metadata["file_path"] = os.path.basename(file_path)
+            documents.append(Document(content=text, meta=merged_metadata))
+
+        return {"documents": documents}
@@ -0,0 +1,221 @@
+import contextlib
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from hayhooks import log as logger
+from haystack import Document, component
+from haystack.dataclasses import ByteStream
+
+# Set to false to only start fetching pages once every search engine has answered.
+SEARCH_PREFETCH_ENABLED = os.getenv("HAYHOOKS_SEARCH_PREFETCH", "true").lower() == "true"
+
+# How many of each engine's results are fetched speculatively.
+DEFAULT_PREFETCH_TOP_K = int(os.getenv("HAYHOOKS_SEARCH_PREFETCH_TOP_K", "5"))
+
+# How long fetched pages are kept, in seconds.
+DEFAULT_PAGE_TTL = float(os.getenv("HAYHOOKS_PAGE_CACHE_TTL", "300"))
+
+# How long content extraction waits for a page that is still being prefetched, in seconds.
+DEFAULT_WAIT_TIMEOUT = 30.0
+
+
+# The pipeline run that prefetches belong to, see `prefetch_scope`.
+_prefetch_owner: ContextVar[Optional[object]] = ContextVar("prefetch_owner", default=None)
+
+
+@contextlib.contextmanager
+def prefetch_scope() -> Iterator[object]:
+    """Mark the prefetches started inside the block as belonging to one pipeline run.
+
+    Content extraction later cancels the prefetches of its own run that it does not need. A thread
+    id can't identify the run, since pooled threads serve many requests, so each run gets a fresh
+    token instead. Outside a scope prefetches have no owner and are never cancelled.
+
+    Yields:
+        object: The owner token.
+    """
+    owner = object()
+    token = _prefetch_owner.set(owner)
+    try:
+        yield owner
+    finally:
+        _prefetch_owner.reset(token)
+
+
+def current_prefetch_owner() -> Optional[object]:
+    """The owner token of the enclosing `prefetch_scope`, or None outside one."""
+    return _prefetch_owner.get()
+
+
+class _Entry:
+    def __init__(self, future: Future, owner: Optional[Hashable]):
+        self.future = future
+        self.owner = owner
+        self.expires_at: Optional[float] = None
+
+
+class PageCache:
+    """Fetched pages by URL, including pages that are still being downloaded.
+
+    Prefetching submits the fetch to a thread pool and stores the future, so a reader asking for a
+    URL that is in flight waits for it instead of fetching it a second time. Each prefetch has an
+    owner (the pipeline run that asked for it), which can cancel the prefetches it no longer needs.
+    Completed pages are kept for `ttl` seconds, failed fetches are forgotten.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PAGE_TTL, max_entries: int = 256, max_workers: int = 8):
+        """Initialize the page cache.
+
+        Args:
+            ttl (float): Seconds to keep a fetched page.
+            max_entries (int): Upper bound on the number of pages kept, oldest are evicted first.
+            max_workers (int): The number of pages downloaded at the same time.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="page-prefetch")
+
+    def prefetch(self, url: str, fetch: Callable[[str], List[ByteStream]], owner: Optional[Hashable] = None) -> None:
+        """Start downloading `url` in the background unless it is cached or already in flight.
+
+        Args:
+            url (str): The URL to fetch.
+            fetch (Callable[[str], List[ByteStream]]): Fetches a URL.
+            owner (Optional[Hashable]): Who asked for the prefetch, for `cancel`.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and not self._expired(entry):
+                return
+            future = self._executor.submit(self._fetch, url, fetch)
+            self._entries[url] = _Entry(future, owner)
+            self._entries.move_to_end(url)
+            self._evict()
+
+    def get(self, url: str, timeout: float = DEFAULT_WAIT_TIMEOUT) -> Optional[List[ByteStream]]:
+        """Return the page for `url`, waiting if it is still being fetched.
+
+        Returns:
+            Optional[List[ByteStream]]: The streams, or None if the page is not cached, failed or timed out.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or self._expired(entry):
+                return None
+            # Whoever reads the page now needs it, so it is no longer speculative.
+            entry.owner = None
+        try:
+            streams = entry.future.result(timeout=timeout)
+        except Exception as e:
+            logger.debug(f"PageCache: no prefetched page for {url}: {e}")
+            return None
+        # Copies, so one reader changing the meta does not affect the others.
+        return [ByteStream(data=stream.data, meta=dict(stream.meta), mime_type=stream.mime_type) for stream in streams]
+
+    def cancel(self, owner: Hashable, keep: Iterable[str]) -> int:
+        """Cancel the prefetches of `owner` for URLs that are not in `keep`.
+
+        Downloads that have not started are dropped. Downloads already running cannot be
+        interrupted, so they finish and stay in the cache for other callers.
+
+        Returns:
+            int: The number of prefetches cancelled.
+        """
+        keep = set(keep)
+        cancelled = 0
+        with self._lock:
+            for url, entry in list(self._entries.items()):
+                if entry.owner != owner:
+                    continue
+                entry.owner = None
+                if url not in keep and entry.future.cancel():
+                    del self._entries[url]
+                    cancelled += 1
+        if cancelled:
+            logger.debug(f"PageCache: cancelled {cancelled} speculative fetches")
+        return cancelled
+
+    def _fetch(self, url: str, fetch: Callable[[str], List[ByteStream]]) -> List[ByteStream]:
+        try:
+            streams = fetch(url)
+        except Exception:
+            self._forget(url)
+            raise
+        if not streams:
+            self._forget(url)
+            return streams
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry.expires_at = time.time() + self.ttl
+        return streams
+
+    def _forget(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def _expired(self, entry: _Entry) -> bool:
+        return entry.expires_at is not None and entry.expires_at < time.time()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _url(doc: Document) -> Optional[str]:
+    return doc.meta.get("url") or doc.meta.get("link")
+
+
+@component
+class PrefetchingWebSearch:
+    """Wraps a web search component and starts downloading its top results as soon as it returns.
+
+    The sequential pipeline runs every search engine before content extraction, so without this the
+    pages are only fetched after the slowest engine has answered. With it, the pages found by the
+    first engines download while the later engines are still searching, and content extraction takes
+    them from the page cache. The wrapper has the same inputs as the search component and the
+    `documents` and `links` outputs every web search component has.
+    """
+
+    def __init__(self, search: Any, page_cache: PageCache, fetch: Callable[[str], List[ByteStream]], top_k: int = DEFAULT_PREFETCH_TOP_K):
+        """Initialize the wrapper.
+
+        Args:
+            search (Any): The web search component.
+            page_cache (PageCache): Where prefetched pages go.
+            fetch (Callable[[str], List[ByteStream]]): Fetches a URL, usually `URLContentRouter.fetch`.
+            top_k (int): How many of the results to prefetch.
+        """
+        self.search = search
+        self.page_cache = page_cache
+        self.fetch = fetch
+        self.top_k = top_k
+        # The inputs are the parameters of the search's run method, the same signature @component reads.
+        for parameter in inspect.signature(search.run).parameters.values():
+            if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+                continue
+            annotation = Any if parameter.annotation is inspect.Parameter.empty else parameter.annotation
+            if parameter.default is inspect.Parameter.empty:
+                component.set_input_type(self, parameter.name, annotation)
+            else:
+                component.set_input_type(self, parameter.name, annotation, default=parameter.default)
+
+    @component.output_types(documents=List[Document], links=List[str])
+    def run(self, **kwargs) -> Dict[str, Any]:
+        result = self.search.run(**kwargs)
+        documents = result.get("documents") or []
+        ranked = sorted(documents, key=lambda doc: doc.score if doc.score is not None else float("-inf"), reverse=True)
+        owner = current_prefetch_owner()
+        for doc in ranked[: self.top_k]:
+            url = _url(doc)
+            if url:
+                self.page_cache.prefetch(url, self.fetch, owner=owner)
+        return result
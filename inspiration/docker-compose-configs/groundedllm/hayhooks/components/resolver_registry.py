@@ -0,0 +1,150 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hayhooks import log as logger
+
+# Set to "false" to skip warming up resolvers (e.g. the initial Zotero sync) in a background thread.
+DEFAULT_BACKGROUND_WARM_UP = os.getenv("HAYHOOKS_RESOLVER_WARM_UP", "true").lower() == "true"
+
+
+class LazyResolver:
+    """A stand-in for a URL content resolver that builds the real resolver on first use.
+
+    It exposes the `can_handle` / `run` interface that `URLContentRouter` relies on, so it can be
+    placed in the router's resolver list without constructing anything up front.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """Initialize the lazy resolver.
+
+        Args:
+            name (str): The name of the resolver, used for logging.
+            factory (Callable[[], Any]): Builds the real resolver.
+        """
+        self.name = name
+        self._factory = factory
+        self._instance: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._warm_up_lock = threading.Lock()
+        self._warmed_up = False
+
+    @property
+    def instance(self) -> Any:
+        """The underlying resolver, constructed on first access."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    logger.debug(f"Constructing resolver {self.name}")
+                    self._instance = self._factory()
+        return self._instance
+
+    def is_constructed(self) -> bool:
+        return self._instance is not None
+
+    def warm_up(self) -> None:
+        """Construct the resolver and run its `warm_up` method if it has one, at most once."""
+        with self._warm_up_lock:
+            if self._warmed_up:
+                return
+            instance = self.instance
+            if hasattr(instance, "warm_up"):
+                instance.warm_up()
+            self._warmed_up = True
+
+    def can_handle(self, url: str) -> bool:
+        return self.instance.can_handle(url)
+
+    def run(self, urls: List[str]):
+        return self.instance.run(urls)
+
+    def __repr__(self) -> str:
+        state = "constructed" if self.is_constructed() else "pending"
+        return f"LazyResolver({self.name}, {state})"
+
+
+class ResolverRegistry:
+    """A process-wide registry of lazily constructed URL content resolvers.
+
+    Resolvers are keyed by name and configuration, so pipelines asking for the same resolver with the
+    same settings share one instance instead of each building (and syncing) their own.
+    """
+
+    def __init__(self, background_warm_up: bool = DEFAULT_BACKGROUND_WARM_UP):
+        """Initialize the registry.
+
+        Args:
+            background_warm_up (bool): Whether `warm_up_in_background` should do anything.
+        """
+        self.background_warm_up = background_warm_up
+        self._lock = threading.Lock()
+        self._resolvers: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], LazyResolver] = {}
+        self._warm_up_thread: Optional[threading.Thread] = None
+
+    def resolver(self, name: str, factory: Callable[..., Any], **config: Any) -> LazyResolver:
+        """Return the shared resolver for `name` and `config`, registering it if needed.
+
+        Args:
+            name (str): The resolver name, e.g. "zotero".
+            factory (Callable[..., Any]): Called with `config` as keyword arguments to build the resolver.
+            **config: The resolver configuration. Different configurations get different instances.
+
+        Returns:
+            LazyResolver: A lazy handle to the resolver.
+        """
+        key = (name, tuple(sorted(config.items())))
+        with self._lock:
+            lazy_resolver = self._resolvers.get(key)
+            if lazy_resolver is None:
+                label = f"{name}({', '.join(f'{k}={v}' for k, v in key[1])})"
+                lazy_resolver = LazyResolver(label, lambda: factory(**config))
+                self._resolvers[key] = lazy_resolver
+            return lazy_resolver
+
+    def resolvers(self) -> List[LazyResolver]:
+        with self._lock:
+            return list(self._resolvers.values())
+
+    def warm_up(self) -> None:
+        """Construct and warm up every registered resolver in the calling thread."""
+        for lazy_resolver in self.resolvers():
+            try:
+                lazy_resolver.warm_up()
+            except Exception:
+                logger.exception(f"Failed to warm up {lazy_resolver.name}")
+
+    def warm_up_in_background(self) -> Optional[threading.Thread]:
+        """Warm up registered resolvers in a daemon thread so startup does not block on remote syncs.
+
+        Resolvers registered while the thread is running are picked up before it exits. Calling this
+        again after the thread has finished starts a new pass, which only warms new resolvers.
+
+        Returns:
+            Optional[threading.Thread]: The warm-up thread, or None if background warm-up is disabled.
+        """
+        if not self.background_warm_up:
+            return None
+
+        with self._lock:
+            if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+                return self._warm_up_thread
+
+            def warm_up_all():
+                attempted = set()
+                pending = [r for r in self.resolvers() if not r._warmed_up]
+                while pending:
+                    for lazy_resolver in pending:
+                        attempted.add(id(lazy_resolver))
+                        try:
+                            lazy_resolver.warm_up()
+                        except Exception:
+                            logger.exception(f"Failed to warm up {lazy_resolver.name}")
+                    pending = [r for r in self.resolvers() if not r._warmed_up and id(r) not in attempted]
+                logger.info("Resolver warm-up complete")
+
+            self._warm_up_thread = threading.Thread(target=warm_up_all, name="resolver-warm-up", daemon=True)
+            self._warm_up_thread.start()
+            return self._warm_up_thread
+
+
+resolver_registry = ResolverRegistry()
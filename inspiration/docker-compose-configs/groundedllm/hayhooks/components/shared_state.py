@@ -0,0 +1,243 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from hayhooks import log as logger
+from haystack.lazy_imports import LazyImport
+
+with LazyImport("Run 'pip install \"redis\"' to use Redis for shared state.") as redis_import:
+    import redis
+
+# Where state shared between hayhooks workers lives: "redis://host:6379/0" or "sqlite:///path/to/state.db".
+# Unset means every worker keeps its own state in memory.
+SHARED_STATE_URL_ENV = "HAYHOOKS_SHARED_STATE_URL"
+
+KEY_PREFIX = "hayhooks:"
+
+
+class SharedStore(ABC):
+    """Key/value state shared between hayhooks worker processes.
+
+    Values are stored as JSON, so only JSON-serializable values can be shared. Keys are namespaced
+    with `KEY_PREFIX` so a store can sit in a Redis instance used by other services.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value for `key`, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value` under `key`, expiring after `ttl` seconds if given.
+
+        Raises:
+            TypeError: If the value is not JSON-serializable.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove `key` if it exists."""
+
+    @abstractmethod
+    def incr(self, key: str, ttl: float) -> int:
+        """Atomically increment the counter at `key` and return the new value.
+
+        The counter is created with an expiry of `ttl` seconds when it does not exist yet.
+        """
+
+    def hit(self, key: str, limit: int, window: float) -> bool:
+        """Record a request against a fixed-window rate limit shared by all workers.
+
+        Args:
+            key (str): The rate limit bucket, e.g. "stackoverflow:requests".
+            limit (int): The maximum number of requests per window.
+            window (float): The window size in seconds.
+
+        Returns:
+            bool: True if the request is within the limit, False if the window is used up.
+        """
+        bucket = int(time.time() // window)
+        return self.incr(f"ratelimit:{key}:{bucket}", ttl=window * 2) <= limit
+
+
+class SQLiteStore(SharedStore):
+    """A shared store in a local SQLite file, for several workers on one host."""
+
+    def __init__(self, db_file: str):
+        """Initialize the store, creating the table if needed.
+
+        Args:
+            db_file (str): The path to the SQLite database file.
+        """
+        self.db_file = db_file
+        self._last_purge = 0.0
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS shared_state (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)")
+        finally:
+            conn.close()
+        logger.info(f"Using SQLite shared state at {self.db_file}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode, transactions are opened explicitly where they are needed.
+        return sqlite3.connect(self.db_file, timeout=10, isolation_level=None)
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value, expires_at FROM shared_state WHERE key = ?", (KEY_PREFIX + key,)).fetchone()
+        finally:
+            conn.close()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        data = json.dumps(value)
+        expires_at = time.time() + ttl if ttl is not None else None
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)", (KEY_PREFIX + key, data, expires_at))
+            self._purge_expired(conn)
+        finally:
+            conn.close()
+
+    def delete(self, key: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM shared_state WHERE key = ?", (KEY_PREFIX + key,))
+        finally:
+            conn.close()
+
+    def incr(self, key: str, ttl: float) -> int:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT value, expires_at FROM shared_state WHERE key = ?", (KEY_PREFIX + key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] < now):
+                value, expires_at = 1, now + ttl
+            else:
+                value, expires_at = int(json.loads(row[0])) + 1, row[1]
+            conn.execute("INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)", (KEY_PREFIX + key, json.dumps(value), expires_at))
+            conn.execute("COMMIT")
+            return value
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _purge_expired(self, conn: sqlite3.Connection) -> None:
+        now = time.time()
+        if now - self._last_purge > 60:
+            self._last_purge = now
+            conn.execute("DELETE FROM shared_state WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+
+
+class RedisStore(SharedStore):
+    """A shared store in Redis, for workers on one or more hosts."""
+
+    def __init__(self, url: str):
+        """Initialize the store.
+
+        Args:
+            url (str): The Redis URL, e.g. "redis://localhost:6379/0".
+        """
+        redis_import.check()
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+        logger.info(f"Using Redis shared state at {url}")
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.client.get(KEY_PREFIX + key)
+        return json.loads(data) if data is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        data = json.dumps(value)
+        px = max(1, int(ttl * 1000)) if ttl is not None else None
+        self.client.set(KEY_PREFIX + key, data, px=px)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(KEY_PREFIX + key)
+
+    def incr(self, key: str, ttl: float) -> int:
+        value = int(self.client.incr(KEY_PREFIX + key))
+        if value == 1:
+            # The counter was just created, so start its expiry.
+            self.client.pexpire(KEY_PREFIX + key, max(1, int(ttl * 1000)))
+        return value
+
+
+class MemoryStore(SharedStore):
+    """An in-process store with the same interface, used in tests and single-worker setups."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: dict = {}
+        self._last_purge = 0.0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] < time.time()):
+                return None
+            return json.loads(entry[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        data = json.dumps(value)
+        with self._lock:
+            self._data[key] = (data, time.time() + ttl if ttl is not None else None)
+            self._purge_expired()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str, ttl: float) -> int:
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] < now):
+                value, expires_at = 1, now + ttl
+            else:
+                value, expires_at = int(json.loads(entry[0])) + 1, entry[1]
+            self._data[key] = (json.dumps(value), expires_at)
+            return value
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        if now - self._last_purge > 60:
+            self._last_purge = now
+            self._data = {key: entry for key, entry in self._data.items() if entry[1] is None or entry[1] >= now}
+
+
+def create_shared_store(url: Optional[str]) -> Optional[SharedStore]:
+    """Create the shared store for a URL.
+
+    Args:
+        url (Optional[str]): "redis://...", "rediss://...", "unix://..." or "sqlite:///path". Empty means no shared store.
+
+    Returns:
+        Optional[SharedStore]: The store, or None if `url` is empty.
+
+    Raises:
+        ValueError: If the URL scheme is not supported.
+    """
+    if not url:
+        return None
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url[len("sqlite:///") :])
+    raise ValueError(f"Unsupported {SHARED_STATE_URL_ENV} {url!r}, expected redis://, rediss://, unix:// or sqlite:///")
+
+
+def shared_state_url() -> Optional[str]:
+    return os.getenv(SHARED_STATE_URL_ENV) or None
@@ -0,0 +1,202 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from hayhooks import log as logger
+
+from components.container import container
+from components.shared_state import SharedStore
+
+# How long a completed result is served to identical calls, in seconds. 0 disables the result cache,
+# so only calls that overlap with an in-flight execution are coalesced.
+DEFAULT_RESULT_TTL = float(os.getenv("HAYHOOKS_SINGLE_FLIGHT_RESULT_TTL", "0"))
+
+
+class _Call:
+    """An in-flight execution that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls so that only one of them does the work.
+
+    The first caller for a key runs the function, every other caller with the same key blocks until
+    it finishes and gets the same result (or the same exception). Optionally, successful results are
+    kept for a short time so that a burst of retries arriving just after completion is also served
+    without running the function again.
+
+    Hayhooks runs `run_api` in a thread pool, so this uses threads rather than asyncio primitives.
+    With a shared store, cached results are also visible to the other hayhooks workers; in-flight
+    calls are only coalesced within a worker.
+    """
+
+    def __init__(self, result_ttl: float = DEFAULT_RESULT_TTL, max_cached_results: int = 256, store: Optional[SharedStore] = None):
+        """Initialize the single-flight group.
+
+        Args:
+            result_ttl (float): Seconds to keep a successful result after completion, 0 to disable.
+            max_cached_results (int): Upper bound on the number of cached results.
+            store (Optional[SharedStore]): Store to share cached results with other workers.
+        """
+        self.result_ttl = result_ttl
+        self.max_cached_results = max_cached_results
+        self.store = store
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._results: Dict[str, Tuple[float, Any]] = {}
+
+    @staticmethod
+    def make_key(*args: Any, **kwargs: Any) -> str:
+        """Build a stable key from call arguments.
+
+        Arguments are serialized as sorted JSON, falling back to `repr` for values JSON can't encode.
+        """
+        payload = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run `fn` once for `key`, sharing the outcome with concurrent callers.
+
+        Args:
+            key (str): The coalescing key, usually from `make_key`.
+            fn (Callable[[], Any]): The function to run.
+
+        Returns:
+            Any: The result of `fn`, possibly produced by another caller.
+        """
+        with self._lock:
+            cached = self._get_cached_result(key)
+            if cached is not None:
+                logger.debug(f"single_flight: serving cached result for {key[:12]}")
+                return cached[1]
+
+        shared = self._get_shared_result(key)
+        if shared is not None:
+            logger.debug(f"single_flight: serving shared result for {key[:12]}")
+            return shared[0]
+
+        with self._lock:
+            # Another caller may have finished while the shared store was being checked.
+            cached = self._get_cached_result(key)
+            if cached is not None:
+                return cached[1]
+
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            logger.debug(f"single_flight: attaching to in-flight call {key[:12]}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and self.result_ttl > 0:
+                    self._store_result(key, call.result)
+            if call.waiters:
+                logger.debug(f"single_flight: {call.waiters} duplicate call(s) coalesced into {key[:12]}")
+            call.done.set()
+
+        if self.result_ttl > 0:
+            self._store_shared_result(key, call.result)
+        return call.result
+
+    def forget(self, key: str) -> None:
+        """Drop any cached result for `key`."""
+        with self._lock:
+            self._results.pop(key, None)
+        if self.store is not None:
+            self.store.delete(f"single_flight:{key}")
+
+    def _get_cached_result(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._results[key]
+            return None
+        return entry
+
+    def _get_shared_result(self, key: str) -> Optional[list]:
+        if self.store is None or self.result_ttl <= 0:
+            return None
+        try:
+            # Results are wrapped in a list so that a cached None is told apart from a miss.
+            return self.store.get(f"single_flight:{key}")
+        except Exception as e:
+            logger.warning(f"single_flight: shared result store unavailable: {e}")
+            return None
+
+    def _store_shared_result(self, key: str, result: Any) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.set(f"single_flight:{key}", [result], ttl=self.result_ttl)
+        except TypeError:
+            logger.debug(f"single_flight: result for {key[:12]} is not JSON-serializable, not sharing it")
+        except Exception as e:
+            logger.warning(f"single_flight: shared result store unavailable: {e}")
+
+    def _store_result(self, key: str, result: Any) -> None:
+        now = time.monotonic()
+        if len(self._results) >= self.max_cached_results:
+            # Evict expired entries first, then the ones closest to expiry.
+            for expired_key in [k for k, (expires, _) in self._results.items() if expires < now]:
+                del self._results[expired_key]
+            while len(self._results) >= self.max_cached_results:
+                del self._results[min(self._results, key=lambda k: self._results[k][0])]
+        self._results[key] = (now + self.result_ttl, result)
+
+
+def single_flight(result_ttl: Optional[float] = None) -> Callable:
+    """Decorate a pipeline wrapper's `run_api` so identical concurrent calls share one pipeline run.
+
+    The wrapped method keeps its signature and docstring, which hayhooks uses to build the
+    request model and the MCP tool description. A call with `bypass_cache=True` asks for a fresh
+    answer, so it runs on its own instead of joining an in-flight call or reading a cached result.
+
+    Args:
+        result_ttl (Optional[float]): Seconds to keep a successful result, defaults to HAYHOOKS_SINGLE_FLIGHT_RESULT_TTL.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        group = SingleFlight(result_ttl=DEFAULT_RESULT_TTL if result_ttl is None else result_ttl, store=container.shared_store())
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if kwargs.get("bypass_cache"):
+                return method(self, *args, **kwargs)
+            # The key must be the same in every worker process, so it names the method rather than the instance.
+            key = group.make_key(method.__module__, method.__qualname__, *args, **kwargs)
+            return group.do(key, lambda: method(self, *args, **kwargs))
+
+        wrapper.single_flight = group  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
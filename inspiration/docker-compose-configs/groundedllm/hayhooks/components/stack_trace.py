@@ -0,0 +1,114 @@
+import hashlib
+import os
+import re
+from typing import List
+
+# How long Stack Overflow results and analyses are reused for the same stack trace fingerprint, in seconds.
+# Answers to an error rarely change, so a day works well once a shared store is configured. 0, the default, disables the cache.
+DEFAULT_CACHE_TTL = float(os.getenv("HAYHOOKS_STACK_TRACE_CACHE_TTL", "0"))
+
+# How many frames go into the fingerprint. The top frames identify the failure, deeper frames vary
+# with how the code was called.
+MAX_FINGERPRINT_FRAMES = 10
+
+# Tokens that change between occurrences of the same error, in the order they are replaced.
+_VOLATILE_PATTERNS = [
+    ("uuid", re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b")),
+    ("addr", re.compile(r"\b0x[0-9a-fA-F]+\b")),
+    ("time", re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\b")),
+    ("path", re.compile(r"(?:[A-Za-z]:\\|/)(?:[\w.@+-]+[\\/])+([\w.@+-]+)")),
+    ("hash", re.compile(r"\b[0-9a-fA-F]{16,}\b")),
+    ("num", re.compile(r"\b\d+\b")),
+]
+
+# Python: File "/app/foo.py", line 12, in handler
+_PYTHON_FRAME = re.compile(r'^\s*File "(?P<file>[^"]+)", line \d+, in (?P<function>\S+)')
+# Java, Kotlin, Scala: at com.example.Foo.bar(Foo.java:42)
+_JVM_FRAME = re.compile(r"^\s*at (?P<function>[\w$.<>/]+)\(")
+# JavaScript: at handler (/app/foo.js:1:2) or at /app/foo.js:1:2
+_JS_FRAME = re.compile(r"^\s*at (?:(?P<function>[\w$.<>\[\] ]+?) \()?(?P<file>[^()\s]+?):\d+:\d+\)?$")
+# Go: main.handler(0x1, 0x2) followed by an indented file:line
+_GO_FRAME = re.compile(r"^(?P<function>[\w./*()-]+)\(.*\)$")
+
+
+def normalize_line(line: str, placeholders: bool = True, numbers: bool = True) -> str:
+    """Replace the volatile tokens in a line: UUIDs, addresses, timestamps, paths, hashes and numbers.
+
+    Paths are reduced to their file name.
+
+    Args:
+        line (str): The line to normalize.
+        placeholders (bool): Replace tokens with `<kind>` placeholders, or remove them.
+        numbers (bool): Also replace plain numbers.
+
+    Returns:
+        str: The normalized line, with whitespace collapsed.
+    """
+    for kind, pattern in _VOLATILE_PATTERNS:
+        if kind == "num" and not numbers:
+            continue
+        if kind == "path":
+            line = pattern.sub(lambda m: m.group(1), line)
+        else:
+            line = pattern.sub(f"<{kind}>" if placeholders else " ", line)
+    return " ".join(line.split())
+
+
+def error_line(stack_trace: str) -> str:
+    """Find the line that states the error.
+
+    Python prints the exception after the traceback, most other runtimes print it first.
+    """
+    lines = [line.strip() for line in stack_trace.strip().splitlines() if line.strip()]
+    if not lines:
+        return ""
+    if lines[0].startswith("Traceback (most recent call last)"):
+        return lines[-1]
+    return lines[0]
+
+
+def error_query(stack_trace: str) -> str:
+    """A search query for the error, without tokens that only match this occurrence of it."""
+    return normalize_line(error_line(stack_trace), placeholders=False, numbers=False)
+
+
+def frame_signature(stack_trace: str) -> List[str]:
+    """The functions in the stack trace, without line numbers, in the order they appear."""
+    frames = []
+    for line in stack_trace.splitlines():
+        match = _PYTHON_FRAME.match(line)
+        if match:
+            frames.append(f"{os.path.basename(match.group('file'))}:{match.group('function')}")
+            continue
+        match = _JVM_FRAME.match(line) or _JS_FRAME.match(line)
+        if match:
+            function = match.group("function") or os.path.basename(match.groupdict().get("file") or "")
+            frames.append(normalize_line(function))
+            continue
+        match = _GO_FRAME.match(line.strip())
+        if match and not line.startswith((" ", "\t")):
+            frames.append(match.group("function"))
+    return frames
+
+
+def stack_trace_fingerprint(stack_trace: str, language: str = "") -> str:
+    """Hash what identifies an error: the language, the normalized error line and the top frames.
+
+    Two stack traces of the same error that differ only in line numbers, memory addresses, UUIDs,
+    timestamps or install paths get the same fingerprint. Traces with no recognizable frames are
+    fingerprinted on all their normalized lines.
+
+    Args:
+        stack_trace (str): The stack trace, or a fragment of it.
+        language (str): The programming language.
+
+    Returns:
+        str: A hex digest.
+    """
+    frames = frame_signature(stack_trace)
+    # Python tracebacks end with the innermost frame, the others start with it.
+    frames = frames[-MAX_FINGERPRINT_FRAMES:] if stack_trace.lstrip().startswith("Traceback") else frames[:MAX_FINGERPRINT_FRAMES]
+    if not frames:
+        frames = [normalize_line(line) for line in stack_trace.splitlines() if line.strip()]
+    payload = "\n".join([language.strip().lower(), normalize_line(error_line(stack_trace)), *frames])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
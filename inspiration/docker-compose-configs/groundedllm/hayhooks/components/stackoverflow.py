@@ -9,6 +9,11 @@ from haystack import Document, component
 from haystack.dataclasses import ByteStream
 from haystack.utils import Secret
 
+from components.container import container
+from components.outbound import OutboundScheduler
+from components.shared_state import SharedStore
+from components.stack_trace import DEFAULT_CACHE_TTL, error_query, stack_trace_fingerprint
+
 ## Shamelessly stolen from https://github.com/gscalzo/stackoverflow-mcp/blob/main/src/index.ts
 DEFAULT_FILTER = "withbody"  # Custom filter for questions with bodies
 ANSWER_FILTER = "withbody"  # Custom filter for answers with bodies
@@ -27,17 +32,28 @@ STACKOVERFLOW_API = "https://api.stackexchange.com/2.3"
 class StackOverflowBase:
     """Base class for Stack Overflow components with shared functionality."""
 
-    def __init__(self, api_key: Secret = Secret.from_env_var("STACKOVERFLOW_API_KEY"), access_token: Optional[Secret] = None, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        api_key: Secret = Secret.from_env_var("STACKOVERFLOW_API_KEY"),
+        access_token: Optional[Secret] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        rate_limit_store: Optional[SharedStore] = None,
+        scheduler: Optional[OutboundScheduler] = None,
+    ):
         """Initialize the Stack Overflow component.
 
         Args:
             api_key (Secret): Stack Overflow API key
             access_token (Optional[Secret]): Optional Stack Overflow access token for authenticated requests
             timeout (int): HTTP request timeout in seconds
+            rate_limit_store (Optional[SharedStore]): Store for a rate limit shared by all workers. Defaults to the container's shared store, if any.
+            scheduler (Optional[OutboundScheduler]): Paces requests to the API. Defaults to the container's scheduler.
         """
         self.is_enabled = True  # still enabled even if no API key
         self.timeout = timeout
+        self.scheduler = scheduler if scheduler is not None else container.outbound_scheduler()
         self.request_timestamps = []  # Track request timestamps for rate limiting
+        self.rate_limit_store = rate_limit_store if rate_limit_store is not None else container.shared_store()
         try:
             self.api_key = api_key.resolve_value()
             self.access_token = access_token.resolve_value() if access_token else None
@@ -48,6 +64,12 @@ class StackOverflowBase:
 
     def _check_rate_limit(self) -> bool:
         """Check if we're within rate limits."""
+        if self.rate_limit_store is not None:
+            try:
+                return self.rate_limit_store.hit("stackoverflow:requests", limit=MAX_REQUESTS_PER_WINDOW, window=RATE_LIMIT_WINDOW_MS / 1000)
+            except Exception as e:
+                logger.warning(f"Shared rate limit unavailable, using the local one: {e}")
+
         now = datetime.now()
         # Remove timestamps outside the window
         self.request_timestamps = [timestamp for timestamp in self.request_timestamps if now - timestamp < timedelta(milliseconds=RATE_LIMIT_WINDOW_MS)]
@@ -70,6 +92,28 @@ class StackOverflowBase:
 
         return params
 
+    def _get(self, url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """GET an API URL through the outbound scheduler and return the JSON body."""
+        with self.scheduler.slot(url):
+            response = httpx.get(url, params=params, timeout=self.timeout, headers=headers)
+        return self._handle_response(url, response)
+
+    async def _get_async(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET an API URL through the outbound scheduler without blocking the event loop."""
+        async with self.scheduler.aslot(url), httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(url, params=params)
+        return self._handle_response(url, response)
+
+    def _handle_response(self, url: str, response: httpx.Response) -> Dict[str, Any]:
+        self.scheduler.report(url, response.status_code, response.headers)
+        response.raise_for_status()
+        data = response.json()
+        # https://api.stackexchange.com/docs/throttle: honour `backoff` or the API blocks the key
+        if data.get("backoff"):
+            logger.warning(f"Stack Exchange asked to back off for {data['backoff']}s")
+            self.scheduler.backoff(url, float(data["backoff"]))
+        return data
+
     async def _fetch_answers_async(self, question_id: int) -> List[Dict[str, Any]]:
         """Fetch answers for a specific question asynchronously."""
         if not self.is_enabled:
@@ -85,11 +129,8 @@ class StackOverflowBase:
                 await asyncio.sleep(RETRY_AFTER_MS / 1000)
                 return await self._fetch_answers_async(question_id)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("items", [])
+            data = await self._get_async(url, params)
+            return data.get("items", [])
         except Exception as e:
             logger.error(f"Error fetching answers for question {question_id}: {e}")
             return []
@@ -112,10 +153,8 @@ class StackOverflowBase:
                 return self.fetch_answers(question_id)
 
             logger.debug(f"_fetch_answers: url={url} params={params}")
-            response = httpx.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            # logger.debug(f"_fetch_answers: response = {json.dumps(response.json(), indent=2)}")
-            data = response.json()
+            data = self._get(url, params)
+            # logger.debug(f"_fetch_answers: response = {json.dumps(data, indent=2)}")
             return data.get("items", [])
         except Exception as e:
             logger.error(f"Error fetching answers for question {question_id}: {e}")
@@ -136,11 +175,8 @@ class StackOverflowBase:
                 await asyncio.sleep(RETRY_AFTER_MS / 1000)
                 return await self._fetch_comments_async(post_id)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("items", [])
+            data = await self._get_async(url, params)
+            return data.get("items", [])
         except Exception as e:
             logger.error(f"Error fetching comments for post {post_id}: {e}")
             return []
@@ -162,9 +198,7 @@ class StackOverflowBase:
                 time.sleep(RETRY_AFTER_MS / 1000)
                 return self._fetch_comments(post_id)
 
-            response = httpx.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get(url, params)
             return data.get("items", [])
         except Exception as e:
             logger.error(f"Error fetching comments for post {post_id}: {e}")
@@ -346,9 +380,7 @@ class StackOverflowErrorSearch(StackOverflowBase):
                 time.sleep(RETRY_AFTER_MS / 1000)
                 return self.run(error_message, language, technologies, min_score, include_comments, limit)
 
-            response = httpx.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get(url, params)
 
             # Process results
             results = self._process_search_results(data.get("items", []), min_score=min_score, include_comments=include_comments, limit=limit)
@@ -406,10 +438,7 @@ class StackOverflowErrorSearch(StackOverflowBase):
                 await asyncio.sleep(RETRY_AFTER_MS / 1000)
                 return await self.run_async(error_message, language, technologies, min_score, include_comments, limit)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+            data = await self._get_async(url, params)
 
             # Process results
             results = await self._process_search_results_async(data.get("items", []), min_score=min_score, include_comments=include_comments, limit=limit)
@@ -426,7 +455,35 @@ class StackOverflowErrorSearch(StackOverflowBase):
 
 @component
 class StackOverflowStackTraceAnalyzer(StackOverflowBase):
-    """Uses Stack Overflow to analyze stack traces and find relevant solutions."""
+    """Uses Stack Overflow to analyze stack traces and find relevant solutions.
+
+    Results are cached by the stack trace's fingerprint (see `components.stack_trace`), so the same
+    error with different line numbers, addresses or paths is answered without calling the API again.
+    """
+
+    def __init__(
+        self,
+        api_key: Secret = Secret.from_env_var("STACKOVERFLOW_API_KEY"),
+        access_token: Optional[Secret] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        rate_limit_store: Optional[SharedStore] = None,
+        cache_store: Optional[SharedStore] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        """Initialize the Stack Overflow stack trace analyzer.
+
+        Args:
+            api_key (Secret): Stack Overflow API key
+            access_token (Optional[Secret]): Optional Stack Overflow access token for authenticated requests
+            timeout (int): HTTP request timeout in seconds
+            rate_limit_store (Optional[SharedStore]): Store for a rate limit shared by all workers. Defaults to the container's shared store, if any.
+            cache_store (Optional[SharedStore]): Store for results by stack trace fingerprint. Defaults to the container's cache store.
+            cache_ttl (float): Seconds to keep results, 0 disables the cache.
+        """
+        # @component rebuilds the class, so zero-argument super() does not work here.
+        StackOverflowBase.__init__(self, api_key=api_key, access_token=access_token, timeout=timeout, rate_limit_store=rate_limit_store)
+        self.cache_store = cache_store if cache_store is not None else container.cache_store()
+        self.cache_ttl = cache_ttl
 
     @component.output_types(documents=List[Document])
     def run(self, stack_trace: str, language: str, include_comments: bool = False, limit: Optional[int] = None) -> Dict[str, Union[List[Document], str]]:
@@ -447,10 +504,15 @@ class StackOverflowStackTraceAnalyzer(StackOverflowBase):
         if not self.is_enabled:
             return {"documents": [], "results_json": "[]", "results_markdown": ""}
 
+        cache_key = f"stackoverflow:trace:{stack_trace_fingerprint(stack_trace, language)}:{include_comments}:{limit}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.debug(f"run: serving cached results for {cache_key}")
+            return {"documents": [Document.from_dict(doc) for doc in cached]}
+
         try:
-            # Usually the first line contains the relevant error
-            error_lines = stack_trace.split("\n")
-            error_message = error_lines[0] if error_lines else stack_trace
+            # Search for the error line, without the addresses, paths and ids that only match this occurrence
+            error_message = error_query(stack_trace) or stack_trace
 
             # Prepare search parameters
             params = self._prepare_base_params(q=error_message, tagged=language.lower(), sort="relevance", order="desc", filter=DEFAULT_FILTER, limit=limit)
@@ -467,10 +529,7 @@ class StackOverflowStackTraceAnalyzer(StackOverflowBase):
 
             headers = {"Accept-Encoding": "gzip,deflate"}
             # logger.debug(f"run: url={url} params={params}")
-            response = httpx.get(url, params=params, timeout=self.timeout, headers=headers)
-            # logger.debug(f"run: response = {response.text}")
-            response.raise_for_status()
-            data = response.json()
+            data = self._get(url, params, headers=headers)
 
             # Process results
             results = self._process_search_results(data.get("items", []), include_comments=include_comments, limit=limit)
@@ -478,12 +537,32 @@ class StackOverflowStackTraceAnalyzer(StackOverflowBase):
             # Create documents
             documents = self._create_documents_from_results(results)
 
+            if documents:
+                self._cache_set(cache_key, [doc.to_dict() for doc in documents])
+
             return {"documents": documents}
 
         except Exception as e:
             logger.error(f"Error in analyze_stack_trace: {e}")
             return {"documents": [], "results_json": "[]", "results_markdown": ""}
 
+    def _cache_get(self, key: str) -> Any:
+        if self.cache_ttl <= 0:
+            return None
+        try:
+            return self.cache_store.get(key)
+        except Exception as e:
+            logger.warning(f"Stack trace cache unavailable: {e}")
+            return None
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        if self.cache_ttl <= 0:
+            return
+        try:
+            self.cache_store.set(key, value, ttl=self.cache_ttl)
+        except Exception as e:
+            logger.warning(f"Stack trace cache unavailable: {e}")
+
 
 @component
 class StackOverflowContentResolver:
@@ -522,9 +601,7 @@ class StackOverflowContentResolver:
                 )
                 api_url = f"{STACKOVERFLOW_API}/questions/{question_id}"
 
-                response = httpx.get(api_url, params=params, timeout=self.stackoverflow_client.timeout)
-                response.raise_for_status()
-                data = response.json()
+                data = self.stackoverflow_client._get(api_url, params)
 
                 if not data.get("items"):
                     logger.warning(f"No question found for ID {question_id}")
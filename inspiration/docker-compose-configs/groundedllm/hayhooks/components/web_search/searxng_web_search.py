@@ -1,5 +1,9 @@
+import asyncio
+import math
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Literal, Optional, Union
+from urllib.parse import urlsplit, urlunsplit
 
 import httpx
 from hayhooks import log as logger
@@ -9,6 +13,12 @@ from haystack import Document, component, default_from_dict, default_to_dict
 DEFAULT_SEARXNG_BASE_URL = "http://searxng:8080"
 DEFAULT_TIMEOUT = 10
 
+# SearXNG returns about this many results per page, depending on the engines that answer.
+RESULTS_PER_PAGE = 10
+
+# Upper bound on the result pages requested at once when more results are asked for than fit on one.
+DEFAULT_MAX_PAGES = int(os.getenv("HAYHOOKS_SEARCH_SEARXNG_MAX_PAGES", "3"))
+
 
 @component
 class SearXNGWebSearch:
@@ -18,7 +28,13 @@ class SearXNGWebSearch:
     the results of other search engines without storing information about its users.
     """
 
-    def __init__(self, base_url: Optional[str] = None, enabled: bool = (os.getenv("HAYHOOKS_SEARCH_SEARXNG_ENABLED", "true").lower() == "true"), timeout: int = DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        enabled: bool = (os.getenv("HAYHOOKS_SEARCH_SEARXNG_ENABLED", "true").lower() == "true"),
+        timeout: int = DEFAULT_TIMEOUT,
+        max_pages: int = DEFAULT_MAX_PAGES,
+    ):
         """
         Initializes the SearXNGWebSearch component.
 
@@ -33,6 +49,8 @@ class SearXNGWebSearch:
                         - If `HAYHOOKS_SEARCH_SEARXNG_ENABLED` is set to any other string (e.g., "false"), this defaults to `False`.
                         - If `HAYHOOKS_SEARCH_SEARXNG_ENABLED` is not set, this defaults to `True`.
         :param timeout: The HTTP request timeout in seconds. Defaults to DEFAULT_TIMEOUT.
+        :param max_pages: The most result pages fetched concurrently for one search. Defaults to
+                          `HAYHOOKS_SEARCH_SEARXNG_MAX_PAGES`, or 3.
         """
         self.base_url = base_url or os.getenv("SEARXNG_BASE_URL", DEFAULT_SEARXNG_BASE_URL)
 
@@ -40,7 +58,12 @@ class SearXNGWebSearch:
             raise ValueError(f"Invalid base_url: '{self.base_url}'. Must start with 'http://' or 'https://'.")
 
         self.timeout = timeout
+        self.max_pages = max_pages
         self.is_enabled = enabled
+        # Pooled clients, so the pages of a search (and consecutive searches) reuse connections.
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
 
         if self.is_enabled:
             logger.info(f"SearXNGWebSearch initialized with base_url: {self.base_url} and timeout: {self.timeout}s")
@@ -58,10 +81,14 @@ class SearXNGWebSearch:
         engines: Optional[List[str]] = None,
         safesearch: Optional[int] = None,
         pageno: Optional[int] = None,
+        pages: Optional[int] = None,
     ) -> Dict[str, Union[List[Document], List[str]]]:
         """
         Performs a web search using a SearXNG instance.
 
+        When more results are requested than fit on one SearXNG page, pages 1 to N are fetched
+        concurrently and merged, so wider recall costs one round trip rather than N.
+
         :param query: The search query.
         :param max_results: The maximum number of results to return.
                             Note: SearXNG's actual result count might depend on its
@@ -73,25 +100,34 @@ class SearXNGWebSearch:
         :param categories: Optional list of search categories (e.g., ["general", "news"]).
         :param engines: Optional list of specific search engines to use.
         :param safesearch: Optional safe search level (0: off, 1: moderate, 2: strict).
-        :param pageno: Optional page number for results.
+        :param pageno: Optional page number for results. Only that page is fetched.
+        :param pages: Optional number of pages to fetch concurrently. Defaults to as many as
+                      `max_results` needs, up to `max_pages`.
         :return: A dictionary containing a list of Document objects and a list of result URLs.
         """
 
         if self.is_enabled:
-            api_params = self._prepare_api_params(query, max_results, time_range, language, categories, engines, safesearch, pageno)
             request_url = f"{self.base_url.rstrip('/')}/search"
-            try:
-                response = httpx.get(request_url, params=api_params, timeout=self.timeout)
-                response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-                api_response_json = response.json()
-                response_dict = self._process_response(query, api_response_json, max_results)
-                return {"documents": response_dict["documents"], "urls": response_dict["links"]}
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error calling SearXNG (sync): {e.response.status_code} - {e.response.text} for URL {e.request.url}")
-            except httpx.RequestError as e:
-                logger.error(f"Request error calling SearXNG (sync): {e} for URL {e.request.url}")
-            except Exception as e:  # Catch any other unexpected errors during the request or JSON parsing
-                logger.error(f"Unexpected error during SearXNG call (sync): {e}")
+            page_params = [self._prepare_api_params(query, max_results, time_range, language, categories, engines, safesearch, page) for page in self._page_numbers(max_results, pageno, pages)]
+
+            def get_page(params: Dict[str, Any]) -> Union[Dict[str, Any], Exception]:
+                try:
+                    return self._get_page(request_url, params)
+                except Exception as e:
+                    return e
+
+            if len(page_params) == 1:
+                results = [get_page(page_params[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(page_params)) as executor:
+                    results = list(executor.map(get_page, page_params))
+            page_responses = self._successful_pages(results, "sync")
+            if page_responses:
+                try:
+                    response_dict = self._process_response(query, page_responses, max_results)
+                    return {"documents": response_dict["documents"], "urls": response_dict["links"]}
+                except Exception as e:  # Catch any unexpected errors while parsing the results
+                    logger.error(f"Unexpected error during SearXNG call (sync): {e}")
 
         return {"documents": [], "urls": []}  # Default
 
@@ -106,31 +142,116 @@ class SearXNGWebSearch:
         engines: Optional[List[str]] = None,
         safesearch: Optional[int] = None,
         pageno: Optional[int] = None,
+        pages: Optional[int] = None,
     ) -> Dict[str, Union[List[Document], List[str]]]:
         """
         Performs an asynchronous web search using a SearXNG instance.
         (Parameters and return are the same as the synchronous `run` method)
         """
         if self.is_enabled:
-            api_params = self._prepare_api_params(query, max_results, time_range, language, categories, engines, safesearch, pageno)
-
             request_url = f"{self.base_url.rstrip('/')}/search"
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            page_params = [self._prepare_api_params(query, max_results, time_range, language, categories, engines, safesearch, page) for page in self._page_numbers(max_results, pageno, pages)]
+            client = await self._get_async_client()
+            results = await asyncio.gather(*(self._get_page_async(client, request_url, params) for params in page_params), return_exceptions=True)
+            page_responses = self._successful_pages(results, "async")
+            if page_responses:
                 try:
-                    response = await client.get(request_url, params=api_params)
-                    response.raise_for_status()
-                    api_response_json = response.json()
-                    response_dict = self._process_response(query, api_response_json, max_results)
+                    response_dict = self._process_response(query, page_responses, max_results)
                     return {"documents": response_dict["documents"], "urls": response_dict["links"]}
-                except httpx.HTTPStatusError as e:
-                    logger.error(f"HTTP error calling SearXNG (async): {e.response.status_code} - {e.response.text} for URL {e.request.url}")
-                except httpx.RequestError as e:
-                    logger.error(f"Request error calling SearXNG (async): {e} for URL {e.request.url}")
-                except Exception as e:  # Catch any other unexpected errors
+                except Exception as e:  # Catch any unexpected errors while parsing the results
                     logger.error(f"Unexpected error during SearXNG call (async): {e}")
 
         return {"documents": [], "urls": []}  # Default
 
+    @staticmethod
+    def _successful_pages(results: List[Any], mode: str) -> List[Dict[str, Any]]:
+        """
+        The pages that were fetched, logging the ones that failed. A failed page does not lose the others.
+        """
+        pages = []
+        for result in results:
+            if isinstance(result, httpx.HTTPStatusError):
+                logger.error(f"HTTP error calling SearXNG ({mode}): {result.response.status_code} - {result.response.text} for URL {result.request.url}")
+            elif isinstance(result, httpx.RequestError):
+                logger.error(f"Request error calling SearXNG ({mode}): {result} for URL {result.request.url}")
+            elif isinstance(result, BaseException):
+                logger.error(f"Unexpected error during SearXNG call ({mode}): {result}")
+            else:
+                pages.append(result)
+        return pages
+
+    def _page_numbers(self, max_results: int, pageno: Optional[int], pages: Optional[int]) -> List[Optional[int]]:
+        """
+        The result pages to request: the given `pageno`, or pages 1 to N.
+        """
+        if pageno is not None and pageno > 0:
+            return [pageno]
+        if pages is None:
+            pages = min(self.max_pages, math.ceil(max_results / RESULTS_PER_PAGE)) if max_results > 0 else 1
+        if pages <= 1:
+            # A single page is requested without `pageno`, as before multi-page searches.
+            return [None]
+        return list(range(1, pages + 1))
+
+    def _get_client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(timeout=self.timeout)
+        return self._client
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        # An AsyncClient's connections belong to the event loop that opened them, so the client is
+        # replaced, and the old one closed, when the loop changes.
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            await self._close_async_client()
+            self._async_client = httpx.AsyncClient(timeout=self.timeout)
+            self._async_client_loop = loop
+        return self._async_client
+
+    async def _close_async_client(self) -> None:
+        """
+        Closes the pooled async client on the loop it belongs to, if that loop still runs.
+        """
+        client, client_loop = self._async_client, self._async_client_loop
+        self._async_client = None
+        self._async_client_loop = None
+        if client is None or client.is_closed:
+            return
+        try:
+            if client_loop is None or client_loop is asyncio.get_running_loop() or client_loop.is_closed():
+                await client.aclose()
+            elif client_loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+            else:
+                client_loop.run_until_complete(client.aclose())
+        except Exception as e:
+            logger.debug(f"Could not close the previous SearXNG client: {e}")
+
+    def close(self) -> None:
+        """
+        Closes the pooled sync client. The component opens a new one if it searches again.
+        """
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _get_page(self, request_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._get_client().get(request_url, params=params)
+        response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
+        return response.json()
+
+    @staticmethod
+    async def _get_page_async(client: httpx.AsyncClient, request_url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = await client.get(request_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
     def _prepare_api_params(
         self,
         query: str,
@@ -164,40 +285,71 @@ class SearXNGWebSearch:
         return params
 
     @staticmethod
-    def _process_response(query: str, response_json: Dict[str, Any], max_results_requested: int) -> Dict[str, Union[List[Document], List[str]]]:
+    def _normalize_url(url: str) -> str:
         """
-        Parses the JSON response from SearXNG and converts it into Haystack Documents.
+        The form of a URL used to recognize the same result on different pages or from different engines.
         """
-        documents: List[Document] = []
-        urls: List[str] = []
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        host = host[4:] if host.startswith("www.") else host
+        return urlunsplit(("", host, parts.path.rstrip("/"), parts.query, ""))
+
+    @staticmethod
+    def _process_response(query: str, response_json: Union[Dict[str, Any], List[Dict[str, Any]]], max_results_requested: int) -> Dict[str, Union[List[Document], List[str]]]:
+        """
+        Parses the JSON responses from SearXNG and converts them into Haystack Documents.
+
+        The results of all pages are merged: a URL found more than once is kept once, with the
+        higher score, the longer snippet and the engines of every copy. SearXNG scores results
+        from every engine that found them, so the merged results are ordered by score.
+        """
+        page_responses = response_json if isinstance(response_json, list) else [response_json]
 
         # logger.debug(f"SearXNG raw response for query '{query}': {response_json}")
-        raw_results = response_json.get("results", [])
+        raw_results = [result_item for page in page_responses for result_item in page.get("results", [])]
 
         if not raw_results:
             logger.warning(f"SearXNG returned 0 results for the query '{query}'")
             return {"documents": [], "links": []}
 
-        logger.info(f"SearXNG results: {len(raw_results)} results for query '{query}'")
+        logger.info(f"SearXNG results: {len(raw_results)} results from {len(page_responses)} pages for query '{query}'")
 
-        # If num_results was respected by API, raw_results might already be limited.
-        # Slicing here ensures we don't exceed max_results_requested if API returned more for some reason.
-        for result_item in raw_results[: max_results_requested if max_results_requested > 0 else len(raw_results)]:
-            title = result_item.get("title")
+        merged: Dict[str, Dict[str, Any]] = {}
+        for result_item in raw_results:
             url = result_item.get("url")
-            logger.info(f"SearXNG result: {url} for query {query}")
-
             content = result_item.get("content")  # Main snippet
 
             if not url or not content:  # Skip if essential fields are missing
                 logger.debug(f"Skipping result due to missing URL or content: {result_item}")
                 continue
 
+            key = SearXNGWebSearch._normalize_url(url)
+            engines = result_item.get("engines") or ([result_item["engine"]] if result_item.get("engine") else [])
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = {**result_item, "engines": list(engines)}
+                continue
+            if (result_item.get("score") or 0) > (existing.get("score") or 0):
+                existing.update({k: v for k, v in result_item.items() if k not in ("content", "engines")})
+            if len(content) > len(existing["content"]):
+                existing["content"] = content
+            existing["engines"] += [engine for engine in engines if engine not in existing["engines"]]
+
+        # sorted() is stable, so results without a score keep SearXNG's order.
+        ranked = sorted(merged.values(), key=lambda item: item.get("score") or 0, reverse=True)
+
+        documents: List[Document] = []
+        urls: List[str] = []
+        for result_item in ranked[: max_results_requested if max_results_requested > 0 else len(ranked)]:
+            url = result_item["url"]
+            logger.info(f"SearXNG result: {url} for query {query}")
+
             meta = {
-                "title": title,
+                "title": result_item.get("title"),
                 "url": url,
                 "category": result_item.get("category"),
                 "engine": result_item.get("engine"),
+                "engines": result_item.get("engines") or None,
                 "score": result_item.get("score"),
                 "language": result_item.get("language"),
                 "img_src": result_item.get("img_src"),
@@ -208,7 +360,7 @@ class SearXNGWebSearch:
             # Remove None values from meta for cleaner Document object
             cleaned_meta = {k: v for k, v in meta.items() if v is not None}
 
-            documents.append(Document(content=content, meta=cleaned_meta))
+            documents.append(Document(content=result_item["content"], meta=cleaned_meta))
             urls.append(url)
 
         logger.debug(f"Processed {len(documents)} documents from SearXNG for query '{query}'")
@@ -218,7 +370,7 @@ class SearXNGWebSearch:
         """
         Serializes the component to a dictionary.
         """
-        return default_to_dict(self, base_url=self.base_url, timeout=self.timeout)
+        return default_to_dict(self, base_url=self.base_url, timeout=self.timeout, max_pages=self.max_pages)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "SearXNGWebSearch":
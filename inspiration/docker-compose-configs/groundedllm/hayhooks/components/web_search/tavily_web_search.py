@@ -1,3 +1,4 @@
+import os
 from typing import Dict, List, Literal, Optional, Union
 
 from hayhooks import log as logger
@@ -25,7 +26,10 @@ class TavilyWebSearch:
         try:
             api_key_value = api_key.resolve_value()
             if api_key_value:
-                self.tavily_client = TavilyClient(api_key=api_key_value)
+                # TAVILY_API_BASE_URL points the client at another Tavily-compatible API, e.g. a benchmark stub.
+                api_base_url = os.getenv("TAVILY_API_BASE_URL")
+                client_kwargs = {"api_base_url": api_base_url} if api_base_url else {}
+                self.tavily_client = TavilyClient(api_key=api_key_value, **client_kwargs)
         except Exception:
             logger.info("TavilyWebSearch component is disabled.")
             # Continue without a client - will return empty results
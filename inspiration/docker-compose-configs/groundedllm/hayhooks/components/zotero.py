@@ -3,7 +3,8 @@ import mimetypes
 import os
 import re
 import sqlite3
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional
 
 from hayhooks import log as logger
 from haystack import component
@@ -102,6 +103,10 @@ class ZoteroDatabase:
     # Default SQLite database file path
     DEFAULT_DB_FILE = "zotero_json_cache.db"
 
+    # Sync locks by absolute database path, shared by every ZoteroDatabase on the same file.
+    _sync_locks: Dict[str, threading.Lock] = {}
+    _sync_locks_guard = threading.Lock()
+
     def __init__(
         self,
         db_file: str = DEFAULT_DB_FILE,
@@ -123,6 +128,9 @@ class ZoteroDatabase:
 
         logger.info(f"Using Zotero SQLite database path: {self.db_file}")
 
+        with self._sync_locks_guard:
+            self.sync_lock = self._sync_locks.setdefault(os.path.abspath(self.db_file), threading.Lock())
+
         # Initialize the database
         self.init_json_db()
 
@@ -160,12 +168,19 @@ class ZoteroDatabase:
     def sync_zotero_to_json_sqlite(self, zotero_client):
         """Sync Zotero items to the local SQLite database using incremental sync.
 
+        Syncs to the same database file are serialized, so a warm-up sync and a request (or two
+        resolvers sharing the file) don't both hit the Zotero API at once.
+
         Args:
             zotero_client: The Zotero client to use for fetching items.
 
         Returns:
             int: The number of items synced.
         """
+        with self.sync_lock:
+            return self._sync_zotero_to_json_sqlite(zotero_client)
+
+    def _sync_zotero_to_json_sqlite(self, zotero_client) -> int:
         try:
             conn = sqlite3.connect(self.db_file)
             cursor = conn.cursor()
@@ -410,6 +425,7 @@ class ZoteroContentResolver:
         library_type: str = "user",  # 'user' or 'group'
         timeout: int = 10,
         raise_on_failure: bool = False,
+        db: Optional[ZoteroDatabase] = None,
     ):
         """Initialize the Zotero content resolver.
 
@@ -420,13 +436,14 @@ class ZoteroContentResolver:
             library_type (str): The type of library ('user' or 'group').
             timeout (int): The timeout for API requests in seconds.
             raise_on_failure (bool): Whether to raise an exception if fetching fails.
+            db (Optional[ZoteroDatabase]): A database to use instead of opening `db_file`, e.g. one shared with other pipelines.
         """
         self.raise_on_failure = raise_on_failure
         self.timeout = timeout
         self.library_type = library_type
 
         # Initialize the database
-        self.db = ZoteroDatabase(db_file=db_file, raise_on_failure=raise_on_failure)
+        self.db = db if db is not None else ZoteroDatabase(db_file=db_file, raise_on_failure=raise_on_failure)
 
         try:
             self.library_id = library_id.resolve_value()
@@ -436,12 +453,20 @@ class ZoteroContentResolver:
             self.is_enabled = False
 
         if self.is_enabled:
+            # The initial sync can take a long time on a large library, so it happens in warm_up()
+            # rather than here. Searches sync before querying in any case.
             self.zotero_client = zotero.Zotero(self.library_id, library_type, self.api_key)
-            # Sync Zotero data to the local database
-            self.db.sync_zotero_to_json_sqlite(self.zotero_client)
         else:
             logger.info("No ZOTERO_LIBRARY_ID or ZOTERO_API_KEY provided. ZoteroContentResolver is disabled.")
 
+    def warm_up(self) -> None:
+        """Sync Zotero data to the local database."""
+        if self.is_enabled:
+            self._sync()
+
+    def _sync(self) -> None:
+        self.db.sync_zotero_to_json_sqlite(self.zotero_client)
+
     def _find_matching_item(self, url: str) -> Optional[dict]:
         """Find a matching Zotero item for the given URL.
 
@@ -454,7 +479,7 @@ class ZoteroContentResolver:
         matching_item = None
 
         # Always sync before every search
-        self.db.sync_zotero_to_json_sqlite(self.zotero_client)
+        self._sync()
 
         # First, try to find the item by URL in the local database
         url_matches = self.db.search_json_by_url_sqlite(url)
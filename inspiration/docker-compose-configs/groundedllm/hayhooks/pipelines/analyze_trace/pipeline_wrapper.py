@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from hayhooks import log as logger
 from hayhooks.server.utils.base_pipeline_wrapper import BasePipelineWrapper
@@ -7,6 +8,10 @@ from haystack.components.builders.prompt_builder import PromptBuilder
 from haystack.components.generators import OpenAIGenerator
 from haystack.utils import Secret
 
+from components.cached_generator import with_response_cache
+from components.container import container
+from components.single_flight import single_flight
+from components.stack_trace import DEFAULT_CACHE_TTL, stack_trace_fingerprint
 from components.stackoverflow import StackOverflowStackTraceAnalyzer
 from resources.utils import read_resource_file
 
@@ -35,7 +40,7 @@ class PipelineWrapper(BasePipelineWrapper):
         model = os.getenv("HAYHOOKS_EXCERPT_MODEL")
         if model is None or model == "":
             raise ValueError("No model found in HAYHOOKS_EXCERPT_MODEL environment variable!")
-        llm = self.get_extract_generator(model)
+        llm = with_response_cache(self.get_extract_generator(model))
         pipe.add_component("llm", llm)
 
         pipe.connect("stacktrace_analyzer.documents", "prompt_builder.documents")
@@ -43,7 +48,11 @@ class PipelineWrapper(BasePipelineWrapper):
 
         self.pipeline = pipe
 
-    def run_api(self, stack_trace: str, language: str, limit: int = 10) -> str:
+        # Analyses are cached by fingerprint, so a recurring error is answered without the API or the LLM.
+        self.analysis_cache = container.cache_store()
+
+    @single_flight()
+    def run_api(self, stack_trace: str, language: str, limit: int = 10, bypass_cache: bool = False) -> str:
         """
         Analyzes the provided stack trace in the specified programming language and formats the response as markdown.
 
@@ -58,21 +67,48 @@ class PipelineWrapper(BasePipelineWrapper):
         :param limit: Limit the analysis or size of the output, 10 by default.
         :type limit: int
 
+        :param bypass_cache: Set this to true to get a fresh analysis instead of a cached one.
+        :type bypass_cache: bool
+
         :return: The result of the stack trace analysis in markdown format.
         :rtype: str
         """
         logger.debug(f"Running stacktrace analyze pipeline with stack_trace: {stack_trace}")
 
-        result = self.pipeline.run({"stacktrace_analyzer": {"stack_trace": stack_trace, "language": language, "include_comments": False, "limit": limit}, "prompt_builder": {"query": stack_trace}})
+        cache_key = f"analyze_trace:{stack_trace_fingerprint(stack_trace, language)}:{limit}"
+        cached = None if bypass_cache else self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"run_api: serving cached analysis for {cache_key}")
+            return cached
+
+        result = self.pipeline.run({"stacktrace_analyzer": {"stack_trace": stack_trace, "language": language, "include_comments": False, "limit": limit}, "prompt_builder": {"query": stack_trace}, "llm": {"bypass_cache": bypass_cache}})
         logger.debug(f"result = {result}")
 
         if "llm" in result and "replies" in result["llm"] and result["llm"]["replies"]:
             reply = result["llm"]["replies"][0]
             logger.info(f"run_api: reply is {reply}")
+            self._cache_set(cache_key, reply)
             return reply
         else:
             raise RuntimeError("Error: Could not retrieve answer from the pipeline.")
 
+    def _cache_get(self, key: str) -> Optional[str]:
+        if DEFAULT_CACHE_TTL <= 0:
+            return None
+        try:
+            return self.analysis_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Analysis cache unavailable: {e}")
+            return None
+
+    def _cache_set(self, key: str, reply: str) -> None:
+        if DEFAULT_CACHE_TTL <= 0:
+            return
+        try:
+            self.analysis_cache.set(key, reply, ttl=DEFAULT_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Analysis cache unavailable: {e}")
+
     def get_extract_generator(self, model) -> OpenAIGenerator:
         return OpenAIGenerator(
             api_key=Secret.from_env_var("OPENAI_API_KEY"),
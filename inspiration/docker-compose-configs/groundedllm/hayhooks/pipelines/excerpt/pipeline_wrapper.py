@@ -10,7 +10,9 @@ from haystack.components.builders.prompt_builder import PromptBuilder
 from haystack.components.generators import OpenAIGenerator
 from haystack.utils import Secret
 
+from components.cached_generator import with_response_cache
 from components.content_extraction import build_content_extraction_component
+from components.single_flight import single_flight
 from resources.utils import read_resource_file
 
 
@@ -37,7 +39,7 @@ class PipelineWrapper(BasePipelineWrapper):
         model = os.getenv("HAYHOOKS_EXCERPT_MODEL")
         if model is None or model == "":
             raise ValueError("No model found in HAYHOOKS_EXCERPT_MODEL environment variable!")
-        llm = self.get_extract_generator(model)
+        llm = with_response_cache(self.get_extract_generator(model))
 
         logger.info(f"Using excerpt model: {model}")
 
@@ -135,7 +137,8 @@ class PipelineWrapper(BasePipelineWrapper):
 
         return cleaned_urls
 
-    def run_api(self, urls: List[str], question: str) -> str:
+    @single_flight()
+    def run_api(self, urls: List[str], question: str, bypass_cache: bool = False) -> str:
         """Extract pages from URLs and answers questions about the pages.
 
         This tool will fetch HTML, Markdown, PDF, or plain text web pages from URLs.
@@ -149,6 +152,8 @@ class PipelineWrapper(BasePipelineWrapper):
             The URLs of the pages to extract.
         question: str
             The instructions to give and questions to ask about the web pages.
+        bypass_cache: bool
+            Set this to true to get a fresh answer instead of a cached one.
 
         Returns
         -------
@@ -168,6 +173,7 @@ class PipelineWrapper(BasePipelineWrapper):
                 {
                     "content_extractor": {"urls": clean_urls},
                     "prompt_builder": {"query": question},
+                    "llm": {"bypass_cache": bypass_cache},
                 }
             )
 
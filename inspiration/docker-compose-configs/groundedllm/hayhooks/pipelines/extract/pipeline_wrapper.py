@@ -9,7 +9,9 @@ from haystack.components.generators import OpenAIGenerator
 from haystack.utils import Secret
 from loguru import logger as log
 
+from components.bulk_extract import BulkExtractor
 from components.content_extraction import build_content_extraction_component
+from components.single_flight import single_flight
 
 
 class PipelineWrapper(BasePipelineWrapper):
@@ -22,6 +24,8 @@ class PipelineWrapper(BasePipelineWrapper):
 
     def setup(self) -> None:
         self.pipeline = self.create_pipeline()
+        # Used by the streaming /extract/bulk route in app.py
+        self.bulk_extractor = BulkExtractor(self.pipeline)
 
     def create_pipeline(self) -> Pipeline:
         default_user_agent = os.getenv(
@@ -51,6 +55,7 @@ class PipelineWrapper(BasePipelineWrapper):
             model=model,
         )
 
+    @single_flight()
     def run_api(self, url: str) -> str:
         """Extract pages from URL.
 
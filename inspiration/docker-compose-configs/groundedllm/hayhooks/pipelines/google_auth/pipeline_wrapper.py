@@ -4,6 +4,7 @@ from hayhooks import log as logger
 from hayhooks.server.utils.base_pipeline_wrapper import BasePipelineWrapper
 from haystack import Pipeline
 
+from components.container import container
 from components.google.google_oauth_component import GoogleOAuthComponent
 
 
@@ -19,7 +20,7 @@ class PipelineWrapper(BasePipelineWrapper):
         pipe = Pipeline()
         self.pipeline = pipe
 
-        oauth_component = GoogleOAuthComponent()
+        oauth_component = GoogleOAuthComponent(oauth=container.google_oauth())
         pipe.add_component("google_auth", oauth_component)
 
         # This pipeline wrapper doesn't run a traditional Haystack pipeline,
@@ -8,7 +8,11 @@ from haystack.components.generators import OpenAIGenerator
 from haystack.components.joiners import DocumentJoiner
 from haystack.utils import Secret
 
-from components.content_extraction import build_search_extraction_component
+from components.cached_generator import with_response_cache
+from components.container import container
+from components.content_extraction import URLContentRouter, build_search_extraction_component, build_url_resolvers
+from components.prefetch import SEARCH_PREFETCH_ENABLED, PrefetchingWebSearch, prefetch_scope
+from components.single_flight import single_flight
 from components.web_search.brave_web_search import BraveWebSearch
 from components.web_search.exa_web_search import ExaWebSearch
 from components.web_search.linkup_web_search import LinkupWebSearch
@@ -26,14 +30,34 @@ class PipelineWrapper(BasePipelineWrapper):
 
         pipe = Pipeline()
 
+        default_user_agent = os.getenv(
+            "HAYHOOKS_SEARCH_USER_AGENT",
+            "SearchAgent.extract @ https://github.com/wsargent/groundedllm",
+        )
+        use_http2 = bool(os.getenv("HAYHOOKS_SEARCH_HTTP2", "True"))
+        retry_attempts = int(os.getenv("HAYHOOKS_SEARCH_RETRY_ATTEMPTS", "3"))
+        timeout = int(os.getenv("HAYHOOKS_SEARCH_TIMEOUT", "3"))
+        raise_on_failure = bool(os.getenv("HAYHOOKS_SEARCH_RAISE_ON_FAILURE", "False"))
+
         #######
         # Set up the search components
+        #
+        # Each engine's top results start downloading into the page cache as soon as it returns,
+        # so fetching overlaps with the engines that are still searching.
+
+        page_cache = container.page_cache() if SEARCH_PREFETCH_ENABLED else None
+        prefetch_router = URLContentRouter(resolvers=build_url_resolvers(raise_on_failure=raise_on_failure, timeout=timeout))
 
-        tavily_search = TavilyWebSearch()
-        linkup_search = LinkupWebSearch()
-        searxng_search = SearXNGWebSearch()
-        exa_search = ExaWebSearch()
-        brave_search = BraveWebSearch()
+        def prefetching(search):
+            if page_cache is None:
+                return search
+            return PrefetchingWebSearch(search, page_cache=page_cache, fetch=prefetch_router.fetch)
+
+        tavily_search = prefetching(TavilyWebSearch())
+        linkup_search = prefetching(LinkupWebSearch())
+        searxng_search = prefetching(SearXNGWebSearch())
+        exa_search = prefetching(ExaWebSearch())
+        brave_search = prefetching(BraveWebSearch())
 
         pipe.add_component("tavily_search", tavily_search)
         pipe.add_component("linkup_search", linkup_search)
@@ -50,20 +74,13 @@ class PipelineWrapper(BasePipelineWrapper):
         #######
         # Set up the content extractor
 
-        default_user_agent = os.getenv(
-            "HAYHOOKS_SEARCH_USER_AGENT",
-            "SearchAgent.extract @ https://github.com/wsargent/groundedllm",
-        )
-        use_http2 = bool(os.getenv("HAYHOOKS_SEARCH_HTTP2", "True"))
-        retry_attempts = int(os.getenv("HAYHOOKS_SEARCH_RETRY_ATTEMPTS", "3"))
-        timeout = int(os.getenv("HAYHOOKS_SEARCH_TIMEOUT", "3"))
-        raise_on_failure = bool(os.getenv("HAYHOOKS_SEARCH_RAISE_ON_FAILURE", "False"))
         content_extractor = build_search_extraction_component(
             raise_on_failure=raise_on_failure,
             user_agents=[default_user_agent],
             retry_attempts=retry_attempts,
             timeout=timeout,
             http2=use_http2,
+            page_cache=page_cache,
         )
         pipe.add_component("content_extractor", content_extractor)
 
@@ -97,7 +114,7 @@ class PipelineWrapper(BasePipelineWrapper):
             raise ValueError("HAYHOOKS_SEARCH_MODEL environment variable is not set!")
 
         logger.info(f"Using search model: {search_model}")
-        llm = OpenAIGenerator(api_key=search_api_key, api_base_url=api_base_url, model=search_model)
+        llm = with_response_cache(OpenAIGenerator(api_key=search_api_key, api_base_url=api_base_url, model=search_model))
 
         pipe.add_component("llm", llm)
 
@@ -129,7 +146,7 @@ class PipelineWrapper(BasePipelineWrapper):
 
         #######
         # Send the relevant documents with URLs to extract the full pages
-        # XXX Set up content extraction to run through a cache for frequently used documents
+        # Pages that were prefetched (or fetched recently) come from the page cache
         pipe.connect("document_joiner.documents", "content_extractor.documents")
         pipe.connect("content_extractor.documents", "prompt_builder.documents")
 
@@ -138,6 +155,7 @@ class PipelineWrapper(BasePipelineWrapper):
 
         self.pipeline = pipe
 
+    @single_flight()
     def run_api(
         self,
         question: str,
@@ -146,6 +164,7 @@ class PipelineWrapper(BasePipelineWrapper):
         time_range: str = "",
         include_domains: str = "",
         exclude_domains: str = "",
+        bypass_cache: bool = False,
     ) -> str:
         """Run the search pipeline to answer a given question using web search results.
 
@@ -173,6 +192,8 @@ class PipelineWrapper(BasePipelineWrapper):
         exclude_domains : str
             A list of domains to specifically exclude from the search results.
             Use "" to ignore this argument.
+        bypass_cache : bool
+            Set this to true to get a fresh answer instead of a cached one.
 
         Returns
         -------
@@ -187,33 +208,36 @@ class PipelineWrapper(BasePipelineWrapper):
         """
         logger.debug(f"Running answer pipeline with question: {question}")
 
-        result = self.pipeline.run(
-            {
-                "tavily_search": {
-                    "query": question,
-                    "search_depth": search_depth,
-                    "max_results": max_results,
-                    "time_range": time_range if time_range != "" else None,
-                    "include_domains": include_domains if include_domains != "" else None,
-                    "exclude_domains": exclude_domains if exclude_domains != "" else None,
-                },
-                "linkup_search": {
-                    "query": question,
-                    "search_depth": search_depth,
-                },
-                # https://docs.searxng.org/user/configured_engines.html
-                # we probably want "general"
-                "searxng_search": {"query": question, "safesearch": 1},
-                "brave_search": {"query": question, "max_results": max_results},
-                "exa_search": {
-                    "query": question,
-                    "max_results": max_results,
-                    "include_domains": include_domains if include_domains != "" else None,
-                    "exclude_domains": exclude_domains if exclude_domains != "" else None,
-                },
-                "prompt_builder": {"query": question},
-            }
-        )
+        # Content extraction cancels this run's prefetches that it ends up not needing.
+        with prefetch_scope():
+            result = self.pipeline.run(
+                {
+                    "tavily_search": {
+                        "query": question,
+                        "search_depth": search_depth,
+                        "max_results": max_results,
+                        "time_range": time_range if time_range != "" else None,
+                        "include_domains": include_domains if include_domains != "" else None,
+                        "exclude_domains": exclude_domains if exclude_domains != "" else None,
+                    },
+                    "linkup_search": {
+                        "query": question,
+                        "search_depth": search_depth,
+                    },
+                    # https://docs.searxng.org/user/configured_engines.html
+                    # we probably want "general"
+                    "searxng_search": {"query": question, "safesearch": 1, "max_results": max_results},
+                    "brave_search": {"query": question, "max_results": max_results},
+                    "exa_search": {
+                        "query": question,
+                        "max_results": max_results,
+                        "include_domains": include_domains if include_domains != "" else None,
+                        "exclude_domains": exclude_domains if exclude_domains != "" else None,
+                    },
+                    "prompt_builder": {"query": question},
+                    "llm": {"bypass_cache": bypass_cache},
+                }
+            )
 
         if "llm" in result and "replies" in result["llm"] and result["llm"]["replies"]:
             reply = result["llm"]["replies"][0]
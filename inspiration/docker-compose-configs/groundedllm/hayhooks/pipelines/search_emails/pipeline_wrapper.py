@@ -9,6 +9,7 @@ from haystack.components.generators.openai import OpenAIGenerator
 from haystack.dataclasses.document import Document
 from haystack.utils.auth import Secret
 
+from components.container import container
 from components.google.google_mail_reader import GoogleMailReader
 from resources.utils import read_resource_file
 
@@ -31,7 +32,7 @@ class PipelineWrapper(BasePipelineWrapper):
         logger.info("Setting up SearchEmails pipeline...")
 
         pipe = Pipeline()
-        mail_lister = GoogleMailReader()  # OAuth handled internally
+        mail_lister = GoogleMailReader(google_oauth_provider=container.google_oauth())
         # The prompt_builder will receive 'documents' from mail_lister
         # and 'query' from the run_api's 'instruction' input.
         prompt_builder = PromptBuilder(template=self.template, required_variables=["query", "documents"])
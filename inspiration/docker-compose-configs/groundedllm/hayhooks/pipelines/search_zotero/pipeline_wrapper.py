@@ -1,24 +1,22 @@
 import json
-import os
 from typing import List
 
 from hayhooks import log as logger
 from hayhooks.server.utils.base_pipeline_wrapper import BasePipelineWrapper
 from haystack import Pipeline
 
-from components.zotero import ZoteroDatabase
+from components.container import container
 
 
 class PipelineWrapper(BasePipelineWrapper):
     """A Haystack pipeline wrapper that searches Zotero database using MongoDB-style query objects."""
 
     def setup(self) -> None:
-        """Set up the pipeline with a ZoteroDatabase component."""
+        """Set up the pipeline with the shared ZoteroDatabase."""
         pipe = Pipeline()
 
-        # Initialize the ZoteroDatabase component
-        db_file = os.getenv("ZOTERO_DB_FILE")
-        self.zotero_db = ZoteroDatabase(db_file=db_file)
+        # Share the Zotero database with the extraction pipelines' resolver
+        self.zotero_db = container.zotero_database()
 
         self.pipeline = pipe
 
@@ -0,0 +1,78 @@
+"""Test the benchmark harness and its stub services."""
+
+import time
+
+import httpx
+
+from benchmarks.run import ComponentTimingTracer, is_problem, percentile, run_load
+from benchmarks.stubs import StubBehavior, StubCluster, StubServer
+
+
+def test_percentile():
+    """Percentiles interpolate between the closest ranks."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 99) == 99.01
+    assert percentile([], 95) == 0.0
+
+
+def test_stub_latency_and_failure_injection():
+    """Stub servers add latency and fail the configured fraction of requests."""
+    server = StubServer("test", lambda method, path, query, body: (200, "text/plain", b"ok"), StubBehavior(latency_ms=50, failure_rate=0.5), seed=1).start()
+    try:
+        start = time.perf_counter()
+        statuses = [httpx.get(f"{server.url}/").status_code for _ in range(20)]
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    assert elapsed >= 20 * 0.05
+    assert statuses.count(503) == server.stats()["injected_failures"]
+    assert 0 < statuses.count(503) < 20
+
+
+def test_stub_cluster_search_results_point_at_pages():
+    """SearXNG stub results link to pages the pages stub serves."""
+    stubs = StubCluster()
+    try:
+        response = httpx.get(f"{stubs.url('searxng')}/search", params={"q": "haystack", "format": "json", "num_results": 3})
+        results = response.json()["results"]
+        assert len(results) == 3
+        page = httpx.get(results[0]["url"])
+        assert page.status_code == 200
+        assert "<title>" in page.text
+
+        pr = httpx.get(f"{stubs.url('github')}/repos/o/r/pulls/7").json()
+        assert pr["number"] == 7
+        assert stubs.env()["OPENAI_API_BASE"].endswith("/v1")
+    finally:
+        stubs.stop()
+
+
+def test_run_load_counts_errors_and_problems():
+    """The load runner separates exceptions from problem details results."""
+
+    def call(i: int):
+        if i == 0:
+            raise RuntimeError("boom")
+        if i == 1:
+            return '{"type": "urn:hayhooks:extract:error", "title": "No content extracted"}'
+        return "[]"
+
+    result = run_load(call, requests=6, concurrency=2, distinct_inputs=3)
+    assert result["errors"] == {"RuntimeError": 2}
+    assert result["problems"] == 2
+    assert result["latency_ms"]["count"] == 6
+    assert not is_problem("[]")
+
+
+def test_component_timing_tracer_nests_super_components():
+    """Component timings are keyed by their path through super components."""
+    tracer = ComponentTimingTracer()
+    with tracer.trace("haystack.component.run", tags={"haystack.component.name": "outer"}):
+        with tracer.trace("haystack.component.run", tags={"haystack.component.name": "inner"}):
+            pass
+        with tracer.trace("haystack.pipeline.run"):
+            pass
+
+    assert set(tracer.report()) == {"outer", "outer/inner"}
@@ -0,0 +1,63 @@
+import json
+import time
+from typing import List
+
+import pytest
+from haystack import Document, Pipeline, component
+
+from components.bulk_extract import BulkExtractor, to_ndjson, to_sse
+
+
+@component
+class SlowExtractor:
+    """Returns the URL as content after sleeping for the number of milliseconds in the URL."""
+
+    @component.output_types(documents=List[Document])
+    def run(self, urls: List[str]):
+        url = urls[0]
+        if "fail" in url:
+            raise RuntimeError("boom")
+        if "empty" in url:
+            return {"documents": []}
+        time.sleep(int(url.rsplit("/", 1)[-1]) / 1000)
+        return {"documents": [Document(content=url)]}
+
+
+def _bulk_extractor(**kwargs) -> BulkExtractor:
+    pipe = Pipeline()
+    pipe.add_component("content_extractor", SlowExtractor())
+    return BulkExtractor(pipe, **kwargs)
+
+
+def test_results_in_completion_order():
+    """Test that results are yielded as they complete, with their request index."""
+    results = list(_bulk_extractor().iter_results(["https://a/300", "https://b/10", "https://c/150"]))
+    assert [r["url"] for r in results] == ["https://b/10", "https://c/150", "https://a/300"]
+    assert [r["index"] for r in results] == [1, 2, 0]
+    assert results[0]["contents"] == ["https://b/10"]
+    assert all(r["status"] == "200" for r in results)
+
+
+def test_per_url_problems():
+    """Test that failing URLs get problem details without affecting the others."""
+    results = {r["url"]: r for r in _bulk_extractor().iter_results(["https://ok/0", "https://fail/0", "https://empty/0", "https://ok/0"])}
+    assert len(results) == 3
+    assert results["https://ok/0"]["status"] == "200"
+    assert results["https://fail/0"]["status"] == "500"
+    assert results["https://fail/0"]["type"] == "urn:hayhooks:extract:error"
+    assert results["https://empty/0"]["status"] == "404"
+
+
+def test_max_urls():
+    """Test that too many URLs are rejected."""
+    with pytest.raises(ValueError):
+        list(_bulk_extractor(max_urls=1).iter_results(["https://a/0", "https://b/0"]))
+
+
+def test_encodings():
+    """Test the NDJSON and SSE encodings."""
+    results = [{"url": "a", "status": "200"}, {"url": "b", "status": "404"}]
+    assert [json.loads(line) for line in to_ndjson(iter(results))] == results
+    events = list(to_sse(iter(results)))
+    assert events[0].startswith("event: result\ndata: ")
+    assert events[-1] == 'event: done\ndata: {"total": 2, "failed": 1}\n\n'
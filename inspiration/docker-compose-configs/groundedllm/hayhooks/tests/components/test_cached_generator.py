@@ -0,0 +1,85 @@
+from typing import List
+
+import pytest
+
+from components.cached_generator import CachedGenerator
+from components.shared_state import MemoryStore
+
+
+class CountingGenerator:
+    """Stands in for OpenAIGenerator and counts calls."""
+
+    def __init__(self, model: str = "test-model"):
+        self.model = model
+        self.generation_kwargs = {}
+        self.calls = 0
+
+    def run(self, prompt, system_prompt=None, streaming_callback=None, generation_kwargs=None):
+        self.calls += 1
+        return {"replies": [f"reply {self.calls} to {prompt}"], "meta": [{"model": self.model, "usage": {"total_tokens": 10}}]}
+
+
+def _bag_of_words(text: str) -> List[float]:
+    words = ["capital", "france", "paris", "what", "is", "the", "of", "weather"]
+    return [float(text.lower().count(w)) for w in words]
+
+
+def test_exact_cache_hit():
+    """Test that an identical prompt is answered from the cache."""
+    generator = CountingGenerator()
+    cached = CachedGenerator(generator, store=MemoryStore(), ttl=60)
+    first = cached.run(prompt="What is Haystack?")
+    second = cached.run(prompt="What is Haystack?")
+    assert generator.calls == 1
+    assert second["replies"] == first["replies"]
+    assert second["meta"][0]["cached"] is True
+    assert "cached" not in first["meta"][0]
+
+
+def test_key_includes_model_and_params():
+    """Test that different models or generation parameters do not share replies."""
+    store = MemoryStore()
+    generator = CountingGenerator()
+    cached = CachedGenerator(generator, store=store, ttl=60)
+    cached.run(prompt="q")
+    cached.run(prompt="q", generation_kwargs={"temperature": 0.9})
+    cached.run(prompt="q", system_prompt="be brief")
+    assert generator.calls == 3
+
+    other = CountingGenerator(model="other-model")
+    CachedGenerator(other, store=store, ttl=60).run(prompt="q")
+    assert other.calls == 1
+
+
+def test_bypass_and_disabled():
+    """Test that bypass_cache skips the lookup and that ttl 0 disables caching."""
+    generator = CountingGenerator()
+    cached = CachedGenerator(generator, store=MemoryStore(), ttl=60)
+    cached.run(prompt="q")
+    refreshed = cached.run(prompt="q", bypass_cache=True)
+    assert generator.calls == 2
+    assert cached.run(prompt="q")["replies"] == refreshed["replies"]
+
+    uncached = CachedGenerator(generator, store=MemoryStore(), ttl=0)
+    uncached.run(prompt="q")
+    uncached.run(prompt="q")
+    assert generator.calls == 4
+
+
+def test_semantic_cache_hit():
+    """Test that a similar prompt is answered from the cache in semantic mode."""
+    generator = CountingGenerator()
+    cached = CachedGenerator(generator, store=MemoryStore(), ttl=60, mode="semantic", similarity_threshold=0.9, embed=_bag_of_words)
+    cached.run(prompt="What is the capital of France?")
+    hit = cached.run(prompt="what is the capital of france")
+    assert generator.calls == 1
+    assert hit["meta"][0]["cached"] is True
+
+    cached.run(prompt="What is the weather in Paris?")
+    assert generator.calls == 2
+
+
+def test_unknown_mode():
+    """Test that an unknown cache mode is rejected."""
+    with pytest.raises(ValueError):
+        CachedGenerator(CountingGenerator(), store=MemoryStore(), ttl=60, mode="fuzzy")
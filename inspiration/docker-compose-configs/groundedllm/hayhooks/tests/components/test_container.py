@@ -0,0 +1,81 @@
+"""Test the shared component container."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from components.container import ComponentContainer
+from components.fetchers import ContentFetcherResolver
+from components.resolver_registry import ResolverRegistry
+from components.zotero import ZoteroContentResolver, ZoteroDatabase
+
+
+def test_get_builds_once_under_concurrency():
+    """Concurrent lookups of the same key share one instance."""
+    container = ComponentContainer(resolvers=ResolverRegistry(background_warm_up=False))
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        instances = list(executor.map(lambda _: container.get("thing", factory), range(5)))
+
+    assert len(calls) == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_slow_factory_does_not_block_other_keys():
+    """A slow factory only blocks callers waiting on the same key."""
+    container = ComponentContainer(resolvers=ResolverRegistry(background_warm_up=False))
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(timeout=5)
+        return "slow"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(container.get, "slow", slow)
+        started.wait()
+        assert container.get("fast", lambda: "fast") == "fast"
+        release.set()
+        assert future.result() == "slow"
+
+
+def test_clear():
+    """Cleared instances are rebuilt on the next lookup."""
+    container = ComponentContainer(resolvers=ResolverRegistry(background_warm_up=False))
+    first = container.get("thing", object)
+    container.clear()
+    assert not container.has("thing")
+    assert container.get("thing", object) is not first
+
+
+def test_zotero_database_is_shared(tmp_path):
+    """Resolvers built with the container's Zotero database share it and its sync lock."""
+    container = ComponentContainer(resolvers=ResolverRegistry(background_warm_up=False))
+    db_file = str(tmp_path / "zotero.db")
+
+    db = container.zotero_database(db_file)
+    assert container.zotero_database(db_file) is db
+
+    first = ZoteroContentResolver(db=db)
+    second = ZoteroContentResolver(db=db)
+    assert first.db is second.db
+    assert ZoteroDatabase(db_file=db_file).sync_lock is db.sync_lock
+
+
+def test_content_fetchers_are_shared():
+    """Content fetcher resolvers built from the container share the same fetchers."""
+    container = ComponentContainer(resolvers=ResolverRegistry(background_warm_up=False))
+    fetchers = container.content_fetchers()
+
+    strict = ContentFetcherResolver(raise_on_failure=True, fetchers=fetchers)
+    lenient = ContentFetcherResolver(raise_on_failure=False, fetchers=fetchers)
+
+    assert set(fetchers) == {"scrapling", "jina", "default"}
+    assert strict.fetchers["default"] is lenient.fetchers["default"]
@@ -296,3 +296,24 @@ def test_join_with_content_scored_docs_no_url():
     # Should use extracted content for the valid document
     assert result["documents"][0].content == "Extracted content"
     assert result["documents"][0].meta["url"] == "http://example.com/2"
+
+
+def test_join_with_content_removes_near_duplicates():
+    """Test JoinWithContent when two URLs extract to nearly the same content."""
+    article = " ".join(f"Sentence {i} of the article explains another detail about the release and its changes." for i in range(20))
+    scored_docs = [
+        Document(content="Snippet", meta={"url": "http://example.com/article", "title": "Article"}, score=0.9),
+        Document(content="Snippet", meta={"url": "http://mirror.example.com/article", "title": "Mirror"}, score=0.7),
+    ]
+    content_docs = [
+        Document(content=article, meta={"url": "http://example.com/article"}),
+        Document(content=article + " Mirrored with permission.", meta={"url": "http://mirror.example.com/article"}),
+    ]
+
+    result = JoinWithContent().run(scored_documents=scored_docs, content_documents=content_docs)
+    assert len(result["documents"]) == 1
+    assert result["documents"][0].meta["url"] == "http://example.com/article"
+    assert result["documents"][0].meta["duplicate_urls"] == ["http://mirror.example.com/article"]
+
+    result = JoinWithContent(near_duplicate_distance=None).run(scored_documents=scored_docs, content_documents=content_docs)
+    assert len(result["documents"]) == 2
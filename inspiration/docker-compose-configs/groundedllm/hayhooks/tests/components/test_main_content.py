@@ -0,0 +1,37 @@
+from haystack.dataclasses import ByteStream
+
+from components.main_content import MainContentExtractor
+
+ARTICLE = " ".join(["Haystack pipelines connect components such as retrievers, converters and generators."] * 12)
+
+PAGE = f"""<html><head><title>Pipelines</title><script>var tracking = true;</script></head>
+<body>
+<nav><ul><li><a href="/">Home</a></li><li><a href="/docs">Docs</a></li><li><a href="/blog">Blog</a></li></ul></nav>
+<div id="cookie-banner" class="cookie-consent">We use cookies to improve your experience. Accept all cookies.</div>
+<main><article><h1>Building pipelines</h1><p>{ARTICLE}</p><h2>Connecting components</h2><p>{ARTICLE}</p></article></main>
+<footer><p>Copyright 2025 Example Inc. All rights reserved.</p><a href="/privacy">Privacy</a></footer>
+</body></html>"""
+
+
+def test_extracts_main_content_as_markdown():
+    """Test that navigation, cookie banners and footers are dropped and headings kept as Markdown."""
+    source = ByteStream(data=PAGE.encode("utf-8"), meta={"url": "https://example.com/pipelines", "title": "Pipelines"}, mime_type="text/html")
+    result = MainContentExtractor().run(sources=[source])
+
+    assert result["unextracted"] == []
+    document = result["documents"][0]
+    assert "Haystack pipelines connect components" in document.content
+    assert "## Connecting components" in document.content
+    for boilerplate in ["Home", "cookies", "Copyright", "tracking"]:
+        assert boilerplate not in document.content
+    assert document.meta["url"] == "https://example.com/pipelines"
+    assert document.meta["content_chars"] < document.meta["html_chars"]
+    assert 0 < document.meta["reduction"] < 1
+
+
+def test_passes_through_pages_without_main_content():
+    """Test that pages with too little content are left for the HTML converter."""
+    source = ByteStream(data=b"<html><body><nav><a href='/'>Home</a></nav></body></html>", mime_type="text/html")
+    result = MainContentExtractor().run(sources=[source])
+    assert result["documents"] == []
+    assert result["unextracted"] == [source]
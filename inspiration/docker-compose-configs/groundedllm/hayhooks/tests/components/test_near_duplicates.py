@@ -0,0 +1,51 @@
+from haystack import Document
+
+from components.near_duplicates import DEFAULT_MAX_DISTANCE, hamming_distance, remove_near_duplicates, simhash
+
+ARTICLE = (
+    "The city council voted on Tuesday to expand the bike lane network across the downtown core, "
+    "adding twelve miles of protected lanes over the next three years. Supporters said the plan would "
+    "reduce traffic injuries and make cycling a realistic option for commuters, while several business "
+    "owners worried about the loss of street parking in front of their shops. The transportation "
+    "department will publish detailed maps in the spring and hold public meetings in each affected "
+    "neighborhood before construction begins. Funding comes from a combination of state grants and the "
+    "city's capital budget, and officials expect the first segment along Main Street to open next summer. "
+    "Council members also asked staff to study whether bus routes should be adjusted to connect with the new lanes."
+)
+
+SYNDICATED = "Local News Wire: " + ARTICLE.replace("on Tuesday", "Tuesday").replace("twelve", "12") + " Read more stories like this on our app."
+
+OTHER = (
+    "Researchers at the university have developed a battery chemistry that keeps most of its capacity after "
+    "thousands of charge cycles, according to a paper published this week. The team replaced the liquid "
+    "electrolyte with a solid ceramic layer, which prevents the growth of the needle-like structures that "
+    "short out conventional cells. Manufacturing the ceramic at scale remains difficult, and the authors "
+    "caution that commercial products are likely several years away, but battery makers have already "
+    "expressed interest in licensing the process for electric vehicles and grid storage systems."
+)
+
+
+def test_simhash_distance():
+    """Test that near-duplicate texts have close SimHashes and different texts do not."""
+    assert hamming_distance(simhash(ARTICLE), simhash(SYNDICATED)) <= DEFAULT_MAX_DISTANCE
+    assert hamming_distance(simhash(ARTICLE), simhash(OTHER)) > 2 * DEFAULT_MAX_DISTANCE
+
+
+def test_keeps_highest_scored_representative():
+    """Test that near-duplicates collapse into the highest-scored document with the other URLs merged."""
+    documents = [
+        Document(content=SYNDICATED, meta={"url": "https://wire.example.com/bikes"}, score=0.4),
+        Document(content=OTHER, meta={"url": "https://science.example.com/battery"}, score=0.6),
+        Document(content=ARTICLE, meta={"url": "https://news.example.com/bikes"}, score=0.9),
+        Document(content=ARTICLE, meta={"url": "https://news.example.com/amp/bikes"}, score=0.5),
+    ]
+    kept = remove_near_duplicates(documents)
+    assert [doc.meta["url"] for doc in kept] == ["https://science.example.com/battery", "https://news.example.com/bikes"]
+    assert sorted(kept[1].meta["duplicate_urls"]) == ["https://news.example.com/amp/bikes", "https://wire.example.com/bikes"]
+    assert "duplicate_urls" not in kept[0].meta
+
+
+def test_short_documents_are_kept():
+    """Test that snippets too short to fingerprint are never removed."""
+    documents = [Document(content="Bike lanes expanded downtown", meta={"url": f"https://example.com/{i}"}, score=0.5) for i in range(3)]
+    assert len(remove_near_duplicates(documents)) == 3
@@ -1,10 +1,15 @@
 """Test notion component."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, call, patch
 
 from haystack.dataclasses import ByteStream, Document
+from notion_client import AsyncClient
 
-from components.notion import NotionContentResolver
+from components.notion import NotionContentResolver, ScheduledAsyncClient
+from components.outbound import OutboundScheduler
+from components.shared_state import MemoryStore
 
 
 def test_extract_page_ids():
@@ -82,3 +87,105 @@ def test_run(mock_exporter_class):
     assert isinstance(result["streams"][0], ByteStream)
     assert result["streams"][0].data == b"Test content"
     assert result["streams"][0].meta["title"] == "Test"
+
+
+def make_resolver(last_edited_time: str, store: MemoryStore):
+    """A resolver with a mocked exporter whose page was last edited at `last_edited_time`."""
+    resolver = NotionContentResolver(cache_store=store, scheduler=OutboundScheduler(host_rate=0))
+    resolver.exporter = MagicMock()
+    resolver.exporter.notion_exporter.sync_notion.pages.retrieve.return_value = {"last_edited_time": last_edited_time}
+    resolver.exporter.run.return_value = {"documents": [Document(content="Page content", meta={"title": "Page"})]}
+    return resolver
+
+
+def test_unchanged_page_is_served_from_cache():
+    """Test that a page is only exported again when its last_edited_time changes."""
+    store = MemoryStore()
+    url = "https://www.notion.so/12345678abcd1234abcd1234abcd1234"
+    resolver = make_resolver("2024-05-01T12:34:00.000Z", store)
+
+    first = resolver.run(urls=[url])
+    second = resolver.run(urls=[url])
+    assert resolver.exporter.run.call_count == 1
+    assert second["streams"][0].data == first["streams"][0].data == b"Page content"
+    assert second["streams"][0].meta["title"] == "Page"
+
+    resolver.exporter.notion_exporter.sync_notion.pages.retrieve.return_value = {"last_edited_time": "2024-05-02T08:00:00.000Z"}
+    resolver.run(urls=[url])
+    assert resolver.exporter.run.call_count == 2
+
+
+def test_page_edited_this_minute_is_not_cached():
+    """Test that an export that may have missed edits within the last edit's minute is not reused."""
+    store = MemoryStore()
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:00.000Z")
+    resolver = make_resolver(now, store)
+
+    resolver.run(urls=["https://www.notion.so/12345678abcd1234abcd1234abcd1234"])
+    resolver.run(urls=["https://www.notion.so/12345678abcd1234abcd1234abcd1234"])
+    assert resolver.exporter.run.call_count == 2
+
+
+def test_scheduled_client_stays_within_rate_limit():
+    """Test that concurrent block requests are capped by the scheduler's Notion limit."""
+    scheduler = OutboundScheduler(host_limits={"api.notion.com": (2, 0)})
+    client = ScheduledAsyncClient(scheduler, auth="secret")
+    in_flight = []
+    peak = []
+
+    async def fake_request(self, path, method, *args, **kwargs):
+        in_flight.append(path)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(path)
+        return {"results": []}
+
+    async def main():
+        with patch.object(AsyncClient, "request", fake_request):
+            await asyncio.gather(*(client.request(f"blocks/{i}/children", "GET") for i in range(6)))
+
+    asyncio.run(main())
+    assert max(peak) == 2
+
+
+def test_cache_misses_are_exported_together():
+    """Test that the pages that are not cached are exported in one call, so the exporter fetches them concurrently."""
+    store = MemoryStore()
+    cached_url = "https://www.notion.so/12345678abcd1234abcd1234abcd1234"
+    resolver = make_resolver("2024-05-01T12:34:00.000Z", store)
+    resolver.run(urls=[cached_url])
+
+    resolver.run(urls=[cached_url, "https://www.notion.so/aaaaaaaabbbb1234abcd1234abcd1234", "https://www.notion.so/bbbbbbbbcccc1234abcd1234abcd1234"])
+    assert resolver.exporter.run.call_count == 2
+    assert resolver.exporter.run.call_args == call(page_ids=["aaaaaaaabbbb1234abcd1234abcd1234", "bbbbbbbbcccc1234abcd1234abcd1234"])
+
+
+def test_export_works_when_the_cache_is_down():
+    """Test that a failing cache store falls back to exporting the page."""
+
+    class BrokenStore(MemoryStore):
+        def get(self, key):
+            raise ConnectionError("store is down")
+
+        def set(self, key, value, ttl=None):
+            raise ConnectionError("store is down")
+
+    resolver = make_resolver("2024-05-01T12:34:00.000Z", BrokenStore())
+    result = resolver.run(urls=["https://www.notion.so/12345678abcd1234abcd1234abcd1234"])
+    assert result["streams"][0].data == b"Page content"
+
+
+def test_pages_are_not_cached_without_a_shared_store():
+    """Test that without a shared store exports are not kept in process memory and no metadata is fetched."""
+    with patch("components.notion.container.shared_store", return_value=None):
+        resolver = NotionContentResolver(scheduler=OutboundScheduler(host_rate=0))
+    assert resolver.cache_store is None
+    resolver.exporter = MagicMock()
+    resolver.exporter.run.return_value = {"documents": [Document(content="Page content", meta={"title": "Page"})]}
+
+    url = "https://www.notion.so/12345678abcd1234abcd1234abcd1234"
+    resolver.run(urls=[url])
+    result = resolver.run(urls=[url])
+    assert result["streams"][0].data == b"Page content"
+    assert resolver.exporter.run.call_count == 2
+    resolver.exporter.notion_exporter.sync_notion.pages.retrieve.assert_not_called()
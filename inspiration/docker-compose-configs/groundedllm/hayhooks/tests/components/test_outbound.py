@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from components.outbound import HostThrottledError, OutboundScheduler, host_key, parse_host_limits, parse_retry_after
+
+
+class ConcurrencyProbe:
+    """Records the most requests in flight at the same time."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, scheduler: OutboundScheduler, url: str) -> None:
+        with scheduler.slot(url):
+            with self.lock:
+                self.current += 1
+                self.peak = max(self.peak, self.current)
+            time.sleep(self.delay)
+            with self.lock:
+                self.current -= 1
+
+
+def test_host_key_ignores_www_and_case():
+    """Test that URLs on the same site are scheduled under one host."""
+    assert host_key("https://WWW.Example.com/a?b=c") == host_key("http://example.com:8080/")
+    assert host_key("https://docs.example.com/") == "docs.example.com"
+
+
+def test_parse_retry_after():
+    """Test that Retry-After is parsed in seconds and as an HTTP date."""
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    in_a_minute = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 60))
+    assert 55 <= parse_retry_after(in_a_minute) <= 61
+
+
+def test_parse_host_limits():
+    """Test that per-host overrides are parsed and invalid ones skipped."""
+    limits = parse_host_limits("r.jina.ai=2:0.3, www.github.com=4,broken=x:y")
+    assert limits == {"r.jina.ai": (2, 0.3), "github.com": (4, limits["github.com"][1])}
+
+
+def test_per_host_concurrency_cap():
+    """Test that one host never has more requests in flight than its cap, while other hosts are not held up."""
+    scheduler = OutboundScheduler(host_concurrency=2, host_rate=0, max_connections=16)
+    same_host = ConcurrencyProbe()
+    other_hosts = ConcurrencyProbe()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [executor.submit(same_host, scheduler, f"https://example.com/{i}") for i in range(8)]
+        futures += [executor.submit(other_hosts, scheduler, f"https://site{i}.org/") for i in range(8)]
+        for future in futures:
+            future.result()
+    assert same_host.peak == 2
+    assert other_hosts.peak > 2
+
+
+def test_local_hosts_are_only_limited_by_the_global_budget():
+    """Test that local services are not paced like remote sites."""
+    scheduler = OutboundScheduler(host_concurrency=1, host_rate=1, host_burst=1, max_connections=4)
+    probe = ConcurrencyProbe(delay=0.02)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(probe, scheduler, "http://127.0.0.1:8080/search") for _ in range(8)]:
+            future.result()
+    assert probe.peak == 4
+
+
+def test_global_connection_budget():
+    """Test that requests to all hosts together stay within the global budget."""
+    scheduler = OutboundScheduler(host_concurrency=4, host_rate=0, max_connections=3)
+    probe = ConcurrencyProbe()
+    with ThreadPoolExecutor(max_workers=12) as executor:
+        for future in [executor.submit(probe, scheduler, f"https://site{i}.org/") for i in range(12)]:
+            future.result()
+    assert probe.peak == 3
+
+
+def test_token_bucket_paces_requests():
+    """Test that requests beyond the burst are spaced by the host's rate."""
+    scheduler = OutboundScheduler(host_concurrency=10, host_rate=20, host_burst=2)
+    started = time.monotonic()
+    for _ in range(6):
+        with scheduler.slot("https://example.com/"):
+            pass
+    # Two go out in the burst, the other four at 20 per second.
+    assert time.monotonic() - started >= 0.18
+
+
+def test_retry_after_blocks_the_host():
+    """Test that a 429 with Retry-After holds the host, and only that host."""
+    scheduler = OutboundScheduler(host_rate=0)
+    scheduler.report("https://example.com/a", 429, {"Retry-After": "0.2"})
+    assert scheduler.blocked_for("https://example.com/b") > 0
+    assert scheduler.blocked_for("https://other.org/") == 0
+
+    started = time.monotonic()
+    with scheduler.slot("https://example.com/b"):
+        pass
+    assert time.monotonic() - started >= 0.15
+
+
+def test_backoff_without_retry_after_grows():
+    """Test that repeated 429s without Retry-After back off exponentially, and a success does not lift the block."""
+    scheduler = OutboundScheduler(host_rate=0)
+    scheduler.report("https://example.com/", 429)
+    first = scheduler.blocked_for("https://example.com/")
+    scheduler.report("https://example.com/", 503)
+    second = scheduler.blocked_for("https://example.com/")
+    assert second > first * 1.5
+
+    # A request that was already in flight when the host started throttling.
+    scheduler.report("https://example.com/", 200)
+    assert scheduler.blocked_for("https://example.com/") > first
+
+
+def test_exhausted_rate_limit_header_blocks_until_reset():
+    """Test that X-RateLimit-Remaining: 0 holds the host until X-RateLimit-Reset."""
+    scheduler = OutboundScheduler(host_rate=0)
+    scheduler.report("https://api.github.com/repos", 403, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(time.time() + 30)})
+    assert 25 < scheduler.blocked_for("https://api.github.com/") <= 30
+
+
+def test_successful_response_with_exhausted_rate_limit_blocks_until_reset():
+    """Test that the last allowed call, a 200 with X-RateLimit-Remaining: 0, holds the host until reset."""
+    scheduler = OutboundScheduler(host_rate=0)
+    scheduler.report("https://api.github.com/repos", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 30)})
+    assert 25 < scheduler.blocked_for("https://api.github.com/") <= 30
+
+    # A reset that has already passed does not block.
+    scheduler = OutboundScheduler(host_rate=0)
+    scheduler.report("https://api.github.com/repos", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() - 5)})
+    assert scheduler.blocked_for("https://api.github.com/") == 0
+
+
+def test_wait_longer_than_max_wait_raises():
+    """Test that a request gives up instead of waiting past max_wait."""
+    scheduler = OutboundScheduler(host_rate=0, max_wait=0.1)
+    scheduler.report("https://example.com/", 429, {"Retry-After": "60"})
+    with pytest.raises(HostThrottledError):
+        with scheduler.slot("https://example.com/"):
+            pass
+    # The failed attempt does not leak its slot.
+    with scheduler.slot("https://other.org/"):
+        pass
+
+
+def test_async_slot():
+    """Test that async callers share the same per-host cap."""
+    scheduler = OutboundScheduler(host_concurrency=1, host_rate=0)
+    in_flight = []
+
+    async def request(i: int):
+        async with scheduler.aslot("https://example.com/"):
+            in_flight.append(i)
+            assert len(in_flight) == 1
+            await asyncio.sleep(0.01)
+            in_flight.remove(i)
+
+    async def main():
+        await asyncio.gather(*(request(i) for i in range(4)))
+
+    asyncio.run(main())
+
+
+def test_cancelled_async_slot_is_released():
+    """Test that a slot taken after its waiter was cancelled is given back."""
+    scheduler = OutboundScheduler(host_concurrency=1, host_rate=0)
+
+    async def main():
+        async with scheduler.aslot("https://example.com/"):
+            waiter = asyncio.create_task(scheduler.aslot("https://example.com/").__aenter__())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # Let the worker thread take the freed slot and the done-callback give it back.
+        await asyncio.sleep(0.1)
+        async with asyncio.timeout(1):
+            async with scheduler.aslot("https://example.com/", max_wait=0.5):
+                pass
+
+    asyncio.run(main())
+    assert scheduler._hosts["example.com"].in_flight == 0
+
+
+def test_fetcher_reports_responses_to_the_scheduler():
+    """Test that the Haystack fetcher's client reports each response without touching the client's hooks."""
+    from components.fetchers import HaystackLinkContentFetcher, ResponseReporter
+
+    scheduler = OutboundScheduler(host_rate=0)
+    fetcher = HaystackLinkContentFetcher(scheduler=scheduler, client_kwargs={"transport": httpx.MockTransport(lambda request: httpx.Response(429, headers={"Retry-After": "30"}))})
+
+    assert any(isinstance(hook, ResponseReporter) for hook in fetcher.primary_fetcher.client_kwargs["event_hooks"]["response"])
+    fetcher.primary_fetcher._client.get("https://example.com/page")
+    assert scheduler.blocked_for("https://example.com/") > 20
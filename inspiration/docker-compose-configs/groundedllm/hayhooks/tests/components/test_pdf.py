@@ -0,0 +1,102 @@
+from typing import List
+from unittest.mock import patch
+
+from haystack.dataclasses import ByteStream
+
+from components.pdf import LazyPyPDFToDocument
+from components.shared_state import MemoryStore
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """Build a PDF with one line of text on each page."""
+    page_ids = [3 + 2 * i for i in range(len(pages))]
+    font_id = 3 + 2 * len(pages)
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>",
+        font_id: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, text in zip(page_ids, pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects[page_id] = f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {page_id + 1} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        objects[page_id + 1] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+
+    pdf = b"%PDF-1.4\n"
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(pdf)
+        pdf += f"{object_id} 0 obj\n{objects[object_id]}\nendobj\n".encode("latin-1")
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    pdf += "".join(f"{offsets[i]:010d} 00000 n \n" for i in sorted(objects)).encode("latin-1")
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return pdf
+
+
+PAGES = [f"Page {i} of the paper" for i in range(1, 21)]
+
+
+def test_converts_every_page_without_limits():
+    """Test that pages are joined with form feeds like PyPDFToDocument."""
+    converter = LazyPyPDFToDocument(max_chars=0, max_pages=0, page_cache_ttl=0)
+    document = converter.run(sources=[ByteStream(data=make_pdf(PAGES[:3]), meta={"url": "https://arxiv.org/pdf/1"})])["documents"][0]
+
+    assert document.content.split("\f") == PAGES[:3]
+    assert document.meta["url"] == "https://arxiv.org/pdf/1"
+    assert document.meta["page_count"] == 3
+    assert document.meta["pages_converted"] == 3
+    assert document.meta["truncated"] is False
+
+
+def test_page_limit_stops_parsing():
+    """Test that pages past max_pages are never extracted."""
+    converter = LazyPyPDFToDocument(max_chars=0, max_pages=2, page_cache_ttl=0)
+    with patch.object(LazyPyPDFToDocument, "_extract_page", autospec=True, side_effect=lambda self, page: "text") as extract:
+        document = converter.run(sources=[ByteStream(data=make_pdf(PAGES))])["documents"][0]
+
+    assert extract.call_count == 2
+    assert document.meta["page_count"] == 20
+    assert document.meta["pages_converted"] == 2
+    assert document.meta["truncated"] is True
+
+
+def test_char_budget_truncates_within_a_page():
+    """Test that conversion stops once the character budget is used up."""
+    converter = LazyPyPDFToDocument(max_chars=30, page_cache_ttl=0)
+    document = converter.run(sources=[ByteStream(data=make_pdf(PAGES))])["documents"][0]
+
+    assert len(document.content) <= 30
+    assert document.content.startswith("Page 1 of the paper\fPage 2")
+    assert document.meta["pages_converted"] == 2
+    assert document.meta["truncated"] is True
+
+
+def test_cached_pages_skip_pypdf():
+    """Test that converting the same PDF again reads its pages from the cache."""
+    store = MemoryStore()
+    pdf = make_pdf(PAGES[:4])
+    converter = LazyPyPDFToDocument(max_chars=0, page_cache_store=store)
+    first = converter.run(sources=[ByteStream(data=pdf)])["documents"][0]
+
+    with patch("pypdf.PdfReader", side_effect=AssertionError("parsed again")):
+        second = converter.run(sources=[ByteStream(data=pdf)])["documents"][0]
+        assert list(converter.iter_pages(pdf)) == PAGES[:4]
+
+    assert second.content == first.content
+
+
+def test_invalid_pdf_is_skipped():
+    """Test that a source that is not a PDF is skipped rather than failing the batch."""
+    converter = LazyPyPDFToDocument(page_cache_ttl=0)
+    result = converter.run(sources=[ByteStream(data=b"not a pdf"), ByteStream(data=make_pdf(PAGES[:1]))])
+
+    assert [document.content for document in result["documents"]] == PAGES[:1]
+
+
+def test_pages_are_not_cached_without_a_shared_store():
+    """Test that without a shared store the pages are not kept in process memory."""
+    with patch("components.pdf.container.shared_store", return_value=None):
+        converter = LazyPyPDFToDocument()
+    assert converter.page_cache_store is None
+    document = converter.run(sources=[ByteStream(data=make_pdf(PAGES[:2]))])["documents"][0]
+    assert document.content.split("\f") == PAGES[:2]
@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import List
+
+from haystack import Document, component
+from haystack.dataclasses import ByteStream
+
+from components.content_extraction import URLContentRouter
+from components.prefetch import PageCache, PrefetchingWebSearch, prefetch_scope
+
+
+class SlowFetch:
+    """Counts fetches and takes a while to answer."""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.calls: List[str] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url: str) -> List[ByteStream]:
+        with self.lock:
+            self.calls.append(url)
+        time.sleep(self.delay)
+        return [ByteStream(data=f"page {url}".encode("utf-8"), meta={"url": url}, mime_type="text/plain")]
+
+
+class GenericResolver:
+    def __init__(self):
+        self.urls: List[str] = []
+
+    def can_handle(self, url: str) -> bool:
+        return True
+
+    def run(self, urls: List[str]):
+        self.urls.extend(urls)
+        return {"streams": [ByteStream(data=b"fetched", meta={"url": url}) for url in urls]}
+
+
+@component
+class FakeSearch:
+    @component.output_types(documents=List[Document], links=List[str])
+    def run(self, query: str, max_results: int = 5):
+        documents = [Document(content=f"{query} {i}", meta={"url": f"https://example.com/{i}"}, score=i / 10) for i in range(max_results)]
+        return {"documents": documents, "links": [doc.meta["url"] for doc in documents]}
+
+
+def test_in_flight_prefetch_is_shared():
+    """Test that a page being prefetched is fetched once and waited for by readers."""
+    cache = PageCache()
+    fetch = SlowFetch()
+    cache.prefetch("https://example.com/a", fetch)
+    cache.prefetch("https://example.com/a", fetch)
+    streams = cache.get("https://example.com/a")
+    assert streams[0].data == b"page https://example.com/a"
+    assert fetch.calls == ["https://example.com/a"]
+    assert cache.get("https://example.com/missing") is None
+
+
+def test_cancel_unneeded_prefetches():
+    """Test that queued prefetches an owner no longer needs are cancelled."""
+    cache = PageCache(max_workers=1)
+    fetch = SlowFetch(delay=0.2)
+    for name in ["a", "b", "c"]:
+        cache.prefetch(f"https://example.com/{name}", fetch, owner="run-1")
+
+    cancelled = cache.cancel("run-1", keep=["https://example.com/a", "https://example.com/b"])
+    assert cancelled == 1
+    assert cache.get("https://example.com/b") is not None
+    assert cache.get("https://example.com/c") is None
+    assert "https://example.com/c" not in fetch.calls
+
+
+def test_prefetching_web_search():
+    """Test that the wrapper keeps the search sockets and prefetches the top results."""
+    cache = PageCache()
+    fetch = SlowFetch(delay=0)
+    search = PrefetchingWebSearch(FakeSearch(), page_cache=cache, fetch=fetch, top_k=2)
+
+    assert set(search.__haystack_input__._sockets_dict) == {"query", "max_results"}
+    assert set(search.__haystack_output__._sockets_dict) == {"documents", "links"}
+
+    result = search.run(query="q", max_results=4)
+    assert len(result["documents"]) == 4
+    assert cache.get("https://example.com/3") is not None
+    assert cache.get("https://example.com/2") is not None
+    assert sorted(fetch.calls) == ["https://example.com/2", "https://example.com/3"]
+
+
+def test_router_uses_prefetched_pages():
+    """Test that the URL router only fetches the pages that were not prefetched."""
+    cache = PageCache()
+    cache.prefetch("https://example.com/a", SlowFetch(delay=0))
+    resolver = GenericResolver()
+    router = URLContentRouter(resolvers=[resolver], page_cache=cache)
+
+    streams = router.run(urls=["https://example.com/a", "https://example.com/b"])["streams"]
+    assert sorted(stream.data for stream in streams) == [b"fetched", b"page https://example.com/a"]
+    assert resolver.urls == ["https://example.com/b"]
+
+
+def test_router_only_cancels_its_own_run():
+    """Test that a run cancels its own unneeded prefetches but not those of another run on the same thread."""
+    cache = PageCache(max_workers=1)
+    blocker = SlowFetch(delay=0.2)
+    fetch = SlowFetch(delay=0)
+    search = PrefetchingWebSearch(FakeSearch(), page_cache=cache, fetch=fetch, top_k=2)
+    router = URLContentRouter(resolvers=[GenericResolver()], page_cache=cache)
+    cache.prefetch("https://example.com/blocker", blocker)
+
+    with prefetch_scope():
+        search.run(query="other", max_results=4)
+    with prefetch_scope():
+        search.run(query="q", max_results=2)
+        router.run(urls=["https://example.com/0"])
+
+    assert cache.get("https://example.com/3") is not None
+    assert cache.get("https://example.com/1") is None
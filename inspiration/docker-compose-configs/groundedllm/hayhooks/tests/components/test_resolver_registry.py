@@ -0,0 +1,113 @@
+"""Test the lazy, shared resolver registry."""
+
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from components import content_extraction
+from components.container import ComponentContainer
+from components.content_extraction import URLContentRouter, build_url_resolvers
+from components.resolver_registry import LazyResolver, ResolverRegistry
+
+
+class FakeResolver:
+    def __init__(self, prefix: str = "http://fake"):
+        self.prefix = prefix
+        self.warmed_up = 0
+
+    def warm_up(self):
+        self.warmed_up += 1
+
+    def can_handle(self, url: str) -> bool:
+        return url.startswith(self.prefix)
+
+    def run(self, urls):
+        return {"streams": urls}
+
+
+def test_lazy_resolver_constructs_on_first_use():
+    """The factory is not called until the resolver is used."""
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return FakeResolver()
+
+    lazy_resolver = LazyResolver("fake", factory)
+    assert not lazy_resolver.is_constructed()
+    assert calls == []
+
+    assert lazy_resolver.can_handle("http://fake/page")
+    assert lazy_resolver.run(["http://fake/page"]) == {"streams": ["http://fake/page"]}
+    assert calls == [1]
+
+
+def test_registry_shares_instances_by_config():
+    """The same name and config returns the same resolver, a different config a new one."""
+    registry = ResolverRegistry(background_warm_up=False)
+
+    first = registry.resolver("fake", FakeResolver, prefix="http://a")
+    second = registry.resolver("fake", FakeResolver, prefix="http://a")
+    other = registry.resolver("fake", FakeResolver, prefix="http://b")
+
+    assert first is second
+    assert first is not other
+    assert first.instance.prefix == "http://a"
+    assert other.instance.prefix == "http://b"
+
+
+def test_warm_up_runs_once():
+    """Warm-up constructs the resolver and calls its warm_up method only once."""
+    registry = ResolverRegistry(background_warm_up=False)
+    lazy_resolver = registry.resolver("fake", FakeResolver)
+
+    registry.warm_up()
+    registry.warm_up()
+
+    assert lazy_resolver.instance.warmed_up == 1
+
+
+def test_warm_up_in_background():
+    """Background warm-up warms every registered resolver."""
+    registry = ResolverRegistry(background_warm_up=True)
+    lazy_resolvers = [registry.resolver("fake", FakeResolver, prefix=f"http://{i}") for i in range(3)]
+
+    thread = registry.warm_up_in_background()
+    thread.join(timeout=5)
+
+    assert all(r.instance.warmed_up == 1 for r in lazy_resolvers)
+
+
+def test_warm_up_in_background_disabled():
+    """Nothing is started when background warm-up is disabled."""
+    registry = ResolverRegistry(background_warm_up=False)
+    registry.resolver("fake", FakeResolver)
+    assert registry.warm_up_in_background() is None
+
+
+def test_build_url_resolvers_are_shared():
+    """Two content extraction components with the same settings share their resolvers."""
+    local_container = ComponentContainer(resolvers=ResolverRegistry(background_warm_up=False))
+    factories = [name for name in vars(content_extraction) if name.startswith("_build_") and name.endswith("_resolver")]
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(content_extraction, "container", local_container))
+        for name in factories:
+            stack.enter_context(patch.object(content_extraction, name, lambda **config: FakeResolver()))
+        first = build_url_resolvers(raise_on_failure=False, timeout=3)
+        second = build_url_resolvers(raise_on_failure=False, timeout=3)
+        other = build_url_resolvers(raise_on_failure=False, timeout=5)
+
+    assert len(first) == len(second)
+    assert all(a is b for a, b in zip(first, second))
+    assert first[0] is not other[0]
+    assert all(isinstance(r.instance, FakeResolver) for r in first)
+    assert local_container.resolvers.resolvers() == list(dict.fromkeys(first + other))
+
+
+def test_router_with_lazy_resolvers():
+    """The URL router works with lazy resolvers and falls back to the last one."""
+    specific = LazyResolver("specific", lambda: FakeResolver("http://specific"))
+    generic = LazyResolver("generic", lambda: FakeResolver(""))
+    router = URLContentRouter(resolvers=[specific, generic])
+
+    assert router._find_resolver("http://specific/page") is specific
+    assert router._find_resolver("http://elsewhere/page") is generic
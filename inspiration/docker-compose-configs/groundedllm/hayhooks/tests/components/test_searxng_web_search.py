@@ -0,0 +1,173 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, List
+
+import httpx
+
+from components.web_search.searxng_web_search import SearXNGWebSearch
+
+PAGES: Dict[str, List[dict]] = {
+    "1": [
+        {"url": "https://example.com/a", "title": "A", "content": "Snippet A", "engine": "google", "engines": ["google"], "score": 4.0},
+        {"url": "https://www.example.com/b/", "title": "B", "content": "B", "engine": "bing", "engines": ["bing"], "score": 1.0},
+    ],
+    "2": [
+        {"url": "https://example.com/b", "title": "B again", "content": "A longer snippet for B", "engine": "duckduckgo", "engines": ["duckduckgo"], "score": 3.0},
+        {"url": "https://example.com/c", "title": "C", "content": "Snippet C", "engine": "google", "engines": ["google"], "score": 0.5},
+    ],
+    "3": [{"url": "https://example.com/d", "title": "D", "content": "Snippet D", "engine": "bing", "score": 0.2}],
+}
+
+
+class FakeSearXNG:
+    """Serves PAGES by pageno and records the requests."""
+
+    def __init__(self, delay: float = 0.0, failing_page: str = ""):
+        self.delay = delay
+        self.failing_page = failing_page
+        self.requests: List[dict] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        with self.lock:
+            self.requests.append(params)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if params.get("pageno") == self.failing_page:
+            return httpx.Response(502, content=b"bad gateway")
+        return httpx.Response(200, content=json.dumps({"results": PAGES.get(params.get("pageno", "1"), [])}))
+
+
+def make_search(server: FakeSearXNG) -> SearXNGWebSearch:
+    search = SearXNGWebSearch(base_url="http://searxng:8080", enabled=True)
+    search._client = httpx.Client(transport=httpx.MockTransport(server))
+    return search
+
+
+def test_few_results_fetch_one_page():
+    """Test that a search that fits on one page makes a single request without pageno."""
+    server = FakeSearXNG()
+    result = make_search(server).run(query="test", max_results=5)
+
+    assert len(server.requests) == 1
+    assert "pageno" not in server.requests[0]
+    assert [doc.meta["url"] for doc in result["documents"]] == ["https://example.com/a", "https://www.example.com/b/"]
+
+
+def test_pages_are_fetched_concurrently():
+    """Test that the pages of a wide search are requested at the same time."""
+    server = FakeSearXNG(delay=0.2)
+    started = time.monotonic()
+    make_search(server).run(query="test", max_results=25)
+
+    assert sorted(request["pageno"] for request in server.requests) == ["1", "2", "3"]
+    assert server.peak == 3
+    assert time.monotonic() - started < 0.5
+
+
+def test_pages_are_merged_by_score():
+    """Test that a URL found on several pages is kept once, with the best score, the longest snippet and every engine."""
+    result = make_search(FakeSearXNG()).run(query="test", max_results=10, pages=3)
+    documents = result["documents"]
+
+    assert [doc.meta["url"] for doc in documents] == ["https://example.com/a", "https://example.com/b", "https://example.com/c", "https://example.com/d"]
+    b = documents[1]
+    assert b.meta["score"] == 3.0
+    assert b.content == "A longer snippet for B"
+    assert b.meta["engines"] == ["bing", "duckduckgo"]
+    assert result["urls"] == [doc.meta["url"] for doc in documents]
+
+
+def test_failed_page_keeps_the_others():
+    """Test that a page that fails is logged and left out, and the pages that succeeded are still merged."""
+    result = make_search(FakeSearXNG(failing_page="2")).run(query="test", max_results=10, pages=3)
+
+    assert [doc.meta["url"] for doc in result["documents"]] == ["https://example.com/a", "https://www.example.com/b/", "https://example.com/d"]
+
+
+def test_explicit_pageno_fetches_only_that_page():
+    """Test that asking for a page number still fetches just that page."""
+    server = FakeSearXNG()
+    result = make_search(server).run(query="test", max_results=25, pageno=3)
+
+    assert [request["pageno"] for request in server.requests] == ["3"]
+    assert [doc.meta["url"] for doc in result["documents"]] == ["https://example.com/d"]
+
+
+def test_run_async_fetches_pages_concurrently():
+    """Test that the async search gathers its pages over one pooled client."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, content=json.dumps({"results": PAGES[request.url.params["pageno"]]}))
+
+    async def main():
+        search = SearXNGWebSearch(base_url="http://searxng:8080", enabled=True)
+        search._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        search._async_client_loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        result = await search.run_async(query="test", max_results=10, pages=3)
+        return result, time.monotonic() - started
+
+    result, elapsed = asyncio.run(main())
+    assert len(result["documents"]) == 4
+    assert elapsed < 0.25
+
+
+def test_run_async_keeps_pages_that_succeeded():
+    """Test that the async search merges the pages that succeeded when another page fails."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["pageno"] == "3":
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, content=json.dumps({"results": PAGES[request.url.params["pageno"]]}))
+
+    async def main():
+        search = SearXNGWebSearch(base_url="http://searxng:8080", enabled=True)
+        search._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        search._async_client_loop = asyncio.get_running_loop()
+        return await search.run_async(query="test", max_results=10, pages=3)
+
+    result = asyncio.run(main())
+    assert [doc.meta["url"] for doc in result["documents"]] == ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+
+
+def test_run_async_closes_the_client_of_a_previous_loop():
+    """Test that a search on a new event loop closes the client opened on the previous one."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps({"results": PAGES["1"]}))
+
+    search = SearXNGWebSearch(base_url="http://searxng:8080", enabled=True)
+
+    async def first():
+        search._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        search._async_client_loop = asyncio.get_running_loop()
+        await search.run_async(query="test", max_results=5)
+        return search._async_client
+
+    previous = asyncio.run(first())
+    asyncio.run(search._get_async_client())
+
+    assert previous.is_closed
+    assert search._async_client is not previous
+    assert not search._async_client.is_closed
+
+
+def test_close_closes_the_sync_client():
+    """Test that close releases the pooled sync client."""
+    server = FakeSearXNG()
+    search = make_search(server)
+    client = search._client
+    search.close()
+
+    assert client.is_closed
+    assert search._client is None
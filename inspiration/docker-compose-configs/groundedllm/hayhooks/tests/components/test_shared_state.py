@@ -0,0 +1,86 @@
+"""Test the state shared between hayhooks workers."""
+
+import multiprocessing
+import time
+
+import pytest
+
+from components.shared_state import MemoryStore, SQLiteStore, create_shared_store
+from components.single_flight import SingleFlight
+from components.stackoverflow import MAX_REQUESTS_PER_WINDOW, StackOverflowBase
+
+
+def _incr_many(db_file: str, count: int) -> None:
+    store = SQLiteStore(db_file)
+    for _ in range(count):
+        store.incr("counter", ttl=60)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / "state.db"))
+
+
+def test_get_set_delete(store):
+    """Values round-trip as JSON and can be deleted."""
+    assert store.get("missing") is None
+    store.set("key", {"a": [1, 2]})
+    assert store.get("key") == {"a": [1, 2]}
+    store.delete("key")
+    assert store.get("key") is None
+
+
+def test_ttl(store):
+    """Values expire after their TTL."""
+    store.set("key", "value", ttl=0.1)
+    assert store.get("key") == "value"
+    time.sleep(0.15)
+    assert store.get("key") is None
+
+
+def test_hit_enforces_limit(store):
+    """A fixed-window rate limit allows `limit` hits per window."""
+    results = [store.hit("bucket", limit=3, window=60) for _ in range(5)]
+    assert results == [True, True, True, False, False]
+
+
+def test_sqlite_counter_is_shared_between_processes(tmp_path):
+    """Several processes incrementing one SQLite counter never lose an update."""
+    db_file = str(tmp_path / "state.db")
+    SQLiteStore(db_file)
+
+    with multiprocessing.get_context("spawn").Pool(3) as pool:
+        pool.starmap(_incr_many, [(db_file, 20)] * 3)
+
+    assert SQLiteStore(db_file).get("counter") == 60
+
+
+def test_create_shared_store(tmp_path):
+    """The URL scheme picks the backend."""
+    assert create_shared_store(None) is None
+    assert isinstance(create_shared_store(f"sqlite:///{tmp_path / 'state.db'}"), SQLiteStore)
+    with pytest.raises(ValueError):
+        create_shared_store("memcached://localhost")
+
+
+def test_stackoverflow_rate_limit_is_shared():
+    """Stack Overflow components sharing a store share one rate limit."""
+    store = MemoryStore()
+    first = StackOverflowBase(rate_limit_store=store)
+    second = StackOverflowBase(rate_limit_store=store)
+
+    allowed = [first._check_rate_limit() for _ in range(MAX_REQUESTS_PER_WINDOW)]
+    assert all(allowed)
+    assert not second._check_rate_limit()
+
+
+def test_single_flight_results_are_shared():
+    """Results cached by one single-flight group are served to another using the same store."""
+    store = MemoryStore()
+    first = SingleFlight(result_ttl=60, store=store)
+    second = SingleFlight(result_ttl=60, store=store)
+
+    assert first.do("key", lambda: "answer") == "answer"
+    assert second.do("key", lambda: "recomputed") == "answer"
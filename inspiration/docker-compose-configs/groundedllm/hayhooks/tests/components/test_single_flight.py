@@ -0,0 +1,126 @@
+"""Test single-flight request coalescing."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from components.single_flight import SingleFlight, single_flight
+
+
+def test_concurrent_identical_calls_run_once():
+    """Identical calls that overlap share one execution."""
+    group = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "answer"
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        first = executor.submit(group.do, "key", work)
+        started.wait()
+        others = [executor.submit(group.do, "key", work) for _ in range(4)]
+        results = [first.result()] + [f.result() for f in others]
+
+    assert results == ["answer"] * 5
+    assert len(calls) == 1
+
+
+def test_different_keys_run_separately():
+    """Calls with different keys are not coalesced."""
+    group = SingleFlight()
+    assert group.do("a", lambda: 1) == 1
+    assert group.do("b", lambda: 2) == 2
+
+
+def test_exception_is_shared_and_not_cached():
+    """Waiters see the leader's exception, and a failed result is not cached."""
+    group = SingleFlight(result_ttl=60)
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(group.do, "key", fail)
+        started.wait()
+        second = executor.submit(group.do, "key", fail)
+        with pytest.raises(RuntimeError):
+            first.result()
+        with pytest.raises(RuntimeError):
+            second.result()
+
+    assert group.do("key", lambda: "recovered") == "recovered"
+
+
+def test_result_ttl():
+    """Completed results are served until the TTL expires."""
+    group = SingleFlight(result_ttl=0.1)
+    calls = []
+
+    def work():
+        calls.append(1)
+        return len(calls)
+
+    assert group.do("key", work) == 1
+    assert group.do("key", work) == 1
+    time.sleep(0.15)
+    assert group.do("key", work) == 2
+
+
+def test_result_cache_is_bounded():
+    """The result cache never grows past max_cached_results."""
+    group = SingleFlight(result_ttl=60, max_cached_results=3)
+    for i in range(10):
+        group.do(str(i), lambda: i)
+    assert len(group._results) == 3
+
+
+def test_decorator_preserves_signature_and_coalesces():
+    """The decorator keeps the run_api signature and docstring that hayhooks introspects."""
+    import inspect
+
+    class Wrapper:
+        def __init__(self):
+            self.runs = 0
+
+        @single_flight(result_ttl=60)
+        def run_api(self, question: str, max_results: int = 5) -> str:
+            """Answer a question."""
+            self.runs += 1
+            return f"{question}:{max_results}"
+
+    wrapper = Wrapper()
+    assert list(inspect.signature(Wrapper.run_api).parameters) == ["self", "question", "max_results"]
+    assert inspect.getdoc(wrapper.run_api) == "Answer a question."
+
+    assert wrapper.run_api("q") == "q:5"
+    assert wrapper.run_api("q") == "q:5"
+    assert wrapper.run_api("q", max_results=3) == "q:3"
+    assert wrapper.runs == 2
+
+
+def test_decorator_runs_bypass_cache_calls_fresh():
+    """A call with bypass_cache=True skips the cached result."""
+
+    class Wrapper:
+        def __init__(self):
+            self.runs = 0
+
+        @single_flight(result_ttl=60)
+        def run_api(self, question: str, bypass_cache: bool = False) -> str:
+            self.runs += 1
+            return f"{question}:{self.runs}"
+
+    wrapper = Wrapper()
+    assert wrapper.run_api("q") == "q:1"
+    assert wrapper.run_api("q") == "q:1"
+    assert wrapper.run_api("q", bypass_cache=True) == "q:2"
+    assert wrapper.runs == 2
@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from haystack import Document
+
+from components.shared_state import MemoryStore
+from components.stack_trace import error_query, frame_signature, stack_trace_fingerprint
+from components.stackoverflow import StackOverflowStackTraceAnalyzer
+
+PYTHON_TRACE = """Traceback (most recent call last):
+  File "/tmp/tmpa1b2c3/app/main.py", line 42, in handler
+    result = process(item)
+  File "/home/alice/venv/lib/python3.12/site-packages/lib/core.py", line 118, in process
+    return table[key]
+KeyError: 'user-7f3e2a10-1c2d-4e5f-8a9b-0c1d2e3f4a5b'
+"""
+
+JAVA_TRACE = """java.lang.NullPointerException: Cannot invoke "Object.toString()" because "value" is null at 2025-01-02T03:04:05Z
+\tat com.example.Service.render(Service.java:87)
+\tat com.example.Service$$Lambda$412/0x0000000800c0b440.apply(Unknown Source)
+\tat com.example.Controller.handle(Controller.java:31)
+"""
+
+
+def test_fingerprint_ignores_volatile_tokens():
+    """Test that line numbers, paths, addresses, UUIDs and timestamps do not change the fingerprint."""
+    other_python = PYTHON_TRACE.replace("line 42", "line 45").replace("/tmp/tmpa1b2c3", "/tmp/tmpzz9").replace("7f3e2a10", "00000000")
+    assert stack_trace_fingerprint(PYTHON_TRACE, "python") == stack_trace_fingerprint(other_python, "Python")
+
+    other_java = JAVA_TRACE.replace("87", "90").replace("412/0x0000000800c0b440", "97/0x0000000801000000").replace("03:04:05", "11:12:13")
+    assert stack_trace_fingerprint(JAVA_TRACE, "java") == stack_trace_fingerprint(other_java, "java")
+
+
+def test_fingerprint_distinguishes_errors():
+    """Test that a different exception, frame or language changes the fingerprint."""
+    assert stack_trace_fingerprint(PYTHON_TRACE, "python") != stack_trace_fingerprint(PYTHON_TRACE.replace("KeyError", "IndexError"), "python")
+    assert stack_trace_fingerprint(PYTHON_TRACE, "python") != stack_trace_fingerprint(PYTHON_TRACE.replace("in handler", "in worker"), "python")
+    assert stack_trace_fingerprint(JAVA_TRACE, "java") != stack_trace_fingerprint(JAVA_TRACE, "kotlin")
+
+
+def test_frame_signature_and_query():
+    """Test that frames lose their line numbers and the query is the error line without volatile tokens."""
+    assert frame_signature(PYTHON_TRACE) == ["main.py:handler", "core.py:process"]
+    assert frame_signature(JAVA_TRACE)[0] == "com.example.Service.render"
+    assert error_query(PYTHON_TRACE) == "KeyError: 'user- '"
+    assert error_query("error:0308010C:digital envelope routines::unsupported") == "error:0308010C:digital envelope routines::unsupported"
+
+
+def test_analyzer_serves_cached_results():
+    """Test that the analyzer answers a recurring error from the cache by fingerprint."""
+    store = MemoryStore()
+    analyzer = StackOverflowStackTraceAnalyzer(cache_store=store, cache_ttl=60)
+    key = f"stackoverflow:trace:{stack_trace_fingerprint(PYTHON_TRACE, 'python')}:False:10"
+    store.set(key, [Document(content="cached answer", meta={"title": "KeyError"}).to_dict()])
+
+    recurring = PYTHON_TRACE.replace("line 118", "line 120")
+    result = analyzer.run(stack_trace=recurring, language="python", limit=10)
+    assert [doc.content for doc in result["documents"]] == ["cached answer"]
+    assert result["documents"][0].meta["title"] == "KeyError"
+
+
+class BrokenStore(MemoryStore):
+    def get(self, key):
+        raise ConnectionError("store is down")
+
+    def set(self, key, value, ttl=None):
+        raise ConnectionError("store is down")
+
+
+def test_analyzer_works_when_the_cache_is_down():
+    """Test that a failing cache store falls back to searching instead of failing the analysis."""
+    analyzer = StackOverflowStackTraceAnalyzer(cache_store=BrokenStore(), cache_ttl=60)
+    fresh = [Document(content="fresh answer")]
+    with (
+        patch.object(analyzer, "_check_rate_limit", return_value=True),
+        patch.object(analyzer, "_get", return_value={"items": []}),
+        patch.object(analyzer, "_process_search_results", return_value=[]),
+        patch.object(analyzer, "_create_documents_from_results", return_value=fresh),
+    ):
+        result = analyzer.run(stack_trace=PYTHON_TRACE, language="python", limit=10)
+    assert result["documents"] == fresh
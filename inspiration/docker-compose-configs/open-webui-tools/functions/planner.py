@@ -11,11 +11,17 @@ import re
 import logging
 import json
 import asyncio
+import collections
+import hashlib
+import os
+import shutil
+import time
 from fastapi import Request
 from typing import List, Dict, Optional, Callable, Awaitable, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 from open_webui.constants import TASKS
+from open_webui.config import CACHE_DIR
 
 from open_webui.utils.chat import generate_chat_completion  # type: ignore
 from open_webui.utils.tools import get_tools  # type: ignore
@@ -111,7 +117,7 @@ class Action(BaseModel):
     dependencies: List[str] = Field(default_factory=list)
     tool_ids: Optional[list[str]] = None
     output: Optional[Dict[str, str]] = None
-    status: str = "pending"  # pending, in_progress, completed, failed, warning
+    status: str = "pending"  # pending, in_progress, completed, failed, warning, skipped, aborted
     start_time: Optional[str] = None
     end_time: Optional[str] = None
     model: Optional[str] = None
@@ -156,6 +162,170 @@ class ReflectionResult(BaseModel):
     )
 
 
+class ActionGraph:
+    """Index of a plan's actions by id, with the ancestors of every action precomputed."""
+
+    def __init__(self, plan: Plan):
+        self.plan = plan
+        self.by_id: dict[str, Action] = {action.id: action for action in plan.actions}
+        self.ancestors: dict[str, list[str]] = {
+            action.id: self._walk(action) for action in plan.actions
+        }
+
+    def _walk(self, action: Action) -> list[str]:
+        """Return the ancestors of an action nearest first, so direct dependencies lead."""
+        ancestors: list[str] = []
+        seen = {action.id}
+        queue = collections.deque(action.dependencies)
+        while queue:
+            action_id = queue.popleft()
+            if action_id in seen or action_id not in self.by_id:
+                continue
+            seen.add(action_id)
+            ancestors.append(action_id)
+            queue.extend(self.by_id[action_id].dependencies)
+        return ancestors
+
+
+class PlanStore:
+    """Checkpoints plans and memoizes action results as JSON files on disk.
+
+    Plans are saved after every finished action under a key derived from the user and
+    the goal, so submitting the same goal again after a failure or an abort resumes the
+    saved plan instead of planning from scratch. Action results are stored next to the
+    plan they belong to and keyed by a hash of everything that shapes them (see
+    `action_key`), so a resumed run reuses the actions that were already computed. A
+    plan's results are deleted with it once it completes, so running the same goal
+    again afterwards (e.g. regenerating the answer) computes every action anew.
+    """
+
+    def __init__(self, directory: str):
+        self.plans_dir = os.path.join(directory, "plans")
+        self.results_dir = os.path.join(directory, "results")
+        os.makedirs(self.plans_dir, exist_ok=True)
+        os.makedirs(self.results_dir, exist_ok=True)
+
+    @staticmethod
+    def _hash(data: Any) -> str:
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: str) -> str | None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def plan_key(self, user_id: str, goal: str) -> str:
+        return self._hash({"user": user_id, "goal": goal})
+
+    def action_key(
+        self,
+        user_id: str,
+        goal: str,
+        action: Action,
+        ancestors: dict[str, Any],
+        model: str,
+    ) -> str:
+        """Hash everything that goes into the prompt of an action.
+
+        That is the user and the goal, the description, parameters, tools and model of the
+        action, and the outputs of all its ancestors, since any of them may be packed into
+        its context.
+        """
+        return self._hash(
+            {
+                "user": user_id,
+                "goal": goal,
+                "description": action.description,
+                "params": action.params,
+                "ancestors": ancestors,
+                "model": model,
+                "tools": sorted(action.tool_ids or []),
+                "lightweight": action.use_lightweight_context,
+            }
+        )
+
+    def load_plan(self, key: str) -> Plan | None:
+        content = self._read(os.path.join(self.plans_dir, f"{key}.json"))
+        if content is None:
+            return None
+        try:
+            return Plan.model_validate_json(content)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable plan checkpoint {key}: {e}")
+            return None
+
+    def save_plan(self, key: str, plan: Plan) -> None:
+        self._write(os.path.join(self.plans_dir, f"{key}.json"), plan.model_dump_json())
+
+    def delete_plan(self, key: str) -> None:
+        """Delete a saved plan together with the results of its actions."""
+        try:
+            os.remove(os.path.join(self.plans_dir, f"{key}.json"))
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(os.path.join(self.results_dir, key), ignore_errors=True)
+
+    def get_result(self, plan_key: str, key: str) -> dict[str, Any] | None:
+        content = self._read(os.path.join(self.results_dir, plan_key, f"{key}.json"))
+        if content is None:
+            return None
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return None
+
+    def put_result(self, plan_key: str, key: str, action: Action) -> None:
+        directory = os.path.join(self.results_dir, plan_key)
+        os.makedirs(directory, exist_ok=True)
+        self._write(
+            os.path.join(directory, f"{key}.json"),
+            json.dumps(
+                {
+                    "output": action.output,
+                    "status": action.status,
+                    "tool_calls": action.tool_calls,
+                    "tool_results": action.tool_results,
+                }
+            ),
+        )
+
+    def prune(self, max_age_seconds: float) -> None:
+        """Remove checkpoints and results that have not been written for max_age_seconds."""
+        cutoff = time.time() - max_age_seconds
+        for entry in os.scandir(self.plans_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        for plan_dir in os.scandir(self.results_dir):
+            if not plan_dir.is_dir():
+                continue
+            for entry in os.scandir(plan_dir.path):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+            try:
+                os.rmdir(plan_dir.path)
+            except OSError:
+                # Still holds recent results.
+                pass
+
+
 class Pipe:
     __current_event_emitter__: Callable[[dict[str, Any]], Awaitable[None]]
     __user__: User
@@ -380,6 +550,18 @@ Remember: Metadata = what's available. @action_id = how to get the real content.
             default=True,
             description="Enable automatic lightweight context optimization for appropriate actions",
         )
+        CONTEXT_TOKEN_BUDGET: int = Field(
+            default=16000,
+            description="Approximate number of tokens of previous action outputs given to an action. Direct dependencies are packed first, then further ancestors, and outputs that do not fit are shortened",
+        )
+        MODEL_CONTEXT_TOKEN_BUDGETS: str = Field(
+            default="",
+            description="Per-model overrides of CONTEXT_TOKEN_BUDGET as model_id=tokens pairs separated by commas",
+        )
+        SUMMARIZE_PACKED_CONTEXT: bool = Field(
+            default=False,
+            description="Shorten outputs that do not fit the context budget with an LLM summary instead of truncating them. Summaries are cached per output",
+        )
         ENABLE_TOOL_RESULT_TRUNCATION: bool = Field(
             default=True,
             description="Enable truncation of tool results when substitutions are used in lightweight context mode",
@@ -395,6 +577,22 @@ Remember: Metadata = what's available. @action_id = how to get the real content.
             default=1,
             description="Maximum concurrent actions (experimental try on your own risk)",
         )
+        ENABLE_PLAN_CHECKPOINTS: bool = Field(
+            default=False,
+            description="Save the plan and every action result to disk, so submitting the same goal again after a failure or abort resumes the plan and reuses already computed actions. Saved results are deleted once the plan completes",
+        )
+        PLAN_CHECKPOINT_TTL_HOURS: float = Field(
+            default=72,
+            description="Hours to keep saved plans and action results before they are deleted",
+        )
+        VALIDATION_CONCURRENCY: int = Field(
+            default=4,
+            description="Maximum number of LLM calls made at once while validating a new plan (tool selection, lightweight context analysis, requirement enhancement)",
+        )
+        STATE_RENDER_FPS: float = Field(
+            default=2.0,
+            description="Maximum number of plan state updates (diagram, summaries and template preview) sent to the chat per second. Updates in between are merged into the next one. 0 sends every update",
+        )
         USER_RESPONSE_TIMEOUT: int = Field(
             default=120,
             description="Timeout for user response to prompts (seconds). If user doesn't respond within this time, plan will abort for safety.",
@@ -428,6 +626,25 @@ Remember: Metadata = what's available. @action_id = how to get the real content.
         self.type = "manifold"
         self.valves = self.Valves()
         self.current_output = ""
+        self.plan_store: PlanStore | None = None
+        self.plan_key: str | None = None
+        # Rendered mermaid lines per action, keyed by what they are rendered from.
+        self._mermaid_nodes: dict[str, tuple[tuple[str, str], str, str | None]] = {}
+        self._mermaid_edges: tuple[tuple[Any, ...], list[str]] | None = None
+        self._template_preview: tuple[tuple[Any, ...], str] | None = None
+        self._pending_state: tuple[Plan, list[str]] | None = None
+        self._state_flush_task: asyncio.Task[None] | None = None
+        self._last_state_content = ""
+        self._last_state_emit = 0.0
+        # Validated actions of recent plans, keyed by the hash of the plan before validation.
+        self._validation_cache: collections.OrderedDict[str, dict[str, Any]] = (
+            collections.OrderedDict()
+        )
+        self._action_graph: ActionGraph | None = None
+        # Shortened action outputs, keyed by the hash of the output and the length limit.
+        self._packed_outputs: collections.OrderedDict[str, dict[str, str]] = (
+            collections.OrderedDict()
+        )
 
     def pipes(self) -> list[dict[str, str]]:
         return [{"id": f"{name}-pipe", "name": f"{name} Pipe"}]
@@ -847,6 +1064,8 @@ Remember: Metadata = what's available. @action_id = how to get the real content.
             "completed": "✅",
             "failed": "❌",
             "warning": "⚠️",
+            "skipped": "⏭️",
+            "aborted": "⛔",
         }
 
         def sanitize_action_id(id_str: str) -> str:
@@ -855,30 +1074,42 @@ Remember: Metadata = what's available. @action_id = how to get the real content.
 
         styles: list[str] = []
         for action in plan.actions:
-            action_id = sanitize_action_id(action.id)
-            mermaid.append(
-                f'    {action_id}["{status_emoji[action.status]} {action.description[:40]}..."]'
-            )
-
-            if action.status == "in_progress":
-                styles.append(f"style {action_id} fill:#fff4cc")
-            elif action.status == "completed":
-                styles.append(f"style {action_id} fill:#e6ffe6")
-            elif action.status == "warning":
-                styles.append(f"style {action_id} fill:#fffbe6")
-            elif action.status == "failed":
-                styles.append(f"style {action_id} fill:#ffe6e6")
-
-        entry_actions = [action for action in plan.actions if not action.dependencies]
-        for action in entry_actions:
-            action_id = sanitize_action_id(action.id)
-            mermaid.append(f"    Start --> {action_id}")
-
-        for action in plan.actions:
-            action_id = sanitize_action_id(action.id)
-            for dep in action.dependencies:
-                mermaid.append(f"    {sanitize_action_id(dep)} --> {action_id}")
-
+            # Only actions whose status or description changed are rendered again.
+            node_key = (action.status, action.description)
+            cached = self._mermaid_nodes.get(action.id)
+            if cached is None or cached[0] != node_key:
+                action_id = sanitize_action_id(action.id)
+                node = f'    {action_id}["{status_emoji[action.status]} {action.description[:40]}..."]'
+                style = None
+                if action.status == "in_progress":
+                    style = f"style {action_id} fill:#fff4cc"
+                elif action.status == "completed":
+                    style = f"style {action_id} fill:#e6ffe6"
+                elif action.status == "warning":
+                    style = f"style {action_id} fill:#fffbe6"
+                elif action.status == "failed":
+                    style = f"style {action_id} fill:#ffe6e6"
+                cached = (node_key, node, style)
+                self._mermaid_nodes[action.id] = cached
+            mermaid.append(cached[1])
+            if cached[2]:
+                styles.append(cached[2])
+
+        edges_key = tuple((action.id, tuple(action.dependencies)) for action in plan.actions)
+        if self._mermaid_edges is None or self._mermaid_edges[0] != edges_key:
+            edges: list[str] = []
+            entry_actions = [action for action in plan.actions if not action.dependencies]
+            for action in entry_actions:
+                action_id = sanitize_action_id(action.id)
+                edges.append(f"    Start --> {action_id}")
+
+            for action in plan.actions:
+                action_id = sanitize_action_id(action.id)
+                for dep in action.dependencies:
+                    edges.append(f"    {sanitize_action_id(dep)} --> {action_id}")
+            self._mermaid_edges = (edges_key, edges)
+
+        mermaid.extend(self._mermaid_edges[1])
         mermaid.extend(styles)
 
         return "\n".join(mermaid)
@@ -1210,38 +1441,7 @@ Now, create a plan for the following goal.
                         ]
                         raise ValueError(msg)
 
-                try:
-                    await self.validate_and_fix_tool_actions(plan)
-                except Exception as validation_error:
-                    await self.emit_status(
-                        "warning",
-                        f"Tool validation failed but continuing with plan: {str(validation_error)}",
-                        False,
-                    )
-                    logger.warning(f"Tool validation error: {validation_error}")
-
-                try:
-                    await self.validate_and_enhance_template(plan)
-                except Exception as template_error:
-                    await self.emit_status(
-                        "warning",
-                        f"Template validation failed but continuing with plan: {str(template_error)}",
-                        False,
-                    )
-                    logger.warning(f"Template validation error: {template_error}")
-
-                try:
-                    if self.valves.ENABLE_LIGHTWEIGHT_CONTEXT_OPTIMIZATION:
-                        await self.validate_and_flag_lightweight_context(plan)
-                except Exception as lightweight_error:
-                    await self.emit_status(
-                        "warning",
-                        f"Lightweight context validation failed but continuing with plan: {str(lightweight_error)}",
-                        False,
-                    )
-                    logger.warning(
-                        f"Lightweight context validation error: {lightweight_error}"
-                    )
+                await self.validate_plan(plan)
 
                 logger.debug(f"Plan: {plan.model_dump_json()}")
                 return plan
@@ -1258,6 +1458,110 @@ Now, create a plan for the following goal.
             f"Failed to create plan after {self.valves.MAX_RETRIES} attempts"
         )
 
+    async def validate_plan(self, plan: Plan):
+        """Run the validation passes on a new plan, concurrently where they are independent.
+
+        Template enhancement only reads action ids and descriptions, so it runs alongside the
+        tool pass, which the lightweight context pass and the requirement prefetch depend on.
+        The validated actions are cached by the hash of the plan, so an identical plan is not
+        validated again.
+        """
+        try:
+            tools = sorted(tool.id for tool in Tools.get_tools())
+        except Exception as e:
+            logger.warning(f"Could not list tools for the validation cache: {e}")
+            tools = []
+        plan_hash = hashlib.sha256(
+            json.dumps(
+                {
+                    "plan": plan.model_dump(mode="json"),
+                    "tools": tools,
+                    "lightweight": self.valves.ENABLE_LIGHTWEIGHT_CONTEXT_OPTIMIZATION,
+                    "requirements": self.valves.AUTOMATIC_TAKS_REQUIREMENT_ENHANCEMENT,
+                },
+                sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()
+
+        cached = self._validation_cache.get(plan_hash)
+        if cached is not None:
+            self._validation_cache.move_to_end(plan_hash)
+            plan.actions = [Action.model_validate(a) for a in cached["actions"]]
+            plan.metadata.update(cached["metadata"])
+            await self.emit_status(
+                "info", "Plan unchanged since it was last validated.", False
+            )
+            return
+
+        async def tools_then_lightweight():
+            try:
+                await self.validate_and_fix_tool_actions(plan)
+            except Exception as validation_error:
+                await self.emit_status(
+                    "warning",
+                    f"Tool validation failed but continuing with plan: {str(validation_error)}",
+                    False,
+                )
+                logger.warning(f"Tool validation error: {validation_error}")
+
+            try:
+                if self.valves.ENABLE_LIGHTWEIGHT_CONTEXT_OPTIMIZATION:
+                    await self.validate_and_flag_lightweight_context(plan)
+            except Exception as lightweight_error:
+                await self.emit_status(
+                    "warning",
+                    f"Lightweight context validation failed but continuing with plan: {str(lightweight_error)}",
+                    False,
+                )
+                logger.warning(
+                    f"Lightweight context validation error: {lightweight_error}"
+                )
+
+            if self.valves.AUTOMATIC_TAKS_REQUIREMENT_ENHANCEMENT:
+                # Warm the requirements cache so the first actions start without an extra call.
+                await self.map_limited(
+                    [a for a in plan.actions if a.id != "final_synthesis"],
+                    lambda action: self.enhance_requirements(plan, action),
+                )
+
+        async def template():
+            try:
+                await self.validate_and_enhance_template(plan)
+            except Exception as template_error:
+                await self.emit_status(
+                    "warning",
+                    f"Template validation failed but continuing with plan: {str(template_error)}",
+                    False,
+                )
+                logger.warning(f"Template validation error: {template_error}")
+
+        await asyncio.gather(tools_then_lightweight(), template())
+
+        self._validation_cache[plan_hash] = {
+            "actions": [a.model_dump(mode="json") for a in plan.actions],
+            "metadata": {"requirements": dict(plan.metadata.get("requirements", {}))},
+        }
+        while len(self._validation_cache) > 32:
+            self._validation_cache.popitem(last=False)
+
+    async def map_limited(
+        self, items: list[Any], fn: Callable[[Any], Awaitable[Any]]
+    ) -> list[Any]:
+        """Await fn for every item, at most VALIDATION_CONCURRENCY at a time.
+
+        Results come back in the order of items, with exceptions in place of results for
+        the calls that failed, so callers can apply them deterministically.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.valves.VALIDATION_CONCURRENCY))
+
+        async def run(item: Any) -> Any:
+            async with semaphore:
+                return await fn(item)
+
+        return await asyncio.gather(
+            *(run(item) for item in items), return_exceptions=True
+        )
+
     async def enhance_requirements(self, plan: Plan, action: Action):
         dependencies_str = (
             json.dumps(action.dependencies) if action.dependencies else "None"
@@ -1281,12 +1585,20 @@ Instructions:
 
 Return ONLY a numbered list of requirements. Do not include explanations or extra text.
 """
+        # Requirements are kept in the plan, so they survive checkpoints and are computed
+        # once per distinct prompt even when they were prefetched by validate_plan.
+        cache = plan.metadata.setdefault("requirements", {})
+        cache_key = hashlib.sha256(requirements_prompt.encode("utf-8")).hexdigest()
+        if cache_key in cache:
+            return cache[cache_key]
+
         enhanced_requirements = await self.get_completion(
             prompt=requirements_prompt,
             temperature=self.valves.ACTION_TEMPERATURE,
             action_results={},
             action=None,
         )
+        cache[cache_key] = enhanced_requirements
         return enhanced_requirements
 
     async def validate_and_fix_tool_actions(self, plan: Plan):
@@ -1322,7 +1634,7 @@ Return ONLY a numbered list of requirements. Do not include explanations or extr
             False,
         )
 
-        for action in actions_needing_tools:
+        async def select_tools(action: Action) -> list[str]:
             await self.emit_status(
                 "info", f"Identifying tools for action: {action.id}", False
             )
@@ -1358,30 +1670,37 @@ Return a JSON array of tool_ids, for example: ["tool_id_1", "tool_id_2"]
 If no suitable tools are found, return an empty array: []
 """
 
-            try:
-                tool_format: dict[str, Any] = {
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "tool_selection",
-                        "strict": True,
-                        "schema": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                        },
+            tool_format: dict[str, Any] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "tool_selection",
+                    "strict": True,
+                    "schema": {
+                        "type": "array",
+                        "items": {"type": "string"},
                     },
-                }
+                },
+            }
 
-                result = await self.get_completion(
-                    prompt=tool_selection_prompt,
-                    temperature=self.valves.ACTION_TEMPERATURE,
-                    model="",
-                    format=tool_format,
-                    action_results={},
-                    action=None,
-                )
+            result = await self.get_completion(
+                prompt=tool_selection_prompt,
+                temperature=self.valves.ACTION_TEMPERATURE,
+                model="",
+                format=tool_format,
+                action_results={},
+                action=None,
+            )
 
-                clean_result = clean_json_response(result)
-                selected_tools = json.loads(clean_result)
+            clean_result = clean_json_response(result)
+            selected_tools = json.loads(clean_result)
+            return selected_tools
+
+        selections = await self.map_limited(actions_needing_tools, select_tools)
+
+        for action, selected_tools in zip(actions_needing_tools, selections):
+            try:
+                if isinstance(selected_tools, Exception):
+                    raise selected_tools
 
                 logger.info(f"Tool selection result for {action.id}: {selected_tools}")
 
@@ -1649,7 +1968,7 @@ Return ONLY the enhanced template description. Do not include explanations, comm
             False,
         )
 
-        for action in lightweight_candidates:
+        async def categorize(action: Action) -> bool:
             categorization_prompt = f"""
 You are an expert at analyzing whether an action should use lightweight context mode.
 
@@ -1708,15 +2027,21 @@ EXAMPLES WITH REASONING:
 Return ONLY "YES" if the action should use lightweight context, or "NO" if it should not.
 """
 
-            try:
-                categorization_result = await self.get_completion(
-                    prompt=categorization_prompt,
-                    temperature=0.1,
-                    action_results={},
-                    action=None,
-                )
+            categorization_result = await self.get_completion(
+                prompt=categorization_prompt,
+                temperature=0.1,
+                action_results={},
+                action=None,
+            )
+
+            return categorization_result.strip().upper() == "YES"
 
-                should_use_lightweight = categorization_result.strip().upper() == "YES"
+        decisions = await self.map_limited(lightweight_candidates, categorize)
+
+        for action, should_use_lightweight in zip(lightweight_candidates, decisions):
+            try:
+                if isinstance(should_use_lightweight, Exception):
+                    raise should_use_lightweight
 
                 if should_use_lightweight:
                     action.use_lightweight_context = True
@@ -1746,31 +2071,135 @@ Return ONLY "YES" if the action should use lightweight context, or "NO" if it sh
             False,
         )
 
+    def get_action_graph(self, plan: Plan) -> ActionGraph:
+        """Return the action graph of a plan, building it only when the plan changed."""
+        if self._action_graph is None or self._action_graph.plan is not plan:
+            self._action_graph = ActionGraph(plan)
+        return self._action_graph
+
+    def context_token_budget(self, model: str) -> int:
+        for entry in self.valves.MODEL_CONTEXT_TOKEN_BUDGETS.split(","):
+            model_id, _, tokens = entry.strip().rpartition("=")
+            if model_id.strip() == model and tokens.strip().isdigit():
+                return int(tokens)
+        return self.valves.CONTEXT_TOKEN_BUDGET
+
+    async def shorten_output(
+        self, action_id: str, output: dict[str, str], limit: int
+    ) -> dict[str, str]:
+        """Fit an action output into limit characters, by summary or truncation."""
+        primary_output = output.get("primary_output", "") or ""
+        supporting_details = output.get("supporting_details", "") or ""
+        if len(primary_output) + len(supporting_details) <= limit:
+            return output
+
+        cache_key = hashlib.sha256(
+            f"{limit}:{primary_output}:{supporting_details}".encode("utf-8")
+        ).hexdigest()
+        cached = self._packed_outputs.get(cache_key)
+        if cached is not None:
+            self._packed_outputs.move_to_end(cache_key)
+            return cached
+
+        note = f"\n\n[Shortened from {len(primary_output)} characters. Use @{action_id} in tool parameters for the full output.]"
+        details_limit = min(len(supporting_details), limit // 5)
+        primary_limit = max(0, limit - details_limit - len(note))
+
+        shortened = None
+        if self.valves.SUMMARIZE_PACKED_CONTEXT and primary_limit > 0:
+            try:
+                summary = await self.get_completion(
+                    prompt=f"""Summarize the following output of a previous step in at most {primary_limit} characters.
+Keep every fact, number, name, URL and conclusion that a later step could need. Return ONLY the summary.
+
+{primary_output}""",
+                    temperature=self.valves.ANALYSIS_TEMPERATURE,
+                    action_results={},
+                    action=None,
+                )
+                shortened = clean_thinking_tags(summary).strip()[:primary_limit]
+            except Exception as e:
+                logger.warning(f"Could not summarize the output of {action_id}: {e}")
+
+        if shortened is None:
+            shortened = primary_output[:primary_limit]
+
+        packed = {
+            "primary_output": shortened + note,
+            "supporting_details": supporting_details[:details_limit],
+        }
+        self._packed_outputs[cache_key] = packed
+        while len(self._packed_outputs) > 32:
+            self._packed_outputs.popitem(last=False)
+        return packed
+
+    async def pack_context(
+        self, plan: Plan, action: Action, model: str
+    ) -> dict[str, dict[str, str]]:
+        """Pack the outputs of an action's ancestors into its context token budget.
+
+        Direct dependencies are packed first and always appear: they split the budget
+        evenly, with outputs smaller than their share kept whole and the rest shortened to
+        fit. Further ancestors, nearest first, get whatever is left until it runs out.
+        """
+        graph = self.get_action_graph(plan)
+        # Budgets are in tokens, estimated at four characters per token.
+        remaining = self.context_token_budget(model) * 4
+        direct = list(dict.fromkeys(action.dependencies))
+        ancestors = [a for a in graph.ancestors.get(action.id, []) if a not in direct]
+
+        def output_of(action_id: str) -> dict[str, str]:
+            dependency = graph.by_id.get(action_id)
+            return (dependency.output if dependency else None) or {}
+
+        def size_of(output: dict[str, str]) -> int:
+            return len(output.get("primary_output", "") or "") + len(
+                output.get("supporting_details", "") or ""
+            )
+
+        packed: dict[str, dict[str, str]] = {}
+        pending = sorted(direct, key=lambda action_id: size_of(output_of(action_id)))
+        for index, action_id in enumerate(pending):
+            output = output_of(action_id)
+            share = max(0, remaining) // (len(pending) - index)
+            packed[action_id] = await self.shorten_output(action_id, output, share)
+            remaining -= min(size_of(output), share)
+
+        for action_id in ancestors:
+            output = output_of(action_id)
+            # An ancestor shortened to a few hundred characters is more noise than help.
+            if not output or remaining < min(size_of(output), 500):
+                continue
+            packed[action_id] = await self.shorten_output(action_id, output, remaining)
+            remaining -= min(size_of(output), remaining)
+
+        return {
+            action_id: packed[action_id]
+            for action_id in direct + ancestors
+            if action_id in packed
+        }
+
     async def execute_action(
         self, plan: Plan, action: Action, context: dict[str, Any], step_number: int
     ) -> dict[str, Any]:
 
-        def gather_all_parent_results(
-            action_id: str,
-            results: dict[str, Any],
-            plan: Plan,
-            visited: set[Any] | None = None,
-        ) -> dict[Any, Any]:
-            if visited is None:
-                visited = set()
-            if action_id in visited:
-                return {}
-            visited.add(action_id)
-            action_to_check = next((a for a in plan.actions if a.id == action_id), None)
-            if not action_to_check or not action_to_check.dependencies:
-                return {}
-            parent_results: Dict[str, Any] = {}
-            for dep in action_to_check.dependencies:
-                parent_results[dep] = results.get(dep, {})
-                parent_results.update(
-                    gather_all_parent_results(dep, results, plan, visited)
-                )
-            return parent_results
+        execution_model = (
+            action.model
+            if action.model
+            else (
+                self.valves.ACTION_MODEL
+                if (self.valves.ACTION_MODEL != "")
+                else self.valves.MODEL
+            )
+        )
+        graph = self.get_action_graph(plan)
+        # @action_id references may point at any ancestor, so they resolve against full outputs.
+        action_results: dict[str, Any] = {
+            ancestor_id: graph.by_id[ancestor_id].output
+            for ancestor_id in graph.ancestors.get(action.id, [])
+            if graph.by_id[ancestor_id].output
+        }
+        action_results.update(context)
 
         if action.use_lightweight_context:
 
@@ -1820,7 +2249,7 @@ Return ONLY "YES" if the action should use lightweight context, or "NO" if it sh
                         "usage_note": f"Use @{dep} in tool parameters to access the full content",
                     }
         else:
-            context_for_prompt = context
+            context_for_prompt = await self.pack_context(plan, action, execution_model)
 
         requirements = (
             await self.enhance_requirements(plan, action)
@@ -1945,18 +2374,12 @@ Focus ONLY on this specific step's output.
                         extra_params,
                     )
 
-                    execution_model = (
-                        action.model
-                        if action.model
-                        else (
-                            self.valves.ACTION_MODEL
-                            if (self.valves.ACTION_MODEL != "")
-                            else self.valves.MODEL
-                        )
-                    )
-
                     system_prompt = self.get_system_prompt_for_model(
-                        action, step_number, context, requirements, execution_model
+                        action,
+                        step_number,
+                        context_for_prompt if not action.use_lightweight_context else context,
+                        requirements,
+                        execution_model,
                     )
 
                     action_format: dict[str, Any] = {
@@ -1992,7 +2415,7 @@ Focus ONLY on this specific step's output.
                         model=execution_model,
                         tools=tools,
                         format=action_format,
-                        action_results=context,
+                        action_results=action_results,
                         action=action,
                     )
 
@@ -2361,122 +2784,143 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
         """
         Execute the complete plan based on dependencies.
         Handles a special 'final_synthesis' action for templating.
+
+        Actions run as soon as their dependencies are done, up to CONCURRENT_ACTIONS
+        at a time, so independent branches overlap. Dependents of a failed action are
+        skipped (except 'final_synthesis', which leaves their placeholders in place),
+        and a user abort cancels every action still running.
         """
+        self._action_graph = ActionGraph(plan)
         completed_results: dict[str, dict[str, str]] = {}
-        in_progress: set[str] = set()
         completed: set[str] = set()
         step_counter = 1
         all_outputs: list[dict[str, int | str]] = []
         completed_summaries: list[str] = []
 
-        async def can_execute(action: Action) -> bool:
-            return all(dep in completed for dep in action.dependencies)
+        # Dependency counters: an action is ready once every dependency is done.
+        # Dependencies that are not in the plan never finish, so those actions
+        # stall just as they did before and are reported below.
+        dependents: dict[str, list[Action]] = {a.id: [] for a in plan.actions}
+        remaining: dict[str, int] = {}
+        for action in plan.actions:
+            deps = set(action.dependencies)
+            remaining[action.id] = len(deps)
+            for dep in deps:
+                if dep in dependents:
+                    dependents[dep].append(action)
+        blocked: set[str] = set()
+        ready: collections.deque[Action] = collections.deque(
+            a for a in plan.actions if remaining[a.id] == 0
+        )
+        running: set[str] = set()
+        max_concurrent = max(1, self.valves.CONCURRENT_ACTIONS)
+        aborted: UserAbortedException | None = None
 
-        while len(completed) < len(plan.actions):
+        async def run_synthesis(action: Action) -> None:
+            await self.emit_status(
+                "info", "Assembling final deliverable from template...", False
+            )
+            action.status = "in_progress"
+            action.start_time = datetime.now().strftime("%H:%M:%S")
             await self.emit_full_state(plan, completed_summaries)
 
-            available = [
-                action
-                for action in plan.actions
-                if action.id not in completed
-                and action.id not in in_progress
-                and await can_execute(action)
-            ]
+            final_output_template = action.description
 
-            if not available:
-                if not in_progress:
-                    failed_actions = [a for a in plan.actions if a.status == "failed"]
-                    if failed_actions or len(completed) < len(plan.actions):
-                        logger.error(
-                            "Execution stalled. Not all actions could be completed."
-                        )
-                    break
-                await asyncio.sleep(0.1)
-                continue
+            placeholder_ids = re.findall(r"\{([a-zA-Z0-9_]+)\}", final_output_template)
+
+            final_output = final_output_template
+            for action_id in placeholder_ids:
+                placeholder = f"{{{action_id}}}"
+                if action_id in completed_results:
+                    dependency_output = completed_results[action_id].get(
+                        "primary_output", ""
+                    )
+                    final_output = final_output.replace(placeholder, dependency_output)
+                else:
+                    logger.warning(
+                        f"Could not find output for placeholder '{placeholder}'. It may have failed or was not executed. It will be left in the final output."
+                    )
 
-            synthesis_action = next(
-                (a for a in available if a.id == "final_synthesis"), None
+            action.output = {
+                "primary_output": final_output,
+                "supporting_details": "Final synthesis completed",
+            }
+            action.status = "completed"
+            action.end_time = datetime.now().strftime("%H:%M:%S")
+            completed.add(action.id)
+            completed_results[action.id] = action.output
+
+            await self.emit_status(
+                "success",
+                "Final deliverable assembled. This is the complete result that will be presented to the user.",
+                True,
             )
-            if synthesis_action:
-                action = synthesis_action
-                available.remove(action)
-            elif available and len(in_progress) < self.valves.CONCURRENT_ACTIONS:
-                action = available.pop(0)
-            else:
-                await asyncio.sleep(0.1)
-                continue
 
-            if action.id == "final_synthesis":
-                await self.emit_status(
-                    "info", "Assembling final deliverable from template...", False
+            remaining_actions = [a for a in plan.actions if a.id not in completed]
+            if not remaining_actions:
+                formatted_output = self.format_action_output(
+                    action, action.output, is_final_result=True
                 )
+                await self.emit_message(formatted_output)
+            else:
+                summary = self.generate_action_summary(action, plan)
+                if summary:
+                    completed_summaries.append(summary)
+
+        async def run_action(action: Action, step_number: int) -> bool:
+            # Actions restored from a checkpoint keep the output they already have.
+            restored = action.status in ["completed", "warning"] and action.output
+            if not restored:
                 action.status = "in_progress"
                 action.start_time = datetime.now().strftime("%H:%M:%S")
                 await self.emit_full_state(plan, completed_summaries)
 
-                final_output_template = action.description
-
-                placeholder_ids = re.findall(
-                    r"\{([a-zA-Z0-9_]+)\}", final_output_template
-                )
-
-                final_output = final_output_template
-                for action_id in placeholder_ids:
-                    placeholder = f"{{{action_id}}}"
-                    if action_id in completed_results:
-                        dependency_output = completed_results[action_id].get(
-                            "primary_output", ""
-                        )
-                        final_output = final_output.replace(
-                            placeholder, dependency_output
-                        )
-                    else:
-                        logger.warning(
-                            f"Could not find output for placeholder '{placeholder}'. It may have failed or was not executed. It will be left in the final output."
-                        )
-
-                action.output = {
-                    "primary_output": final_output,
-                    "supporting_details": "Final synthesis completed",
-                }
-                action.status = "completed"
-                action.end_time = datetime.now().strftime("%H:%M:%S")
-                completed.add(action.id)
-                completed_results[action.id] = action.output
-
-                await self.emit_status(
-                    "success",
-                    "Final deliverable assembled. This is the complete result that will be presented to the user.",
-                    True,
-                )
-
-                remaining_actions = [a for a in plan.actions if a.id not in completed]
-                if not remaining_actions:
-                    formatted_output = self.format_action_output(
-                        action, action.output, is_final_result=True
-                    )
-                    await self.emit_message(formatted_output)
-                else:
-                    summary = self.generate_action_summary(action, plan)
-                    if summary:
-                        completed_summaries.append(summary)
-
-                continue  #
-
-            in_progress.add(action.id)
-            action.status = "in_progress"
-            action.start_time = datetime.now().strftime("%H:%M:%S")
-            await self.emit_full_state(plan, completed_summaries)
-
             try:
                 context: dict[Any, Any] = {
                     dep: completed_results.get(dep, {}) for dep in action.dependencies
                 }
 
-                result = await self.execute_action(plan, action, context, step_counter)
+                result_key = None
+                cached = None
+                if self.plan_store and not restored:
+                    graph = self.get_action_graph(plan)
+                    result_key = self.plan_store.action_key(
+                        self.__user__.id,
+                        plan.goal,
+                        action,
+                        {
+                            ancestor_id: graph.by_id[ancestor_id].output
+                            for ancestor_id in graph.ancestors.get(action.id, [])
+                        },
+                        action.model or self.valves.ACTION_MODEL or self.valves.MODEL,
+                    )
+                    cached = self.plan_store.get_result(self.plan_key, result_key)
+
+                if restored:
+                    result = action.output
+                elif cached and cached.get("output"):
+                    logger.info(f"Reusing saved result for action {action.id}")
+                    action.output = cached["output"]
+                    action.status = cached.get("status", "completed")
+                    action.tool_calls = cached.get("tool_calls", [])
+                    action.tool_results = cached.get("tool_results", {})
+                    action.end_time = datetime.now().strftime("%H:%M:%S")
+                    result = action.output
+                else:
+                    result = await self.execute_action(
+                        plan, action, context, step_number
+                    )
+                    if result_key:
+                        try:
+                            self.plan_store.put_result(
+                                self.plan_key, result_key, action
+                            )
+                        except OSError as e:
+                            logger.warning(f"Could not save result of {action.id}: {e}")
 
                 completed_results[action.id] = result
                 completed.add(action.id)
+                self.save_checkpoint(plan)
 
                 summary = self.generate_action_summary(action, plan)
                 if summary:
@@ -2486,54 +2930,107 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
 
                 all_outputs.append(
                     {
-                        "step": step_counter,
+                        "step": step_number,
                         "id": action.id,
                         "output": result.get("primary_output", ""),
                         "status": action.status,
                     }
                 )
-                step_counter += 1
-
-            except UserAbortedException as e:
-                step_counter += 1
-                logger.info(f"Action {action.id} aborted by user: {e}")
-
-                await self.emit_status(
-                    "warning",
-                    f"Plan execution stopped by user at action: {action.id}",
-                    True,
-                )
+                return True
 
+            except (UserAbortedException, asyncio.CancelledError):
                 action.status = "aborted"
                 action.end_time = datetime.now().strftime("%H:%M:%S")
                 completed.add(action.id)
-                await self.emit_full_state(plan, completed_summaries)
-
-                await self.emit_message(
-                    f"## ⚠️ Plan Execution Stopped\n\n"
-                    f"Execution was stopped by user at action: **{action.description}**\n\n"
-                    f"Action ID: `{action.id}`\n\n"
-                    f"Status: **{action.status}**\n\n"
-                    f"Execution Summary:\n\n"
-                    f"- Total Steps: {len(plan.actions)}\n"
-                    f"- Completed Steps: {len([a for a in plan.actions if a.status == 'completed'])}\n"
-                    f"- Failed Steps: {len([a for a in plan.actions if a.status == 'failed'])}\n"
-                )
-
-                break
+                self.save_checkpoint(plan)
+                raise
 
             except Exception as e:
-                step_counter += 1
                 logger.error(f"Action {action.id} failed: {e}")
                 action.status = "failed"
                 completed.add(action.id)
+                self.save_checkpoint(plan)
 
                 await self.emit_full_state(plan, completed_summaries)
+                return False
+
+        def finish(action: Action, succeeded: bool) -> None:
+            """Release the dependents of a finished action, skipping those it blocks."""
+            for dependent in dependents[action.id]:
+                if not succeeded and dependent.id != "final_synthesis":
+                    blocked.add(dependent.id)
+                remaining[dependent.id] -= 1
+                if remaining[dependent.id] > 0:
+                    continue
+                if dependent.id in blocked:
+                    logger.warning(
+                        f"Skipping action {dependent.id}: a dependency did not complete"
+                    )
+                    dependent.status = "skipped"
+                    completed.add(dependent.id)
+                    finish(dependent, False)
+                elif dependent.id == "final_synthesis":
+                    ready.appendleft(dependent)
+                else:
+                    ready.append(dependent)
+
+        async def worker(action: Action, step_number: int) -> None:
+            try:
+                if action.id == "final_synthesis":
+                    await run_synthesis(action)
+                    succeeded = True
+                else:
+                    succeeded = await run_action(action, step_number)
             finally:
-                if action.id in in_progress:
-                    in_progress.remove(action.id)
+                running.discard(action.id)
+            finish(action, succeeded)
+            launch()
+
+        def launch() -> None:
+            nonlocal step_counter
+            while ready and len(running) < max_concurrent:
+                action = ready.popleft()
+                running.add(action.id)
+                task_group.create_task(worker(action, step_counter))
+                # The synthesis only fills in a template, so it doesn't use up a step.
+                if action.id != "final_synthesis":
+                    step_counter += 1
+
+        await self.emit_full_state(plan, completed_summaries)
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                launch()
+        except* UserAbortedException as group:
+            aborted = group.exceptions[0]
+
+        if aborted is not None:
+            logger.info(f"Action {aborted.action_id} aborted by user: {aborted}")
+            action = next(a for a in plan.actions if a.id == aborted.action_id)
+
+            await self.emit_status(
+                "warning",
+                f"Plan execution stopped by user at action: {action.id}",
+                True,
+            )
 
-        result_message = await self.emit_full_state(plan, completed_summaries)
+            await self.emit_full_state(plan, completed_summaries)
+
+            await self.emit_message(
+                f"## ⚠️ Plan Execution Stopped\n\n"
+                f"Execution was stopped by user at action: **{action.description}**\n\n"
+                f"Action ID: `{action.id}`\n\n"
+                f"Status: **{action.status}**\n\n"
+                f"Execution Summary:\n\n"
+                f"- Total Steps: {len(plan.actions)}\n"
+                f"- Completed Steps: {len([a for a in plan.actions if a.status == 'completed'])}\n"
+                f"- Failed Steps: {len([a for a in plan.actions if a.status == 'failed'])}\n"
+            )
+        elif len(completed) < len(plan.actions):
+            logger.error("Execution stalled. Not all actions could be completed.")
+
+        result_message = await self.emit_full_state(
+            plan, completed_summaries, force=True
+        )
 
         final_synthesis_action = next(
             (
@@ -2571,12 +3068,36 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
         plan.metadata["execution_outputs"] = all_outputs
         return result_message
 
+    def save_checkpoint(self, plan: Plan) -> None:
+        """Save the plan so that it can be resumed, logging rather than failing if the disk is unavailable."""
+        if not self.plan_store or not self.plan_key:
+            return
+        try:
+            self.plan_store.save_plan(self.plan_key, plan)
+        except OSError as e:
+            logger.warning(f"Could not save plan checkpoint: {e}")
+
+    def resume_plan(self, plan: Plan) -> Plan:
+        """Reset every action that did not finish so that a saved plan can run again."""
+        for action in plan.actions:
+            if action.status not in ["completed", "warning"] or not action.output:
+                action.status = "pending"
+                action.output = None
+                action.start_time = None
+                action.end_time = None
+                action.tool_calls.clear()
+                action.tool_results.clear()
+        plan.execution_summary = None
+        return plan
+
     async def emit_replace_mermaid(self, plan: Plan):
         """Emit current state as Mermaid diagram, replacing the old one"""
         mermaid = await self.generate_mermaid(plan)
         await self.emit_replace(f"\n\n```mermaid\n{mermaid}\n```\n")
 
     async def emit_message(self, message: str):
+        # Messages are appended after the plan state, so send any held back state first.
+        await self.flush_state()
         await self.__current_event_emitter__(
             {"type": "message", "data": {"content": message}}
         )
@@ -2593,6 +3114,8 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
         if timeout_seconds is None:
             timeout_seconds = self.valves.USER_RESPONSE_TIMEOUT
 
+        await self.flush_state()
+
         try:
             response = await asyncio.wait_for(
                 self.__current_event_call__(event_data), timeout=timeout_seconds
@@ -2669,8 +3192,55 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
         formatted_content += "---\n"
         return formatted_content
 
-    async def emit_full_state(self, plan: Plan, completed_summaries: list[str]):
-        """Emit the full state including mermaid diagram and all summaries"""
+    async def emit_full_state(
+        self, plan: Plan, completed_summaries: list[str], force: bool = False
+    ) -> str:
+        """Emit the full state including mermaid diagram and all summaries.
+
+        Emits are coalesced to STATE_RENDER_FPS: an update that arrives too soon after
+        the previous one is held back and sent, with whatever changed in the meantime,
+        at the next frame. Pass force=True to send the current state right away.
+        """
+        self._pending_state = (plan, completed_summaries)
+        interval = (
+            1 / self.valves.STATE_RENDER_FPS if self.valves.STATE_RENDER_FPS > 0 else 0
+        )
+        wait = self._last_state_emit + interval - time.monotonic()
+        if force or wait <= 0:
+            return await self.flush_state()
+
+        if self._state_flush_task is None or self._state_flush_task.done():
+
+            async def flush_later() -> None:
+                await asyncio.sleep(wait)
+                self._state_flush_task = None
+                await self.flush_state()
+
+            self._state_flush_task = asyncio.create_task(flush_later())
+        return self._last_state_content
+
+    async def flush_state(self) -> str:
+        """Send any plan state update that is being held back for the next frame."""
+        if self._state_flush_task is not None:
+            if self._state_flush_task is not asyncio.current_task():
+                self._state_flush_task.cancel()
+            self._state_flush_task = None
+        if self._pending_state is None:
+            return self._last_state_content
+
+        plan, completed_summaries = self._pending_state
+        self._pending_state = None
+        full_content = await self.render_full_state(plan, completed_summaries)
+        self._last_state_emit = time.monotonic()
+        if full_content != self._last_state_content:
+            self._last_state_content = full_content
+            await self.emit_replace(full_content)
+        return full_content
+
+    async def render_full_state(
+        self, plan: Plan, completed_summaries: list[str]
+    ) -> str:
+        """Render the mermaid diagram, the summaries and the template preview."""
         mermaid = await self.generate_mermaid(plan)
 
         content_parts = [f"```mermaid\n{mermaid}\n```"]
@@ -2686,7 +3256,7 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
         incomplete_actions = [
             a
             for a in plan.actions
-            if a.status not in ["completed", "warning", "failed"]
+            if a.status not in ["completed", "warning", "failed", "skipped", "aborted"]
             and a.id != "final_synthesis"
         ]
 
@@ -2695,49 +3265,67 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
             and self.valves.SHOW_ACTION_SUMMARIES
             and incomplete_actions
         ):
-            template = final_synthesis_action.description
-            preview_template = template
+            # The preview only changes when an action's status or output does.
+            preview_key = (
+                final_synthesis_action.description,
+                tuple((a.id, a.status, bool(a.output)) for a in plan.actions),
+            )
+            if self._template_preview and self._template_preview[0] == preview_key:
+                final_synthesis_content = self._template_preview[1]
+            else:
+                final_synthesis_content = self.render_template_preview(
+                    plan, final_synthesis_action
+                )
+                self._template_preview = (preview_key, final_synthesis_content)
+            content_parts.append(final_synthesis_content)
 
-            template_placeholders = set(re.findall(r"\{([a-zA-Z0-9_]+)\}", template))
-            total_placeholders = len(template_placeholders)
+        return "\n\n".join(content_parts)
 
-            completed_actions = [
-                a
-                for a in plan.actions
-                if a.status in ["completed", "warning"] and a.output
-            ]
-            pending_actions = [
-                a
-                for a in plan.actions
-                if a.status == "pending" and a.id != "final_synthesis"
-            ]
+    def render_template_preview(self, plan: Plan, final_synthesis_action: Action) -> str:
+        """Render the final synthesis template with the outputs that are ready so far."""
+        template = final_synthesis_action.description
+        preview_template = template
+
+        template_placeholders = set(re.findall(r"\{([a-zA-Z0-9_]+)\}", template))
+        total_placeholders = len(template_placeholders)
+
+        completed_actions = [
+            a
+            for a in plan.actions
+            if a.status in ["completed", "warning"] and a.output
+        ]
+        pending_actions = [
+            a
+            for a in plan.actions
+            if a.status == "pending" and a.id != "final_synthesis"
+        ]
 
-            completed_placeholders = 0
+        completed_placeholders = 0
 
-            for placeholder_id in template_placeholders:
-                action = next(
-                    (a for a in completed_actions if a.id == placeholder_id), None
+        for placeholder_id in template_placeholders:
+            action = next(
+                (a for a in completed_actions if a.id == placeholder_id), None
+            )
+            if action and action.output:
+                completed_placeholders += 1
+                preview_content = action.output.get("primary_output", "")
+                if len(preview_content) > 200:
+                    preview_content = preview_content[:200] + "..."
+                preview_template = preview_template.replace(
+                    f"{{{placeholder_id}}}",
+                    f"✅ [{placeholder_id}]: {preview_content}",
                 )
-                if action and action.output:
-                    completed_placeholders += 1
-                    preview_content = action.output.get("primary_output", "")
-                    if len(preview_content) > 200:
-                        preview_content = preview_content[:200] + "..."
-                    preview_template = preview_template.replace(
-                        f"{{{placeholder_id}}}",
-                        f"✅ [{placeholder_id}]: {preview_content}",
-                    )
 
-            for placeholder_id in template_placeholders:
-                action = next(
-                    (a for a in pending_actions if a.id == placeholder_id), None
+        for placeholder_id in template_placeholders:
+            action = next(
+                (a for a in pending_actions if a.id == placeholder_id), None
+            )
+            if action:
+                preview_template = preview_template.replace(
+                    f"{{{placeholder_id}}}", f"⏳ [{placeholder_id}]: Pending..."
                 )
-                if action:
-                    preview_template = preview_template.replace(
-                        f"{{{placeholder_id}}}", f"⏳ [{placeholder_id}]: Pending..."
-                    )
 
-            final_synthesis_content = f"""<details>
+        final_synthesis_content = f"""<details>
 <summary>📋 Final Synthesis Template ({completed_placeholders}/{total_placeholders} outputs ready)</summary>
 
 **Template Preview**:
@@ -2748,11 +3336,7 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
 ---
 
 </details>"""
-            content_parts.append(final_synthesis_content)
-
-        full_content = "\n\n".join(content_parts)
-        await self.emit_replace(full_content)
-        return full_content
+        return final_synthesis_content
 
     def generate_action_summary(self, action: Action, plan: Plan) -> str:
         """Generate a detailed summary of a completed action in dropdown format"""
@@ -2984,18 +3568,49 @@ Be brutally honest. A high `quality_score` should only be given to high-quality
 
         goal = body.get("messages", [])[-1].get("content", "").strip()
 
-        await self.emit_status("info", "Creating execution plan...", False)
-        try:
-            plan = await self.create_plan(goal)
-        except Exception as e:
-            await self.emit_status("error", f"Failed to create a valid plan: {e}", True)
-            return
+        self._mermaid_nodes.clear()
+        self._mermaid_edges = None
+        self._template_preview = None
+        self._pending_state = None
+        self._last_state_content = ""
+        self._last_state_emit = 0.0
+
+        self.plan_store = None
+        self.plan_key = None
+        if self.valves.ENABLE_PLAN_CHECKPOINTS:
+            try:
+                self.plan_store = PlanStore(os.path.join(CACHE_DIR, "planner"))
+                self.plan_store.prune(self.valves.PLAN_CHECKPOINT_TTL_HOURS * 3600)
+                self.plan_key = self.plan_store.plan_key(self.__user__.id, goal)
+            except OSError as e:
+                logger.warning(f"Plan checkpoints are unavailable: {e}")
+                self.plan_store = None
+
+        plan = self.plan_store.load_plan(self.plan_key) if self.plan_store else None
+        if plan:
+            plan = self.resume_plan(plan)
+            await self.emit_status("info", "Resuming saved execution plan...", False)
+        else:
+            await self.emit_status("info", "Creating execution plan...", False)
+            try:
+                plan = await self.create_plan(goal)
+            except Exception as e:
+                await self.emit_status(
+                    "error", f"Failed to create a valid plan: {e}", True
+                )
+                return
+            self.save_checkpoint(plan)
 
         await self.emit_full_state(plan, [])
 
         await self.emit_status("info", "Executing plan...", False)
         result = await self.execute_plan(plan)
 
+        if self.plan_store and all(
+            a.status in ["completed", "warning"] for a in plan.actions
+        ):
+            self.plan_store.delete_plan(self.plan_key)
+
         await self.emit_status("success", "Plan execution completed.", True)
 
         return result
@@ -14,10 +14,17 @@ import random
 import re
 import math
 import json
+import os
+import time
+import asyncio
+import hashlib
+import collections
 import aiohttp
+import xml.etree.ElementTree as ET
 from typing import List, Dict, AsyncGenerator, Callable, Awaitable
 from pydantic import BaseModel, Field
 from open_webui.constants import TASKS
+from open_webui.config import CACHE_DIR
 
 from open_webui.main import generate_chat_completions
 from open_webui.models.users import User ,Users
@@ -44,6 +51,220 @@ def setup_logger():
 logger = setup_logger()
 
 
+class SearchCache:
+    """Caches search results by source and normalized query, in memory and on disk.
+
+    Sibling expansions and later iterations often ask for the same query in slightly
+    different spellings; normalizing it lets them share one search. Concurrent lookups of
+    the same key wait for the search already in flight instead of starting another one.
+    The in-memory copy keeps the max_entries most recently used keys, and `prune` deletes
+    the files that have expired.
+    """
+
+    def __init__(self, directory: str, ttl: float, max_entries: int = 256):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory: collections.OrderedDict[str, tuple[float, List[Dict]]] = (
+            collections.OrderedDict()
+        )
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Search cache directory unavailable, caching in memory only: {e}")
+            self.directory = None
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        query = query.strip().strip("\"'`").lower()
+        query = re.sub(r"\s+", " ", query)
+        return query.rstrip(".?!")
+
+    def key(self, source: str, query: str, limit: int) -> str:
+        return hashlib.sha256(
+            f"{source}:{limit}:{self.normalize(query)}".encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str):
+        entry = self.memory.get(key)
+        if entry is None and self.directory:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    data = json.load(f)
+                entry = (data["expires"], data["results"])
+            except (OSError, ValueError, KeyError):
+                return None
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            self.memory.pop(key, None)
+            return None
+        self.remember(key, entry)
+        return entry[1]
+
+    def remember(self, key: str, entry: tuple[float, List[Dict]]):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def set(self, key: str, results: List[Dict]):
+        expires = time.time() + self.ttl
+        self.remember(key, (expires, results))
+        if self.directory:
+            try:
+                tmp_path = f"{self._path(key)}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"expires": expires, "results": results}, f)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                logger.debug(f"Could not write search cache entry: {e}")
+
+    def prune(self):
+        """Delete the cache files written more than ttl seconds ago."""
+        if not self.directory:
+            return
+        cutoff = time.time() - max(self.ttl, 0)
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError as e:
+            logger.debug(f"Could not prune search cache: {e}")
+            return
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    async def fetch(self, source: str, query: str, limit: int, search) -> List[Dict]:
+        """Return cached results for the query, or run search(query) once and cache them.
+
+        limit is the number of results search returns, so that changing it does not serve
+        cached results of the old size.
+        """
+        if self.ttl <= 0:
+            return await search(query)
+        key = self.key(source, query, limit)
+        cached = self.get(key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for {source}: {query[:50]}")
+            return cached
+        if key in self.in_flight:
+            return await asyncio.shield(self.in_flight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            results = await search(query)
+            # Empty results are usually a failed request, so they are not cached.
+            if results:
+                self.set(key, results)
+            future.set_result(results)
+            return results
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting on the future, so retrieve the exception here.
+            future.exception()
+            raise
+        finally:
+            self.in_flight.pop(key, None)
+
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def parse_arxiv_entry(entry: ET.Element) -> Dict:
+    """Convert an arXiv API Atom entry to the result format of Pipe.search_arxiv."""
+    abs_url = (entry.findtext(f"{ATOM}id") or "").strip()
+    arxiv_id = abs_url.rsplit("/abs/", 1)[-1] if "/abs/" in abs_url else ""
+    title = " ".join((entry.findtext(f"{ATOM}title") or "Unknown Title").split())
+    summary = " ".join((entry.findtext(f"{ATOM}summary") or "No summary available").split())
+    authors = ", ".join(
+        (author.findtext(f"{ATOM}name") or "").strip()
+        for author in entry.findall(f"{ATOM}author")
+    )
+    pdf_url = next(
+        (
+            link.get("href")
+            for link in entry.findall(f"{ATOM}link")
+            if link.get("title") == "pdf"
+        ),
+        f"https://arxiv.org/pdf/{arxiv_id}" if arxiv_id else "No link available",
+    )
+    published = entry.findtext(f"{ATOM}published") or ""
+    pub_date = (
+        f"{int(published[5:7])}-{published[:4]}"
+        if len(published) >= 7
+        else "Unknown Date"
+    )
+    return {
+        "title": title,
+        "authors": authors or "Unknown Authors",
+        "summary": summary,
+        "url": f"https://arxiv.org/abs/{arxiv_id}" if arxiv_id else "No link available",
+        "pdf_url": pdf_url,
+        "pub_date": pub_date,
+        "content": summary,  # for compatibility with synthesis
+    }
+
+
+async def parse_arxiv_atom(chunks: AsyncGenerator[bytes, None], max_results: int) -> List[Dict]:
+    """Parse an arXiv API Atom feed as it arrives, keeping only one entry in memory at a time.
+
+    Reading stops once max_results entries have been parsed.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    results = []
+    async for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if element.tag == f"{ATOM}entry":
+                results.append(parse_arxiv_entry(element))
+                element.clear()
+                if len(results) >= max_results:
+                    return results
+    return results
+
+
+def parse_scores(text: str, count: int) -> List:
+    """Parse count scores between 1 and 10 from an LLM reply, None where a score is unusable.
+
+    A JSON array, or an object keyed by candidate number, is tried first; otherwise the
+    numbers in the text are used, ignoring "1:"-style candidate labels.
+    """
+    scores = None
+    match = re.search(r"\[[^\[\]]*\]|\{[^{}]*\}", text)
+    if match:
+        try:
+            data = json.loads(match.group())
+            if isinstance(data, dict):
+                data = data.get("scores", data)
+            if isinstance(data, dict):
+                data = [
+                    data[key]
+                    for key in sorted(data, key=lambda k: int(re.sub(r"\D", "", str(k)) or 0))
+                ]
+            scores = [float(value) for value in data]
+        except (ValueError, TypeError):
+            scores = None
+
+    if scores is None or len(scores) != count:
+        numbers = re.findall(r"(?<![\d.])(?:\d+\s*[:)]\s*)?(\d+(?:\.\d+)?)", text)
+        scores = [float(number) for number in numbers]
+
+    if len(scores) != count:
+        return [None] * count
+    return [score if 1.0 <= score <= 10.0 else None for score in scores]
+
+
 # Node class for MCTS
 class Node:
     def __init__(self, **kwargs):
@@ -59,6 +280,8 @@ class Node:
         self.score = 0
         self.temperature = kwargs.get("temperature", 1)
         self.depth = kwargs.get("depth", 1)
+        # Quality score from evaluate_content(s), None until the node is evaluated
+        self.evaluation = None
 
     def add_child(self, child: "Node"):
         child.parent = self
@@ -143,32 +366,56 @@ class MCTS:
             self.pipe.valves.TEMPERATURE_MIN,
             self.pipe.valves.DINAMYC_TEMPERATURE_DECAY,
         )
-        for i in range(self.breadth):
-            await self.pipe.emit_replace(self.mermaid(node))
-            improvement = await self.pipe.get_improvement(node.content, self.topic)
-            await self.pipe.emit_message(
-                f"\nResearch direction {i+1}: {improvement}\n\n"
-            )
-            logger.debug(f"temperature:{temperature}")
-            research = await self.pipe.gather_research(
-                f"""Generate a new arXiv search query based on the improvement suggestion:
+        # Children are expanded concurrently; with more than one at a time their
+        # syntheses are buffered and each is emitted whole, so streams don't interleave.
+        concurrency = max(1, min(self.pipe.valves.EXPANSION_CONCURRENCY, self.breadth))
+        stream = concurrency == 1
+        semaphore = asyncio.Semaphore(concurrency)
+        emit_lock = asyncio.Lock()
+
+        async def expand_child(i: int):
+            async with semaphore:
+                if stream:
+                    await self.pipe.emit_replace(self.mermaid(node))
+                improvement = await self.pipe.get_improvement(node.content, self.topic)
+                if stream:
+                    await self.pipe.emit_message(
+                        f"\nResearch direction {i+1}: {improvement}\n\n"
+                    )
+                logger.debug(f"temperature:{temperature}")
+                research = await self.pipe.gather_research(
+                    f"""Generate a new arXiv search query based on the improvement suggestion:
             Topic: {self.topic}
             Improvement: {improvement}"""
-            )
+                )
 
-            synthesis = await self.pipe.synthesize_research(
-                research, self.topic, temperature
-            )
+                synthesis = await self.pipe.synthesize_research(
+                    research, self.topic, temperature, stream=stream
+                )
 
-            child = Node(
-                content=synthesis,
-                research=research,
-                max_children=self.breadth,
-                temperature=temperature,
+                child = Node(
+                    content=synthesis,
+                    research=research,
+                    max_children=self.breadth,
+                    temperature=temperature,
+                )
+                async with emit_lock:
+                    node.add_child(child)
+                    if not stream:
+                        await self.pipe.emit_message(
+                            f"\nResearch direction {i+1}: {improvement}\n\n{synthesis}"
+                        )
+                    await self.pipe.emit_replace(self.mermaid(node))
+
+        await asyncio.gather(*(expand_child(i) for i in range(self.breadth)))
+
+        if self.pipe.valves.BATCH_EVALUATION:
+            await self.pipe.progress(f"Evaluating research paths from {node.id}...")
+            scores = await self.pipe.evaluate_contents(
+                [child.content for child in node.children], self.topic
             )
-            node.add_child(child)
-
-            await self.pipe.emit_replace(self.mermaid(node))
+            for child, score in zip(node.children, scores):
+                child.evaluation = score
 
         return random.choice(node.children)
 
@@ -209,6 +456,8 @@ class MCTS:
 
     async def simulate(self, node):
         await self.pipe.progress(f"Evaluating research path {node.id}...")
+        if node.evaluation is not None:
+            return node.evaluation
         return await self.pipe.evaluate_content(node.content, self.topic)
 
     def backpropagate(self, node, score):
@@ -277,9 +526,84 @@ class Pipe:
             default=0.5,
             description="Temperature the MCTS process will attempt to converge to with Temperature decay, if set to dinamic this value is not fixed",
         )
+        EXPANSION_CONCURRENCY: int = Field(
+            default=3,
+            description="Number of research paths explored at the same time when expanding a node (1 streams each synthesis as before)",
+        )
+        HTTP_MAX_CONNECTIONS: int = Field(
+            default=20,
+            description="Maximum number of open connections in the shared HTTP session used for searches",
+        )
+        HTTP_CONNECTIONS_PER_HOST: int = Field(
+            default=4,
+            description="Maximum number of open connections to one host in the shared HTTP session",
+        )
+        BATCH_EVALUATION: bool = Field(
+            default=True,
+            description="Score all research paths of an expansion in one LLM call instead of one call per path",
+        )
+        SEARCH_CACHE_TTL: int = Field(
+            default=3600,
+            description="Seconds to keep web and arXiv search results, keyed by normalized query (0 disables the cache)",
+        )
 
     def __init__(self):
         self.valves = self.Valves()
+        self.search_cache = None
+        self.session = None
+        self.session_loop = None
+        # Evaluation scores by hash of topic and content, so no synthesis is scored twice.
+        # Only the most recently used ones are kept, since the Pipe lives as long as the server.
+        self.evaluations: collections.OrderedDict[str, float] = collections.OrderedDict()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session shared by all searches, creating it on first use.
+
+        The session keeps connections alive between calls and caches DNS lookups. A
+        session belongs to the event loop it was created on, so if the loop changes the
+        old session is closed and a new one is made. Open WebUI functions have no shutdown
+        hook, so the last session is released when the process exits.
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            await self.close_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.valves.HTTP_MAX_CONNECTIONS,
+                limit_per_host=self.valves.HTTP_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=30)
+            )
+            self.session_loop = loop
+        return self.session
+
+    async def close_session(self):
+        """Close the shared session on the loop it belongs to, if that loop still runs."""
+        session, session_loop = self.session, self.session_loop
+        self.session = None
+        self.session_loop = None
+        if session is None or session.closed:
+            return
+        try:
+            if session_loop is asyncio.get_running_loop() or session_loop.is_closed():
+                await session.close()
+            elif session_loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+            else:
+                session_loop.run_until_complete(session.close())
+        except Exception as e:
+            logger.debug(f"Could not close the previous HTTP session: {e}")
+
+    def get_search_cache(self) -> SearchCache:
+        if self.search_cache is None:
+            self.search_cache = SearchCache(
+                os.path.join(CACHE_DIR, "research_pipe", "search"),
+                self.valves.SEARCH_CACHE_TTL,
+            )
+        self.search_cache.ttl = self.valves.SEARCH_CACHE_TTL
+        return self.search_cache
 
     def pipes(self) -> list[dict[str, str]]:
 
@@ -306,19 +630,29 @@ class Pipe:
                 "Chrome/132.0.0.0 Safari/537.36",
                 "x-requested-with": "XMLHttpRequest",
             }
-            async with aiohttp.ClientSession() as session:
+            session = await self.get_session()
+            try:
                 async with session.get(
-                    base_url, params=params, headers=headers, timeout=30
+                    base_url, params=params, headers=headers
                 ) as response:
                     response.raise_for_status()
                     root = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.debug(f"searchthearxiv.com failed, falling back to the arXiv API: {e}")
+                root = {}
 
             entries = root.get("papers", [])
             if not entries:
+                results = await self.search_arxiv_api(query)
+                if not results:
+                    await self.emit_status(
+                        "tool", f"No papers found on arXiv related to '{query}'", True
+                    )
+                    return []
                 await self.emit_status(
-                    "tool", f"No papers found on arXiv related to '{query}'", True
+                    "tool", f"arXiv papers found: {len(results)}", True
                 )
-                return []
+                return results
 
             results = []
             for entry in entries[:self.valves.ARXIV_MAX_RESULTS]:
@@ -355,41 +689,65 @@ class Pipe:
             error_msg = f"Unexpected error during arXiv search: {str(e)}"
             await self.emit_status("tool", error_msg, True)
             return []
+
+    async def search_arxiv_api(self, query: str) -> List[Dict]:
+        """Search the official arXiv API, streaming and parsing its Atom response."""
+        # The arXiv query prompt may already use field prefixes like ti: or abs:.
+        search_query = query if re.search(r"\b(ti|abs|au|cat|all):", query) else f"all:{query}"
+        params = {
+            "search_query": search_query,
+            "start": "0",
+            "max_results": str(self.valves.ARXIV_MAX_RESULTS),
+        }
+        try:
+            session = await self.get_session()
+            async with session.get(
+                "https://export.arxiv.org/api/query", params=params
+            ) as response:
+                response.raise_for_status()
+                return await parse_arxiv_atom(
+                    response.content.iter_chunked(16384),
+                    self.valves.ARXIV_MAX_RESULTS,
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ET.ParseError) as e:
+            logger.error(f"arXiv API search error: {e}")
+            return []
+
     async def search_web(self, query: str) -> List[Dict]:
         """Simplified web search using Tavily API"""
         if not self.valves.TAVILY_API_KEY:
             return []
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                url = "https://api.tavily.com/search"
-                headers = {"Content-Type": "application/json"}
-                data = {
-                    "api_key": self.valves.TAVILY_API_KEY,
-                    "query": query,
-                    "max_results": self.valves.MAX_SEARCH_RESULTS,
-                    "search_depth": "advanced",
-                }
-                async with session.post(url, headers=headers, json=data) as response:
-                    logger.debug(f"Tavily API response status: {response.status}")
-                    if response.status == 200:
-                        result = await response.json()
-                        results = result.get("results", [])
-                        return [
-                            {
-                                "title": result["title"],
-                                "url": result["url"],
-                                "content": result["content"],
-                                "score": result["score"],
-                            }
-                            for result in results
-                        ]
-                    else:
-                        logger.error(f"Tavily API error: {response.status}")
-                        return []
-            except Exception as e:
-                logger.error(f"Search error: {e}")
-                return []
+        session = await self.get_session()
+        try:
+            url = "https://api.tavily.com/search"
+            headers = {"Content-Type": "application/json"}
+            data = {
+                "api_key": self.valves.TAVILY_API_KEY,
+                "query": query,
+                "max_results": self.valves.MAX_SEARCH_RESULTS,
+                "search_depth": "advanced",
+            }
+            async with session.post(url, headers=headers, json=data) as response:
+                logger.debug(f"Tavily API response status: {response.status}")
+                if response.status == 200:
+                    result = await response.json()
+                    results = result.get("results", [])
+                    return [
+                        {
+                            "title": result["title"],
+                            "url": result["url"],
+                            "content": result["content"],
+                            "score": result["score"],
+                        }
+                        for result in results
+                    ]
+                else:
+                    logger.error(f"Tavily API error: {response.status}")
+                    return []
+        except Exception as e:
+            logger.error(f"Search error: {e}")
+            return []
 
     async def gather_research(self, topic: str) -> List[Dict]:
         """Gather initial research for the given topic"""
@@ -398,12 +756,19 @@ class Pipe:
         # Preprocess the initial user query
         web_query, arxiv_query = await self.preprocess_query(topic)
 
-        # Perform web search and arXiv search using the preprocessed queries
-        web_research = await self.search_web(web_query)
+        # Perform web search and arXiv search concurrently using the preprocessed queries
+        search_cache = self.get_search_cache()
+        web_research, arxiv_research = await asyncio.gather(
+            search_cache.fetch(
+                "web", web_query, self.valves.MAX_SEARCH_RESULTS, self.search_web
+            ),
+            search_cache.fetch(
+                "arxiv", arxiv_query, self.valves.ARXIV_MAX_RESULTS, self.search_arxiv
+            ),
+        )
         await self.emit_status(
             "tool", f"Web sources found:: {len(web_research)}", False
         )
-        arxiv_research = await self.search_arxiv(arxiv_query)
 
         await self.emit_status(
             "tool", f"ArXiv papers found:: {len(arxiv_research)}", False
@@ -433,7 +798,6 @@ class Pipe:
 
         Enhanced web search query:
         """
-        web_query = await self.get_completion(prompt_web)
 
         # NEW: Simpler, high-recall arXiv prompt
         prompt_arxiv = f"""
@@ -447,7 +811,9 @@ class Pipe:
 
         Output ONLY the arXiv search query, no explanations or formatting.
         """
-        arxiv_query = await self.get_completion(prompt_arxiv)
+        web_query, arxiv_query = await asyncio.gather(
+            self.get_completion(prompt_web), self.get_completion(prompt_arxiv)
+        )
 
         return web_query, arxiv_query
 
@@ -506,9 +872,9 @@ class Pipe:
         return await self.get_completion(prompt)
 
     async def synthesize_research(
-        self, research: List[Dict], topic: str, temperature
+        self, research: List[Dict], topic: str, temperature, stream: bool = True
     ) -> str:
-        """Synthesize research content with streaming"""
+        """Synthesize research content, streaming it to the chat unless stream is False"""
         research_text = "\n\n".join(
             f"Title: {r['title']}\nContent: {r['content']}\nURL: {r['url']}"
             for r in research
@@ -530,7 +896,8 @@ class Pipe:
             [{"role": "user", "content": prompt}], temperature
         ):
             complete += chunk
-            await self.emit_message(chunk)
+            if stream:
+                await self.emit_message(chunk)
         return complete
 
     async def evaluate_content(self, content: str, topic: str) -> float:
@@ -552,6 +919,10 @@ class Pipe:
         Provide a single numeric score between 1 and 10, inclusive. 
         Do not include any explanation or additional text in your response—just the number.
         """
+        key = self.evaluation_key(content, topic)
+        if key in self.evaluations:
+            self.evaluations.move_to_end(key)
+            return self.evaluations[key]
         score = 0.0
         try:
             result = await self.get_completion(prompt)
@@ -559,6 +930,7 @@ class Pipe:
             if match:
                 score = float(match.group())
                 if 1.0 <= score <= 10.0:
+                    self.remember_evaluation(key, score)
                     return score
                 else:
                     logger.debug(f"Score out of range: {score}. Result was: {result}")
@@ -571,6 +943,66 @@ class Pipe:
             logger.debug(f"Error during evaluation: {e}")
             return score
 
+    def remember_evaluation(self, key: str, score: float):
+        self.evaluations[key] = score
+        self.evaluations.move_to_end(key)
+        while len(self.evaluations) > 256:
+            self.evaluations.popitem(last=False)
+
+    def evaluation_key(self, content: str, topic: str) -> str:
+        return hashlib.sha256(f"{topic}\0{content}".encode("utf-8")).hexdigest()
+
+    async def evaluate_contents(self, contents: List[str], topic: str) -> List[float]:
+        """Evaluate several research syntheses with one LLM call.
+
+        Syntheses that were already scored come from the cache; any score missing from the
+        reply falls back to evaluate_content for that synthesis alone.
+        """
+        keys = [self.evaluation_key(content, topic) for content in contents]
+        pending = list(
+            dict.fromkeys(
+                (key, content)
+                for key, content in zip(keys, contents)
+                if key not in self.evaluations
+            )
+        )
+
+        if len(pending) > 1:
+            candidates = "\n\n".join(
+                f'Synthesis {i + 1}: "{content}"' for i, (_, content) in enumerate(pending)
+            )
+            prompt = f"""
+        Evaluate the quality of each of the {len(pending)} research syntheses provided below:
+
+        Topic: "{topic}"
+
+        {candidates}
+
+        Consider the following criteria:
+        1. Integration of sources.
+        2. Depth of analysis.
+        3. Clarity and coherence.
+        4. Relevance to the topic.
+
+        Score each synthesis between 1 and 10, inclusive.
+        Reply with a JSON object like {{"scores": [7, 5]}} holding one score per synthesis, in the order given.
+        Do not include any explanation or additional text in your response.
+        """
+            try:
+                result = await self.get_completion(prompt)
+                for (key, _), score in zip(pending, parse_scores(result, len(pending))):
+                    if score is not None:
+                        self.remember_evaluation(key, score)
+            except Exception as e:
+                logger.debug(f"Error during batch evaluation: {e}")
+
+        return [
+            self.evaluations[key]
+            if key in self.evaluations
+            else await self.evaluate_content(content, topic)
+            for key, content in zip(keys, contents)
+        ]
+
     def get_chunk_content(self, chunk):
 
         chunk_str = chunk
@@ -636,6 +1068,7 @@ class Pipe:
 
         topic = body.get("messages", [])[-1].get("content", "").strip()
 
+        self.get_search_cache().prune()
         await self.progress("Initializing research process...")
         initial_temperature = (
             self.valves.TEMPERATURE_MAX if self.valves.TEMPERATURE_DECAY else 1
@@ -671,10 +1104,13 @@ class Pipe:
             score = await mcts.simulate(child)
             mcts.backpropagate(child, score)
 
-            if score > best_score:
-                best_score = score
-                best_content = child.content
-                best_child = child
+            # With batch evaluation every sibling has a score, so the best of them can win.
+            for candidate in leaf.children:
+                candidate_score = score if candidate is child else candidate.evaluation
+                if candidate_score is not None and candidate_score > best_score:
+                    best_score = candidate_score
+                    best_content = candidate.content
+                    best_child = candidate
         await self.emit_replace(mcts.mermaid(best_child))
         await self.emit_message(best_content)
         await self.done()
@@ -6,7 +6,7 @@ description: seeding artifact programmatically
 version: 0.0.1
 """
 
-from functools import wraps
+from functools import update_wrapper
 import time
 import logging
 import asyncio
@@ -56,29 +56,106 @@ DO NOT JUST SAY YOU ARE RE-EXAMINING. USE AT LEAST 3 METHODS TO DERIVE THE ANSWE
 
 # ==============================================================================
 
+class RenderScheduler:
+  """
+  Coalesces calls to an async render function so that at most one call
+  is in flight and calls are at least wait_ms apart.
+
+  The first call after a quiet period is sent right away (leading edge).
+  Calls arriving inside the window or while a send is in flight only
+  replace the pending arguments, and a single trailing task sends the
+  latest of them once the window is over, so no update is lost and stale
+  ones are skipped. The window starts when a send completes, so a slow
+  event emitter lowers the render rate instead of queueing up calls.
+  """
+
+  def __init__(self, func, wait_ms):
+    self.func = func
+    self.wait = wait_ms / 1000
+    self.last_sent = 0.0
+    self.pending = None
+    self.trailing: Optional[asyncio.Task] = None
+    self.lock = asyncio.Lock()
+    self.wake = asyncio.Event()
+
+  async def __call__(self, *args, **kwargs):
+    self.pending = (args, kwargs)
+    if self.trailing:
+      return
+
+    if not self.lock.locked() and self.delay() <= 0:
+      await self.send()
+    else:
+      self.trailing = asyncio.create_task(self.send_later())
+
+  def delay(self):
+    return self.last_sent + self.wait - time.monotonic()
+
+  async def send(self):
+    async with self.lock:
+      if self.pending is None:
+        return
+      args, kwargs = self.pending
+      self.pending = None
+      try:
+        await self.func(*args, **kwargs)
+      finally:
+        self.last_sent = time.monotonic()
+
+  async def send_later(self):
+    try:
+      while self.pending is not None:
+        if self.lock.locked():
+          async with self.lock:
+            pass
+          continue
+
+        delay = self.delay()
+        if delay > 0 and not self.wake.is_set():
+          try:
+            await asyncio.wait_for(self.wake.wait(), delay)
+          except asyncio.TimeoutError:
+            pass
+          continue
+
+        await self.send()
+    except Exception as e:
+      logger.error(f"Render failed: {e}")
+    finally:
+      self.trailing = None
+
+  async def flush(self):
+    """
+    Send the latest pending call without waiting for the window and
+    return once everything has been delivered.
+    """
+    self.wake.set()
+    try:
+      if self.trailing:
+        await self.trailing
+      await self.send()
+    finally:
+      self.wake.clear()
+
+
 def throttle(wait_ms):
-    def decorator(func):
-        last_call = 0
-        task = None
-
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            nonlocal last_call, task
-            now = time.time()
-
-            if now - last_call >= wait_ms / 1000:
-                last_call = now
-                if task:
-                    task.cancel()
-                task = asyncio.create_task(func(*args, **kwargs))
-                return await task
-            elif task:
-                return await task
-            else:
-                return None
-
-        return wrapper
-    return decorator
+  """
+  Wraps an async method in a RenderScheduler, one per instance.
+  The scheduler's flush() delivers the last update.
+  """
+  class Throttled:
+    def __init__(self, func):
+      self.func = func
+      update_wrapper(self, func)
+
+    def __get__(self, instance, owner=None):
+      if instance is None:
+        return self
+      scheduler = RenderScheduler(self.func.__get__(instance, owner), wait_ms)
+      instance.__dict__[self.func.__name__] = scheduler
+      return scheduler
+
+  return Throttled
 
 def is_final_answer(message: str) -> bool:
   return final_answer in message or any([word in message.lower() for word in detect_final])
@@ -303,6 +380,8 @@ class Pipe:
     })
 
     await self.emit_replace(content.render())
+    # The artifact must be in place before the answer is streamed below it
+    await self.emit_replace.flush()
     await self.emit_status("info", "Final answer.", False)
 
     async for chunk in self.get_streaming_completion(messages):
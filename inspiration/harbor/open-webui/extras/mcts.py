@@ -13,6 +13,8 @@ import math
 import asyncio
 import json
 import re
+import hashlib
+import collections
 
 from typing import (
   List,
@@ -35,6 +37,14 @@ default_exploration_weight = 1.414
 default_max_iterations = 2
 default_max_simulations = 2
 default_thoughts = 2
+# Score all children of an expansion in one LLM call instead of one call per node
+default_batch_evaluation = True
+# Number of simulations run concurrently. Above 1, thoughts and solutions are
+# generated in parallel and emitted whole instead of streamed
+default_parallel_simulations = 1
+# Each in-flight simulation counts as this many visits with a score of 0 on its
+# path, so concurrent selections spread out over the tree
+default_virtual_loss = 1
 
 # ==============================================================================
 
@@ -66,6 +76,18 @@ Reply with a single number between 1 and 10 only. Do not write anything else, it
 THINK CAREFULLY AND USE BEST PRACTICES.
 """.strip()
 
+eval_answers_prompt = """
+Given the following question:
+"{question}"
+
+And these {count} candidate answers:
+{answers}
+
+Rate how well each answer answers the question from 1 to 10, where 1 is completely wrong or irrelevant and 10 is a perfect answer.
+Reply with a JSON array of {count} numbers, one per answer in the order given, for example [7, 4]. Do not write anything else, it will be discarded.
+THINK CAREFULLY AND USE BEST PRACTICES.
+""".strip()
+
 analyze_prompt = """
 Iteration Analysis:
 
@@ -218,6 +240,33 @@ def replace_with_mapping(text, mapping):
 # ==============================================================================
 
 
+def parse_scores(text, count):
+  """
+  Parse `count` scores from an LLM reply, trying a JSON array or object first
+  and falling back to the numbers in the text. Returns None for unparsable scores.
+  """
+  scores = None
+  match = re.search(r"\[[^\[\]]*\]|\{[^{}]*\}", text)
+  if match:
+    try:
+      data = json.loads(match.group())
+      if isinstance(data, dict):
+        data = [data[key] for key in sorted(data, key=lambda k: int(re.sub(r"\D", "", str(k)) or 0))]
+      scores = [float(value) for value in data]
+    except (ValueError, TypeError):
+      scores = None
+
+  if scores is None or len(scores) != count:
+    # "1: 7, 2: 4" style replies: drop the answer numbers before each colon.
+    numbers = re.findall(r"(?<![\d.])(?:\d+\s*[:)]\s*)?(\d+(?:\.\d+)?)", text)
+    scores = [float(number) for number in numbers]
+
+  if len(scores) != count:
+    return [None] * count
+
+  return [score if 1 <= score <= 10 else None for score in scores]
+
+
 def escape_mermaid(text):
   return text.replace('"', "&quot;").replace("(", "&#40;").replace(")", "&#41;")
 
@@ -242,6 +291,11 @@ class Node:
     self.children = []
     self.visits = 0
     self.value = 0
+    self.score = None
+    # Visits of simulations still in flight through this node
+    self.virtual_loss = 0
+    # Set while the node is being expanded, so concurrent simulations wait for it
+    self.expanding: Optional[asyncio.Event] = None
 
   def add_child(self, child: "Node"):
     child.parent = self
@@ -253,11 +307,13 @@ class Node:
 
   def uct_value(self):
     epsilon = 1e-6
+    visits = self.visits + self.virtual_loss
+    parent_visits = self.parent.visits + self.parent.virtual_loss
 
-    return self.value / (self.visits +
+    return self.value / (visits +
                          epsilon) + self.exploration_weight * math.sqrt(
-                           math.log(self.parent.visits) /
-                           (self.visits + epsilon)
+                           math.log(max(parent_visits, 1)) /
+                           (visits + epsilon)
                          )
 
   def mermaid(self, offset=0, selected=None):
@@ -307,24 +363,63 @@ class MCTS:
     logger.debug(f"Expanding node {node.id}...")
     await self.llm.progress(f"Thinking about {node.id}...")
 
-    for _ in range(random.randint(default_thoughts, default_thoughts + 1)):
-      await self.llm.emit_replace(self.mermaid(node))
-      await self.llm.emit_message(f"Thought: ")
-      thought = await self.llm.generate_thought(node.content)
-      await self.llm.emit_message(f"\n\n---\n\nSolution:\n")
-
-      new_content = await self.llm.update_approach(node.content, thought)
-      child = Node(content=new_content, parent=node)
-      node.add_child(child)
+    num_thoughts = random.randint(default_thoughts, default_thoughts + 1)
+    if default_parallel_simulations > 1:
+      await self.expand_parallel(node, num_thoughts)
+    else:
+      for _ in range(num_thoughts):
+        await self.llm.emit_replace(self.mermaid(node))
+        await self.llm.emit_message(f"Thought: ")
+        thought = await self.llm.generate_thought(node.content)
+        await self.llm.emit_message(f"\n\n---\n\nSolution:\n")
+
+        new_content = await self.llm.update_approach(node.content, thought)
+        child = Node(content=new_content, parent=node)
+        node.add_child(child)
+
+    if default_batch_evaluation:
+      await self.llm.progress(f"Evaluating the thoughts about {node.id}...")
+      scores = await self.llm.evaluate_answers(
+        [child.content for child in node.children],
+        stream=default_parallel_simulations <= 1,
+      )
+      for child, score in zip(node.children, scores):
+        child.score = score
 
     return random.choice(node.children)
 
+  async def expand_parallel(self, node, num_thoughts):
+    """
+    Generate the thoughts and solutions for a node concurrently. They are not
+    streamed, since concurrent streams would interleave, and the children are
+    added together once all of them are ready.
+    """
+    async def think():
+      thought = await self.llm.generate_thought(node.content, stream=False)
+      new_content = await self.llm.update_approach(
+        node.content, thought, stream=False
+      )
+      await self.llm.emit_message(
+        f"Thought: {thought}\n\n---\n\nSolution:\n{new_content}\n\n"
+      )
+      return new_content
+
+    contents = await asyncio.gather(*(think() for _ in range(num_thoughts)))
+    for content in contents:
+      node.add_child(Node(content=content, parent=node))
+    await self.llm.emit_replace(self.mermaid(node))
+
   async def simulate(self, node):
     logger.debug(f"Simulating node {node.id}...")
     await self.llm.progress(f"Thinking about {node.id}...")
     await self.llm.emit_replace(self.mermaid())
 
-    return await self.llm.evaluate_answer(node.content)
+    if node.score is not None:
+      return node.score
+
+    return await self.llm.evaluate_answer(
+      node.content, stream=default_parallel_simulations <= 1
+    )
 
   def backpropagate(self, node, score):
     logger.debug(f"Backpropagating from {node.id}...")
@@ -343,6 +438,9 @@ class MCTS:
   async def search(self, num_simulations):
     logger.debug("Starting search...")
 
+    if default_parallel_simulations > 1:
+      return await self.search_parallel(num_simulations)
+
     for _ in range(num_simulations):
       leaf = await self.select()
       self.selected = leaf
@@ -353,6 +451,58 @@ class MCTS:
 
     return self.selected
 
+  async def search_parallel(self, num_simulations):
+    """
+    Run the simulations with up to default_parallel_simulations in flight.
+
+    Every in-flight simulation adds virtual loss along its path so that the
+    next selection prefers other branches, and a leaf that is being expanded
+    is waited for rather than expanded twice. Tree updates happen between
+    awaits, so they are atomic on the event loop without a lock.
+    """
+    remaining = num_simulations
+
+    async def worker():
+      nonlocal remaining
+      while remaining > 0:
+        remaining -= 1
+        await self.run_simulation()
+
+    await asyncio.gather(
+      *(worker() for _ in range(min(default_parallel_simulations, num_simulations)))
+    )
+    return self.selected
+
+  async def run_simulation(self):
+    while True:
+      leaf = await self.select()
+      if leaf.expanding is None:
+        break
+      await leaf.expanding.wait()
+
+    path = []
+    node = leaf
+    while node:
+      node.virtual_loss += default_virtual_loss
+      path.append(node)
+      node = node.parent
+
+    self.selected = leaf
+    try:
+      if not leaf.fully_expanded():
+        leaf.expanding = asyncio.Event()
+        try:
+          leaf = await self.expand(leaf)
+        finally:
+          expanding, path[0].expanding = path[0].expanding, None
+          expanding.set()
+      score = await self.simulate(leaf)
+    finally:
+      for node in path:
+        node.virtual_loss -= default_virtual_loss
+
+    self.backpropagate(leaf, score)
+
   def mermaid(self, selected=None):
     return f"""
 ```mermaid
@@ -375,6 +525,9 @@ class Pipe:
 
   def __init__(self):
     self.type = "manifold"
+    # Scores by hash of question and answer, so no answer is rated twice. Only the
+    # most recently used ones are kept, since the Pipe lives as long as the server.
+    self.scores = collections.OrderedDict()
 
   def pipes(self) -> list[dict[str, str]]:
     ollama.get_all_models()
@@ -575,8 +728,17 @@ class Pipe:
       await self.emit_message(chunk)
     return complete
 
-  async def generate_thought(self, answer):
-    return await self.stream_prompt_completion(
+  async def prompt_completion(self, prompt, **format_args):
+    return await self.get_completion(
+      self.__model__, [{
+        "role": "user",
+        "content": prompt.format(**format_args)
+      }]
+    )
+
+  async def generate_thought(self, answer, stream=True):
+    complete = self.stream_prompt_completion if stream else self.prompt_completion
+    return await complete(
       thoughts_prompt, answer=answer, question=self.__question__
     )
 
@@ -588,27 +750,83 @@ class Pipe:
       best_score=best_score
     )
 
-  async def update_approach(self, answer, improvements):
-    return await self.stream_prompt_completion(
+  async def update_approach(self, answer, improvements, stream=True):
+    complete = self.stream_prompt_completion if stream else self.prompt_completion
+    return await complete(
       update_prompt,
       question=self.__question__,
       answer=answer,
       improvements=improvements
     )
 
-  async def evaluate_answer(self, answer):
-    result = await self.stream_prompt_completion(
+  def remember_score(self, key, score):
+    self.scores[key] = score
+    self.scores.move_to_end(key)
+    while len(self.scores) > 256:
+      self.scores.popitem(last=False)
+
+  def score_key(self, answer):
+    return hashlib.sha256(
+      f"{self.__question__}\0{answer}".encode("utf-8")
+    ).hexdigest()
+
+  async def evaluate_answer(self, answer, stream=True):
+    key = self.score_key(answer)
+    if key in self.scores:
+      self.scores.move_to_end(key)
+      return self.scores[key]
+
+    complete = self.stream_prompt_completion if stream else self.prompt_completion
+    result = await complete(
       eval_answer_prompt,
       answer=answer,
       question=self.__question__,
     )
     try:
       score = re.search(r"\d+", result).group()
+      self.remember_score(key, int(score))
       return int(score)
     except AttributeError:
       logger.error(f"AnswerEval: unable to parse \"{result[:100]}\"")
       return 0
 
+  async def evaluate_answers(self, answers, stream=True):
+    """
+    Score several answers with one LLM call. Answers that were already scored
+    are taken from the cache, and any score that can't be parsed from the reply
+    is asked for on its own.
+    """
+    keys = [self.score_key(answer) for answer in answers]
+    pending = list(
+      dict.fromkeys(
+        (key, answer) for key, answer in zip(keys, answers) if key not in self.scores
+      )
+    )
+
+    if len(pending) > 1:
+      complete = self.stream_prompt_completion if stream else self.prompt_completion
+      result = await complete(
+        eval_answers_prompt,
+        question=self.__question__,
+        count=len(pending),
+        answers="\n\n".join(
+          f"<answer {i + 1}>\n{answer}\n</answer {i + 1}>"
+          for i, (_, answer) in enumerate(pending)
+        ),
+      )
+      for (key, _), score in zip(pending, parse_scores(result, len(pending))):
+        if score is not None:
+          self.remember_score(key, score)
+        else:
+          logger.debug(f"AnswersEval: no score for {key[:8]} in \"{result[:100]}\"")
+
+    return [
+      self.scores[key]
+      if key in self.scores
+      else await self.evaluate_answer(answer, stream=stream)
+      for key, answer in zip(keys, answers)
+    ]
+
   def get_response_content(self, response):
     try:
       return response["choices"][0]["message"]["content"]